@@ -1,84 +1,510 @@
+import argparse
+import json
+import sys
 import time
+from functools import partial
 from simulacao import Simulador
+from analitico import EstimadorAnalitico
+from catalogo import carregar_catalogo
+from chegadas import GeradorChegadasVetorizado
+from coalescencia import Coalescencia
+from replicacoes import ExecutorReplicacoes, formatar_resumo_replicacoes
+from checkpoint import carregar_checkpoint, executar_com_checkpoints
+from escalonador import POLITICAS_FILA, EscalonadorLimitado
+from instrumentacao import ExportadorSnapshots, Instrumentacao, executar_com_perfil, formatar_instrumentacao
+from metricas import MetricasLatencia, formatar_latencias
+from multicpu import ROTEAMENTOS, SimuladorMultiCPU
+from multiprocesso import POLITICAS, SimuladorMultiprocesso, gerar_carga_aleatoria
+from preempcao import SimuladorPreemptivo
+from registro import EventoLog, FORMATOS, RegistradorAssincrono, formatar_texto
+from traco import FonteTraco, GravadorTraco
+from vetorial import SimuladorVetorial
 
-def main():
+def rotulos_prioridade(simulador):
+    """Texto da prioridade de cada tipo, segundo a fonte de interrupções do simulador."""
+    return {tipo: rotulo for tipo, (_, rotulo) in simulador.dispositivos.prioridades().items()}
+
+
+def executar_com_log(simulador, registrador=None, console=True, atraso=0.0):
+    """
+    Conduz o simulador ciclo a ciclo, exibindo cada ciclo no console e/ou
+    enviando-o ao registrador de log (que grava em segundo plano).
+    'atraso' é a pausa entre ciclos (usada apenas no modo interativo).
+    """
+    rotulos = rotulos_prioridade(simulador)
+    executando = True
+
+    while executando:
+        if atraso:
+            time.sleep(atraso)  # pequeno atraso só para facilitar a visualização
+
+        status = simulador.processar_ciclo()
+        dados = simulador.estado
+
+        # Exibe e registra o ciclo
+        if console:
+            print(formatar_texto(EventoLog.do_estado(status, dados), rotulos), end="")
+        if registrador:
+            registrador.registrar_ciclo(status, dados)
+
+        if status == 'PROCESSO_FINALIZADO':
+            executando = False
+
+        # Avança o tempo da simulação; se não avançar, termina
+        if not simulador.avancar_tempo():
+            executando = False
+
+
+def montar_resumo(simulador):
+    """Monta o resumo final a partir de Simulador.info e das estatísticas dos dispositivos."""
+    return {
+        'tempo_final': simulador.tempo_atual,
+        'estado_processo': simulador.processo.estado,
+        'progresso_processo': simulador.processo.progresso_execucao,
+        'fila_maxima': simulador.escalonador.marca_maxima,
+        'info': simulador.info,
+        'dispositivos': simulador.dispositivos.obter_estatisticas_gerais()
+    }
+
+
+def formatar_resumo(resumo, formato):
+    """Formata o resumo como texto legível ou JSON."""
+    if formato == 'json':
+        return json.dumps(resumo, ensure_ascii=False)
+
+    info = resumo['info']
+    linhas = [
+        "=== RESUMO DA SIMULAÇÃO ===",
+        f"Tempo final: {resumo['tempo_final']}",
+        f"Processo: {resumo['estado_processo']} ({resumo['progresso_processo']:.1f}%)",
+        f"Tempo em execução do processo: {info['tempo_processo']}",
+        f"Tempo tratando interrupções: {info['tempo_interrupcoes']}",
+        f"Interrupções tratadas: {info['total_interrupcoes']}",
+    ]
+    linhas.append(f"Maior tamanho da fila: {resumo['fila_maxima']}")
+    if 'descartadas' in info:
+        linhas.append(f"Descartadas por fila cheia: {info['descartadas']} | mescladas: {info['mescladas']}")
+    if 'interrupcoes_agrupadas' in info:
+        linhas.append(f"Trocas de contexto evitadas por coalescência: {info['interrupcoes_agrupadas']}")
+    for tipo, total in info['por_tipo'].items():
+        estat = resumo['dispositivos'].get(tipo, {})
+        linhas.append(f"  {tipo.upper()}: {total} tratadas | "
+                      f"{estat.get('total_interrupcoes', 0)} geradas | "
+                      f"{estat.get('pendentes', 0)} pendentes")
+    return "\n".join(linhas)
+
+
+def main_interativo():
+    """Modo interativo original: pergunta os parâmetros e exibe a simulação em ritmo lento."""
     # recebe o tempo total da simulação
     tempo_total = int(input("Defina o tempo total da simulação: "))
-   
+
     # recebe o nome do arquivo de log (ou usa o padrão se não for informado)
     nome_arquivo = input("Defina o nome do arquivo de log (padrão: log_simulacao.txt): ")
     if not nome_arquivo:
         nome_arquivo = "log_simulacao.txt"
-    
-    arquivo = open(nome_arquivo, "w")
-    arquivo.write("=== LOG DE EXECUÇÃO ===\n")
-    
+
     # Cria o simulador com o tempo total
     simulador = Simulador(tempo_total=tempo_total)
-    
-    # Mapa para mostrar as prioridades em texto
-    mapa_prioridade = {
-        'teclado': 'Alta',
-        'impressora': 'Média',
-        'disco': 'Baixa'
-    }
+
+    registrador = RegistradorAssincrono(nome_arquivo, cabecalho="=== LOG DE EXECUÇÃO ===\n",
+                                        descarregar_sempre=True, rotulos=rotulos_prioridade(simulador))
 
     print(f" Simulação iniciada. Log em {nome_arquivo}")
 
-    executando = True
+    executar_com_log(simulador, registrador, console=True, atraso=0.05)
 
-    while executando:
-        time.sleep(0.05)  # pequeno atraso só para facilitar a visualização
-        
-        status = simulador.processar_ciclo()
-        dados = simulador.obter_estado_atual()
-        tempo = dados['tempo']
-        mensagem = ""
-
-        if status == 'INTERRUPCAO_INICIADA':
-            # Interrupção detectada, pega o dispositivo envolvido
-            obj_inte = dados['interrupcao_ativa']
-            
-            # Descobre texto da prioridade de acordo com o dispositivo
-            prio_texto = mapa_prioridade.get(obj_inte.tipo, "Desconhecida")
-            
-            mensagem = f"Interrupção: {obj_inte.tipo.capitalize()} - Prioridade: {prio_texto} - Armazenando contexto..."
-
-        elif status == 'TRATANDO_INTERRUPCAO':
-            # Sistema está tratando a interrupção
-            obj_inte = dados['interrupcao_ativa']
-            mensagem = f"Tratando a interrupção do {obj_inte.tipo}..."
-
-        elif status == 'INTERRUPCAO_FINALIZADA':
-            # Tratamento concluído, processo principal pode continuar
-            mensagem = "Interrupção tratada. Restaurando o contexto do processo principal."
-            msg = f"[Tempo {tempo}] - Processo principal retomado."
-            print(msg)
-            arquivo.write(msg + "\n")
-
-        elif status == 'PROCESSO_EXECUTANDO':
-            # Processo principal está rodando
-            proc = dados['processo']
-            mensagem = f"Processo principal em execução. (Progresso: {proc.progresso_execucao:.1f}%)"
-
-        elif status == 'PROCESSO_FINALIZADO':
-            # Processo terminou
-            mensagem = "Processo principal finalizado."
-            executando = False
+    registrador.fechar()
+    print("\n Fim da simulação.")
 
-        # Exibe e registra a mensagem do ciclo
-        if mensagem:
-            linha = f"[Tempo {tempo}] - {mensagem}"
-            print(linha)
-            arquivo.write(linha + "\n")
-            arquivo.flush()
 
-        # Avança o tempo da simulação; se não avançar, termina
-        if not simulador.avancar_tempo():
-            executando = False
+def main_replicacoes(args):
+    """Executa várias replicações independentes em paralelo e imprime média, variância e IC."""
+    if args.vetorial:
+        simulador = SimuladorVetorial(args.tempo, args.replicacoes, seed=args.seed)
+        simulador.executar()
+        resumo = simulador.resumo()
+    else:
+        executor = ExecutorReplicacoes(
+            tempo_total=args.tempo,
+            replicacoes=args.replicacoes,
+            semente=args.seed if args.seed is not None else 0,
+            processos=args.processos,
+            modo=args.modo
+        )
+        resumo = executor.executar()
 
-    arquivo.close()
-    print("\n Fim da simulação.")
+    if not args.quiet:
+        if args.formato == 'json':
+            print(json.dumps(resumo, ensure_ascii=False))
+        else:
+            print(formatar_resumo_replicacoes(resumo))
+
+
+def main_analitico(args):
+    """Imprime as estimativas analíticas (sem simular) para os dispositivos configurados."""
+    fonte = carregar_catalogo(args.dispositivos) if args.dispositivos else None
+    modo = 'continuo' if args.preempcao == 0 else 'ciclo'
+    estimativa = EstimadorAnalitico(fonte).estimar(modo)
+    if args.quiet:
+        return
+    if args.formato == 'json':
+        print(json.dumps(estimativa, ensure_ascii=False))
+        return
+    print("=== ESTIMATIVA ANALÍTICA ===")
+    print(f"Carga: {estimativa['carga']:.3f}" + ("" if estimativa['estavel'] else " (instável)"))
+    for chave, valor in estimativa['utilizacao'].items():
+        print(f"Utilização ({chave}): {valor:.1%}")
+    print(f"Lentidão do processo principal: {estimativa['lentidao_processo']:.3f}x "
+          f"(termina em ~{estimativa['tempo_processo']:.1f} ut)")
+    for tipo in estimativa['espera_media']:
+        print(f"  {tipo.upper()}: espera média {estimativa['espera_media'][tipo]:.3f} | "
+              f"resposta média {estimativa['resposta_media'][tipo]:.3f} | "
+              f"{estimativa['interrupcoes_por_tipo'][tipo]:.2f} interrupções")
+
+
+def main_lote(args):
+    """Modo em lote: sem perguntas nem pausas; emite apenas o resumo final."""
+    if args.cpus > 1:
+        simulador = SimuladorMultiCPU(args.tempo, num_cpus=args.cpus,
+                                      roteamento=args.roteamento, seed=args.seed)
+        relatorio = simulador.executar()
+        if args.quiet:
+            return
+        if args.formato == 'json':
+            print(json.dumps({'info': simulador.info, 'cpus': relatorio}, ensure_ascii=False))
+        else:
+            print("=== RESUMO POR CPU ===")
+            for cpu in relatorio:
+                print(f"CPU {cpu['cpu']}: utilização {cpu['utilizacao']:.1%} | "
+                      f"processo {cpu['tempo_processo']} | interrupções {cpu['tempo_interrupcoes']} "
+                      f"({cpu['total_interrupcoes']} tratadas, {cpu['fila_tamanho']} na fila)")
+        return
+
+    if args.retomar:
+        simulador = carregar_checkpoint(args.retomar, semente=args.seed)
+    elif args.carga:
+        simulador = SimuladorMultiprocesso(
+            tempo_total=args.tempo,
+            carga=lambda: gerar_carga_aleatoria(args.carga),
+            politica=args.politica,
+            quantum=args.quantum if args.quantum is not None else 4,
+            seed=args.seed
+        )
+    else:
+        # O catálogo é criado pelo Simulador depois de semear o gerador aleatório
+        dispositivos = (lambda: carregar_catalogo(args.dispositivos)) if args.dispositivos else None
+        if args.vetorizado:
+            catalogo = dispositivos
+            dispositivos = lambda: GeradorChegadasVetorizado(catalogo() if catalogo else None)
+        escalonador = None
+        if args.capacidade_fila is not None or args.capacidade_total is not None:
+            escalonador = partial(EscalonadorLimitado, capacidade=args.capacidade_fila,
+                                  capacidade_total=args.capacidade_total, politica=args.politica_fila)
+        if args.preempcao is not None:
+            simulador = SimuladorPreemptivo(args.tempo, profundidade_maxima=args.preempcao,
+                                            seed=args.seed, dispositivos=dispositivos,
+                                            escalonador=escalonador)
+        else:
+            coalescencia = None
+            if args.coalescencia is not None:
+                janela = args.janela_coalescencia if args.janela_coalescencia is not None else 10
+                coalescencia = Coalescencia(limite=args.coalescencia, janela=janela)
+            simulador = Simulador(tempo_total=args.tempo, seed=args.seed, modo=args.modo,
+                                  dispositivos=dispositivos, coalescencia=coalescencia,
+                                  escalonador=escalonador)
+    if args.latencias and simulador.metricas is None:
+        simulador.metricas = MetricasLatencia()
+    if args.reproduzir_traco:
+        simulador.dispositivos = FonteTraco(args.reproduzir_traco)
+    if args.gravar_traco:
+        simulador.dispositivos = GravadorTraco(simulador.dispositivos, args.gravar_traco)
+
+    instrumentacao = exportador = None
+    if args.instrumentar:
+        instrumentacao = Instrumentacao(simulador).ativar()
+        exportador = ExportadorSnapshots(instrumentacao, args.instrumentar,
+                                         args.intervalo_instrumentacao).iniciar()
+
+    def executar():
+        if args.log or args.verbose:
+            # Log por ciclo exige avançar ciclo a ciclo
+            registrador = None
+            if args.log:
+                registrador = RegistradorAssincrono(
+                    args.log,
+                    formato=args.formato_log,
+                    nivel_minimo=args.nivel_log,
+                    tamanho_maximo=args.rotacao_mb * 1024 * 1024 if args.rotacao_mb else None,
+                    cabecalho="=== LOG DE EXECUÇÃO ===\n" if args.formato_log == 'texto' else None,
+                    rotulos=rotulos_prioridade(simulador)
+                )
+                if instrumentacao:
+                    instrumentacao.envolver(registrador, 'registrar_ciclo', 'log')
+            executar_com_log(simulador, registrador, console=args.verbose)
+            if registrador:
+                registrador.fechar()
+        elif args.checkpoint:
+            executar_com_checkpoints(simulador, args.checkpoint, args.intervalo_checkpoint)
+        else:
+            simulador.executar()
+
+    if args.perfil:
+        executar_com_perfil(executar, args.perfil)
+    else:
+        executar()
+
+    if instrumentacao:
+        instrumentacao.desativar()
+        exportador.parar()
+
+    if args.gravar_traco or args.reproduzir_traco:
+        simulador.dispositivos.fechar()
+
+    if args.quiet:
+        return
+    if isinstance(simulador, SimuladorMultiprocesso):
+        resumo = {'info': simulador.info, 'carga': simulador.relatorio()}
+        if args.formato == 'json':
+            print(json.dumps(resumo, ensure_ascii=False))
+        else:
+            print("=== RESUMO DA CARGA ===")
+            for chave, valor in resumo['carga'].items():
+                print(f"{chave}: {valor}")
+    else:
+        print(formatar_resumo(montar_resumo(simulador), args.formato))
+
+    if args.latencias:
+        resumo_latencias = simulador.metricas.resumo()
+        if args.formato == 'json':
+            print(json.dumps({'latencias': resumo_latencias}, ensure_ascii=False))
+        else:
+            print("\n=== LATÊNCIAS POR DISPOSITIVO ===")
+            print(formatar_latencias(resumo_latencias))
+
+    if instrumentacao:
+        snapshot = instrumentacao.snapshot()
+        if args.formato == 'json':
+            print(json.dumps({'instrumentacao': snapshot}, ensure_ascii=False))
+        else:
+            print("\n=== INSTRUMENTAÇÃO POR FASE ===")
+            print(formatar_instrumentacao(snapshot))
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="simulador",
+        description="Simulador de gerenciamento de I/O e interrupções."
+    )
+    parser.add_argument("--interativo", action="store_true",
+                        help="modo original: pergunta os parâmetros e exibe a simulação em ritmo lento")
+    parser.add_argument("-t", "--tempo", type=int, default=1000,
+                        help="tempo total da simulação (padrão: 1000)")
+    parser.add_argument("-s", "--seed", type=int, default=None,
+                        help="semente do gerador de números aleatórios")
+    parser.add_argument("-l", "--log", default=None,
+                        help="arquivo para o log detalhado por ciclo (desligado por padrão)")
+    parser.add_argument("--formato-log", choices=tuple(FORMATOS), default="texto",
+                        help="formato do arquivo de log (padrão: texto)")
+    parser.add_argument("--nivel-log", type=int, choices=range(4), default=0,
+                        help="nível mínimo dos eventos gravados no log; 1 omite as linhas "
+                             "de processo em execução (padrão: 0, grava tudo)")
+    parser.add_argument("--rotacao-mb", type=int, default=None,
+                        help="rotaciona o arquivo de log ao atingir este tamanho em MB")
+    parser.add_argument("-f", "--formato", choices=("texto", "json"), default="texto",
+                        help="formato do resumo final (padrão: texto)")
+    parser.add_argument("-m", "--modo", choices=Simulador.MODOS, default="ciclo",
+                        help="motor de simulação (padrão: ciclo)")
+    parser.add_argument("-r", "--replicacoes", type=int, default=0,
+                        help="executa N replicações independentes e resume as métricas")
+    parser.add_argument("--vetorial", action="store_true",
+                        help="com --replicacoes, avança todas as replicações juntas em um único "
+                             "processo, com o estado em arrays do NumPy")
+    parser.add_argument("-p", "--processos", type=int, default=None,
+                        help="processos usados nas replicações (padrão: todos os núcleos)")
+    parser.add_argument("--carga", type=int, default=0,
+                        help="simula N processos de usuário com fila de prontos em vez de um único processo")
+    parser.add_argument("--politica", choices=tuple(POLITICAS), default="fifo",
+                        help="política de escalonamento de CPU da carga (padrão: fifo)")
+    parser.add_argument("--quantum", type=int, default=None,
+                        help="quantum do round-robin, só com --politica rr (padrão: 4)")
+    parser.add_argument("--cpus", type=int, default=1,
+                        help="número de CPUs simuladas (padrão: 1)")
+    parser.add_argument("--roteamento", choices=tuple(ROTEAMENTOS), default="menos_carregada",
+                        help="política de roteamento de interrupções entre CPUs (padrão: menos_carregada)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="grava periodicamente o estado da simulação neste arquivo")
+    parser.add_argument("--intervalo-checkpoint", type=int, default=100000,
+                        help="unidades de tempo entre checkpoints (padrão: 100000)")
+    parser.add_argument("--retomar", default=None,
+                        help="retoma a simulação a partir de um arquivo de checkpoint; os parâmetros da "
+                             "simulação vêm do checkpoint e só --seed pode mudar (ressemeia os geradores)")
+    parser.add_argument("--latencias", action="store_true",
+                        help="coleta e exibe percentis de espera, serviço e resposta por dispositivo")
+    parser.add_argument("--preempcao", type=int, default=None, metavar="PROFUNDIDADE",
+                        help="tratamento preemptivo: interrupções mais prioritárias suspendem o "
+                             "tratador atual, com até PROFUNDIDADE tratadores suspensos")
+    parser.add_argument("--dispositivos", default=None, metavar="CONFIG",
+                        help="monta os dispositivos a partir de um catálogo .json ou .toml "
+                             "(tipos, prioridades, quantidades e distribuições de tratamento)")
+    parser.add_argument("--vetorizado", action="store_true",
+                        help="sorteia as chegadas de todos os dispositivos em blocos com NumPy "
+                             "(mesmas distribuições, sequência aleatória diferente)")
+    parser.add_argument("--coalescencia", type=int, default=None, metavar="LIMITE",
+                        help="agrupa as interrupções do disco em lotes de até LIMITE, "
+                             "cada lote tratado de uma vez")
+    parser.add_argument("--janela-coalescencia", type=int, default=None,
+                        help="com --coalescencia, tempo máximo que uma interrupção do disco fica "
+                             "retida esperando o lote (padrão: 10)")
+    parser.add_argument("--capacidade-fila", type=int, default=None, metavar="N",
+                        help="limita a fila a N interrupções pendentes por prioridade")
+    parser.add_argument("--capacidade-total", type=int, default=None, metavar="N",
+                        help="limita a fila inteira a N interrupções pendentes")
+    parser.add_argument("--politica-fila", choices=POLITICAS_FILA, default="descartar_nova",
+                        help="o que fazer com uma chegada quando a fila está cheia "
+                             "('descartar_menor_prioridade' só age no limite de --capacidade-total)")
+    parser.add_argument("--analitico", action="store_true",
+                        help="não simula: estima utilização, esperas e lentidão do processo com "
+                             "fórmulas de fila com prioridade (com --preempcao 0, sondagem contínua)")
+    parser.add_argument("--gravar-traco", default=None,
+                        help="grava as chegadas de interrupções neste arquivo de traço binário")
+    parser.add_argument("--reproduzir-traco", default=None,
+                        help="usa as chegadas de um arquivo de traço no lugar dos dispositivos")
+    parser.add_argument("--instrumentar", default=None, metavar="ARQUIVO",
+                        help="mede o tempo de cada fase do ciclo e grava snapshots periódicos neste "
+                             "arquivo (formato Prometheus se terminar em .prom, JSON nos demais casos)")
+    parser.add_argument("--intervalo-instrumentacao", type=float, default=1.0, metavar="SEGUNDOS",
+                        help="intervalo entre snapshots de --instrumentar")
+    parser.add_argument("--perfil", default=None, metavar="ARQUIVO",
+                        help="executa sob o cProfile e grava as estatísticas (pstats) neste arquivo")
+    saida = parser.add_mutually_exclusive_group()
+    saida.add_argument("-q", "--quiet", action="store_true",
+                       help="não imprime nada no console")
+    saida.add_argument("-v", "--verbose", action="store_true",
+                       help="imprime o log de cada ciclo no console")
+    return parser
+
+
+# Opções aceitas por cada modo de execução (destinos do argparse); uma opção informada fora
+# da lista do seu modo é recusada em vez de ser ignorada
+SAIDA = ('formato', 'quiet')
+LOG = ('log', 'formato_log', 'nivel_log', 'rotacao_mb', 'verbose')
+EXECUCAO = ('checkpoint', 'intervalo_checkpoint', 'latencias', 'gravar_traco', 'instrumentar',
+            'intervalo_instrumentacao', 'perfil')
+FONTE_E_FILA = ('dispositivos', 'vetorizado', 'reproduzir_traco', 'capacidade_fila', 'capacidade_total',
+                'politica_fila')
+
+MODOS_EXECUCAO = {
+    'interativo': ("com --interativo", ('interativo',)),
+    'analitico': ("com --analitico (o estimador não modela essas opções)",
+                  ('analitico', 'dispositivos', 'preempcao') + SAIDA),
+    'replicacoes': ("com --replicacoes", ('replicacoes', 'tempo', 'seed', 'modo', 'processos') + SAIDA),
+    'replicacoes_vetorial': ("com --replicacoes --vetorial (um único processo, motor por ciclo)",
+                             ('replicacoes', 'vetorial', 'tempo', 'seed') + SAIDA),
+    'multicpu': ("com --cpus maior que 1", ('cpus', 'roteamento', 'tempo', 'seed') + SAIDA),
+    'retomar': ("com --retomar (o checkpoint já fixa os parâmetros da simulação; só --seed pode mudar)",
+                ('retomar', 'seed') + SAIDA + LOG + EXECUCAO),
+    'carga': ("com --carga", ('carga', 'politica', 'quantum', 'tempo', 'seed', 'reproduzir_traco')
+              + SAIDA + LOG + EXECUCAO),
+    'preemptivo': ("com --preempcao", ('preempcao', 'tempo', 'seed') + FONTE_E_FILA + SAIDA + LOG + EXECUCAO),
+    'simples': ("no modo padrão (um processo, uma CPU)",
+                ('tempo', 'seed', 'modo', 'coalescencia', 'janela_coalescencia') + FONTE_E_FILA
+                + SAIDA + LOG + EXECUCAO),
+}
+
+# Opções que só fazem sentido junto de (ao menos uma de) outras
+DEPENDENCIAS = {
+    'janela_coalescencia': ('coalescencia',),
+    'politica_fila': ('capacidade_fila', 'capacidade_total'),
+    'intervalo_checkpoint': ('checkpoint',),
+    'intervalo_instrumentacao': ('instrumentar',),
+    'formato_log': ('log',),
+    'nivel_log': ('log',),
+    'rotacao_mb': ('log',),
+}
+
+# Menor valor aceito pelas opções numéricas
+MINIMOS = {
+    'tempo': 0, 'replicacoes': 0, 'processos': 1, 'carga': 0, 'quantum': 1, 'cpus': 1,
+    'intervalo_checkpoint': 1, 'preempcao': 0, 'coalescencia': 1, 'janela_coalescencia': 0,
+    'capacidade_fila': 1, 'capacidade_total': 1, 'rotacao_mb': 1,
+}
+
+
+def modo_execucao(args):
+    """Modo de execução escolhido pelas opções, na ordem em que main despacha."""
+    if args.interativo:
+        return 'interativo'
+    if args.analitico:
+        return 'analitico'
+    if args.replicacoes:
+        return 'replicacoes_vetorial' if args.vetorial else 'replicacoes'
+    if args.cpus > 1:
+        return 'multicpu'
+    if args.retomar:
+        return 'retomar'
+    if args.carga:
+        return 'carga'
+    if args.preempcao is not None:
+        return 'preemptivo'
+    return 'simples'
+
+
+def opcoes_informadas(parser, args):
+    """{destino: nome (--opcao)} das opções cujo valor difere do padrão do parser."""
+    return {acao.dest: acao.option_strings[-1] for acao in parser._actions
+            if acao.option_strings and acao.dest != 'help'
+            and getattr(args, acao.dest) != parser.get_default(acao.dest)}
+
+
+def validar_opcoes(parser, args):
+    """Recusa (parser.error) valores inválidos e opções que o modo de execução não usa."""
+    informadas = opcoes_informadas(parser, args)
+
+    for destino, minimo in MINIMOS.items():
+        valor = getattr(args, destino)
+        if valor is not None and valor < minimo:
+            parser.error(f"{informadas[destino]} deve ser pelo menos {minimo}")
+
+    descricao, aceitas = MODOS_EXECUCAO[modo_execucao(args)]
+    recusadas = [nome for destino, nome in informadas.items() if destino not in aceitas]
+    if recusadas:
+        parser.error(f"opções não suportadas {descricao}: {', '.join(recusadas)}")
+
+    for destino, requisitos in DEPENDENCIAS.items():
+        if destino in informadas and not any(requisito in informadas for requisito in requisitos):
+            nomes = ' ou '.join('--' + requisito.replace('_', '-') for requisito in requisitos)
+            parser.error(f"{informadas[destino]} só pode ser usado com {nomes}")
+
+    # Combinações recusadas dentro de um mesmo modo
+    if args.analitico and args.preempcao not in (None, 0):
+        parser.error("--analitico só modela tratamento não preemptivo (sem --preempcao ou --preempcao 0)")
+    if args.quantum is not None and args.politica != 'rr':
+        parser.error("--quantum só pode ser usado com --politica rr")
+    if (args.log or args.verbose) and args.modo == 'eventos':
+        parser.error("o log por ciclo (--log/--verbose) só está disponível no modo 'ciclo'")
+    if args.checkpoint and (args.log or args.verbose):
+        parser.error("--checkpoint não pode ser combinado com --log ou --verbose")
+    if args.instrumentar and args.checkpoint:
+        parser.error("--instrumentar não pode ser combinado com --checkpoint")
+    if args.reproduzir_traco and (args.dispositivos or args.vetorizado):
+        parser.error("--reproduzir-traco não pode ser combinado com --dispositivos ou --vetorizado")
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    validar_opcoes(parser, args)
+
+    modo = modo_execucao(args)
+    if modo == 'interativo':
+        main_interativo()
+    elif modo == 'analitico':
+        main_analitico(args)
+    elif modo in ('replicacoes', 'replicacoes_vetorial'):
+        main_replicacoes(args)
+    else:
+        main_lote(args)
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,265 @@
+import math
+
+from dispositivos import GerenciadorDispositivos
+from metricas import MetricasLatencia
+from preempcao import SimuladorPreemptivo
+from simulacao import Simulador
+
+# Unidades de execução de que o processo principal precisa para terminar (ver Processo)
+UNIDADES_PROCESSO = 100
+
+# 'ciclo': Simulador (dispositivos só são sondados fora dos tratadores)
+# 'continuo': SimuladorPreemptivo(profundidade_maxima=0) (sondagem contínua, sem preempção)
+MODOS_ANALITICOS = ('ciclo', 'continuo')
+
+
+def momentos_tratamento(dispositivo):
+    """Retorna (E[S], E[S²]) do tempo de tratamento sorteado pelo dispositivo."""
+    distribuicao = getattr(dispositivo, 'distribuicao', 'uniforme')
+    if distribuicao == 'constante':
+        valor = dispositivo.tempo_min
+        return valor, valor * valor
+    if distribuicao == 'exponencial':
+        # teto de uma exponencial = geométrica em {1, 2, ...} com razão q
+        q = math.exp(-1.0 / dispositivo.media_servico)
+        return 1.0 / (1.0 - q), (1.0 + q) / (1.0 - q) ** 2
+    # Inteiro uniforme em [tempo_min, tempo_max]
+    a, b = dispositivo.tempo_min, dispositivo.tempo_max
+    media = (a + b) / 2
+    return media, ((b - a + 1) ** 2 - 1) / 12 + media * media
+
+
+class EstimadorAnalitico:
+    """
+    Estima valores esperados da simulação a partir dos parâmetros dos dispositivos
+    (probabilidade de interrupção por sondagem e distribuição do tempo de tratamento),
+    com as fórmulas de fila com prioridade não preemptiva (Cobham), sem simular.
+
+    No modo 'ciclo' os dispositivos só são sondados nos ciclos em que nenhum tratador
+    executa. Contado em sondagens, o sistema é uma fila de tempo discreto em que cada
+    sondagem atende no máximo uma interrupção: λ = Σp chegadas por sondagem e atendimento
+    de uma sondagem. A espera em sondagens sai das fórmulas de Cobham, e cada sondagem
+    esperada é convertida em tempo pelo tratamento que ocorre nela (1 + S ciclos).
+
+    No modo 'continuo' os dispositivos são sondados em todo ciclo e cada interrupção ocupa
+    a CPU por 1 + S ciclos (o ciclo de entrada mais o tratamento). É a fila M/G/1 discreta
+    com prioridade não preemptiva, estável só com carga ρ = Σ p·(1 + E[S]) < 1.
+
+    As estimativas são de regime estacionário; o começo com fila vazia e o fim do
+    processo principal as deslocam um pouco em execuções curtas.
+    """
+
+    def __init__(self, fonte=None):
+        """fonte: GerenciadorDispositivos ou CatalogoDispositivos (padrão: dispositivos padrão)."""
+        fonte = fonte if fonte is not None else GerenciadorDispositivos()
+        prioridades = fonte.prioridades()
+        self.tipos = list(prioridades)
+
+        # Classes de prioridade, da maior para a menor, com os dispositivos na ordem de sondagem
+        self.niveis = sorted({nivel for nivel, _ in prioridades.values()}, reverse=True)
+        self.dispositivos = {nivel: [] for nivel in self.niveis}
+        self.servico_por_tipo = {}
+        for dispositivo in fonte.dispositivos:
+            p = min(max(dispositivo.prob_interrupcao, 0.0), 1.0)
+            media, segundo_momento = momentos_tratamento(dispositivo)
+            self.dispositivos[prioridades[dispositivo.tipo][0]].append((dispositivo.tipo, p, media, segundo_momento))
+            self.servico_por_tipo[dispositivo.tipo] = media
+        self.nivel_do_tipo = {tipo: nivel for tipo, (nivel, _) in prioridades.items()}
+
+    def _classes(self, ocupacao_extra):
+        """
+        Por classe: taxa de chegada λ, média e segundo momento da ocupação X = S + extra
+        e a média de chegadas da mesma classe na mesma sondagem que ficam à frente (B).
+        """
+        classes = []
+        for nivel in self.niveis:
+            lam = sum(p for _, p, _, _ in self.dispositivos[nivel])
+            if lam == 0.0:
+                classes.append((0.0, 0.0, 0.0, 0.0))
+                continue
+            media = sum(p * (m + ocupacao_extra) for _, p, m, _ in self.dispositivos[nivel]) / lam
+            segundo = sum(p * (s2 + 2 * ocupacao_extra * m + ocupacao_extra ** 2)
+                          for _, p, m, s2 in self.dispositivos[nivel]) / lam
+            # Dentro da mesma sondagem, dispositivos anteriores na lista entram antes na fila
+            anteriores, a_frente = 0.0, 0.0
+            for _, p, _, _ in self.dispositivos[nivel]:
+                a_frente += p * anteriores
+                anteriores += p
+            classes.append((lam, media, segundo, a_frente / lam))
+        return classes
+
+    def _espera_ciclo(self):
+        classes = self._classes(ocupacao_extra=1)
+        lam_total = sum(c[0] for c in classes)
+        if lam_total >= 1.0:
+            return {nivel: math.inf for nivel in self.niveis}
+
+        espera = {}
+        sigma_acima = 0.0       # Σ λ das classes mais prioritárias
+        tempo_acima = 0.0       # Σ λ·(1 + S) das classes mais prioritárias
+        fila_acima = 0.0        # Σ λ·W (em sondagens) das classes mais prioritárias
+        tempo_fila_acima = 0.0  # Σ λ·W·(1 + S) das classes mais prioritárias
+        for nivel, (lam, duracao, _, mesma_sondagem) in zip(self.niveis, classes):
+            # Espera em sondagens: W = Σ_{i≤k} λ_i W_i + (à frente na mesma sondagem) + λ_{<k} W
+            w = (fila_acima + sigma_acima + mesma_sondagem) / (1.0 - sigma_acima - lam)
+            espera[nivel] = (tempo_fila_acima + lam * w * duracao + tempo_acima
+                             + mesma_sondagem * duracao + w * tempo_acima)
+            sigma_acima += lam
+            tempo_acima += lam * duracao
+            fila_acima += lam * w
+            tempo_fila_acima += lam * w * duracao
+        return espera
+
+    def _espera_continuo(self):
+        classes = self._classes(ocupacao_extra=1)
+        carga = sum(lam * x for lam, x, _, _ in classes)
+        if carga >= 1.0:
+            return {nivel: math.inf for nivel in self.niveis}
+
+        # Ocupação residual vista por uma chegada: Σ λ E[X(X - 1)] / 2
+        residual = sum(lam * (x2 - x) for lam, x, x2, _ in classes) / 2
+        espera = {}
+        rho_acima, fila_acima = 0.0, 0.0
+        for nivel, (lam, x, _, mesma_sondagem) in zip(self.niveis, classes):
+            rho = lam * x
+            w = (residual + fila_acima + rho_acima + mesma_sondagem * x) / (1.0 - rho_acima - rho)
+            espera[nivel] = w
+            rho_acima += rho
+            fila_acima += rho * w
+        return espera
+
+    def estimar(self, modo='ciclo'):
+        """
+        Retorna um dicionário com:
+        - carga: λ por sondagem ('ciclo') ou ρ por ciclo ('continuo')
+        - utilizacao: fração do tempo no processo, nos tratadores e nos ciclos de entrada
+        - lentidao_processo: tempo decorrido por unidade executada do processo principal
+        - tempo_processo: tempo esperado até o processo principal terminar
+        - interrupcoes_por_tipo: interrupções esperadas até o processo principal terminar
+        - espera_media / resposta_media: por tipo, em unidades de tempo
+        """
+        if modo not in MODOS_ANALITICOS:
+            raise ValueError(f"Modo analítico desconhecido: '{modo}'. Use um de {MODOS_ANALITICOS}.")
+
+        todos = [d for nivel in self.niveis for d in self.dispositivos[nivel]]
+        lam = sum(p for _, p, _, _ in todos)
+        trabalho = sum(p * m for _, p, m, _ in todos)  # ciclos de tratamento por sondagem
+
+        if modo == 'ciclo':
+            carga = lam
+            estavel = lam < 1.0
+            duracao_sondagem = 1.0 + trabalho  # (1 - λ)·1 + λ·(1 + E[S])
+            utilizacao = {'processo': (1.0 - lam) / duracao_sondagem,
+                          'tratadores': trabalho / duracao_sondagem,
+                          'entrada_tratadores': lam / duracao_sondagem}
+            espera_por_nivel = self._espera_ciclo()
+        else:
+            carga = lam + trabalho
+            estavel = carga < 1.0
+            utilizacao = {'processo': max(0.0, 1.0 - carga),
+                          'tratadores': min(trabalho, 1.0),
+                          'entrada_tratadores': min(lam, 1.0)}
+            espera_por_nivel = self._espera_continuo()
+
+        fracao_processo = utilizacao['processo']
+        lentidao = 1.0 / fracao_processo if estavel and fracao_processo > 0 else math.inf
+        # Sondagens (ou ciclos) até o processo executar todas as suas unidades
+        sondagens = UNIDADES_PROCESSO / (1.0 - lam) if modo == 'ciclo' and lam < 1.0 else UNIDADES_PROCESSO * lentidao
+        interrupcoes = {tipo: 0.0 for tipo in self.tipos}
+        for _, dispositivos in self.dispositivos.items():
+            for tipo, p, _, _ in dispositivos:
+                interrupcoes[tipo] += p * sondagens
+
+        espera = {tipo: espera_por_nivel[self.nivel_do_tipo[tipo]] for tipo in self.tipos}
+        return {
+            'modo': modo,
+            'carga': carga,
+            'estavel': estavel,
+            'utilizacao': utilizacao,
+            'lentidao_processo': lentidao,
+            'tempo_processo': UNIDADES_PROCESSO * lentidao,
+            'interrupcoes_por_tipo': interrupcoes,
+            'espera_media': espera,
+            'resposta_media': {tipo: espera[tipo] + self.servico_por_tipo.get(tipo, 0.0) for tipo in self.tipos}
+        }
+
+
+def medir_simulacao(modo='ciclo', ciclos=1000000, seed=0, dispositivos=None):
+    """
+    Mede na simulação as grandezas que EstimadorAnalitico prevê, em uma execução longa.
+    O tempo é avançado diretamente para a execução não parar quando o processo principal
+    termina; os ciclos em que ele executaria continuam contando como ciclos do processo.
+    """
+    if modo == 'ciclo':
+        simulador = Simulador(ciclos, seed=seed, dispositivos=dispositivos, metricas=MetricasLatencia())
+    else:
+        simulador = SimuladorPreemptivo(ciclos, profundidade_maxima=0, seed=seed,
+                                        dispositivos=dispositivos, metricas=MetricasLatencia())
+
+    ciclos_processo = 0
+    for _ in range(ciclos):
+        if simulador.processar_ciclo().startswith('PROCESSO'):
+            ciclos_processo += 1
+        simulador.tempo_atual += 1
+
+    info = simulador.info
+    resumo = simulador.metricas.resumo()
+    return {
+        'utilizacao': {'processo': ciclos_processo / ciclos,
+                       'tratadores': info['tempo_interrupcoes'] / ciclos,
+                       'entrada_tratadores': info['total_interrupcoes'] / ciclos},
+        'lentidao_processo': ciclos / ciclos_processo if ciclos_processo else math.inf,
+        'espera_media': {tipo: r['espera']['media'] for tipo, r in resumo.items()},
+        'resposta_media': {tipo: r['resposta']['media'] for tipo, r in resumo.items()}
+    }
+
+
+def validar_estimativas(modo='ciclo', ciclos=1000000, seed=0, dispositivos=None):
+    """
+    Compara as estimativas analíticas com uma simulação longa. 'dispositivos' é uma
+    função que cria a fonte de interrupções (chamada uma vez para o estimador e uma
+    para o simulador). Retorna [(grandeza, previsto, simulado, erro relativo)].
+    """
+    fabrica = dispositivos or GerenciadorDispositivos
+    previsto = EstimadorAnalitico(fabrica()).estimar(modo)
+    simulado = medir_simulacao(modo, ciclos, seed, fabrica)
+
+    linhas = []
+    for grupo in ('utilizacao', 'espera_media', 'resposta_media'):
+        for chave, valor in simulado[grupo].items():
+            linhas.append((f"{grupo}.{chave}", previsto[grupo].get(chave), valor))
+    linhas.append(('lentidao_processo', previsto['lentidao_processo'], simulado['lentidao_processo']))
+    return [(nome, p, s, abs(p - s) / s if s and p is not None and math.isfinite(p) else None)
+            for nome, p, s in linhas]
+
+
+def formatar_validacao(linhas):
+    """Tabela de texto com previsto x simulado e o erro relativo."""
+    saida = [f"{'Grandeza':<32} {'Previsto':>10} {'Simulado':>10} {'Erro':>8}"]
+    for nome, previsto, simulado, erro in linhas:
+        texto_erro = f"{erro:.1%}" if erro is not None else "-"
+        saida.append(f"{nome:<32} {previsto:>10.4f} {simulado:>10.4f} {texto_erro:>8}")
+    return "\n".join(saida)
+
+
+if __name__ == "__main__":
+    from catalogo import CatalogoDispositivos
+
+    print("=== TESTE DO ESTIMADOR ANALÍTICO ===\n")
+    estimativa = EstimadorAnalitico().estimar()
+    print(f"Dispositivos padrão: carga {estimativa['carga']:.3f} por sondagem | "
+          f"processo termina em ~{estimativa['tempo_processo']:.1f} ut | "
+          f"interrupções: { {t: round(n, 2) for t, n in estimativa['interrupcoes_por_tipo'].items()} }\n")
+
+    print("Modo 'ciclo' (Simulador), dispositivos padrão:")
+    print(formatar_validacao(validar_estimativas('ciclo', ciclos=300000, seed=1)))
+
+    # Com sondagem contínua os dispositivos padrão saturam a CPU (ρ > 1); usa uma carga menor
+    leve = {'tipos': [
+        {'tipo': 'teclado', 'prioridade': 3, 'prob_interrupcao': 0.02, 'servico': {'min': 1, 'max': 3}},
+        {'tipo': 'impressora', 'prioridade': 2, 'prob_interrupcao': 0.03, 'servico': {'min': 3, 'max': 7}},
+        {'tipo': 'disco', 'prioridade': 1, 'prob_interrupcao': 0.05, 'servico': {'min': 5, 'max': 12}},
+    ]}
+    print("\nModo 'continuo' (SimuladorPreemptivo sem preempção), carga reduzida:")
+    print(formatar_validacao(validar_estimativas('continuo', ciclos=300000, seed=1,
+                                                 dispositivos=lambda: CatalogoDispositivos(leve))))
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from chegadas import GeradorChegadasVetorizado, np
+from dispositivos import GerenciadorDispositivos, Interrupcao, PoolInterrupcoes
+from escalonador import Escalonador
+from simulacao import Simulador
+
+# Fatores aplicados a prob_interrupcao de todos os dispositivos
+NIVEIS_CARGA = {'baixa': 0.25, 'media': 1.0, 'alta': 2.0}
+PROFUNDIDADES_FILA = (10, 1000, 100000)
+QUANTIDADES_DISPOSITIVOS = (3, 30, 300)
+
+
+def cronometrar(funcao, repeticoes=3):
+    """Executa a função 'repeticoes' vezes e retorna o menor tempo (em segundos)."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def ajustar_carga(dispositivos, fator):
+    """Multiplica a probabilidade de interrupção de cada dispositivo por 'fator'."""
+    for dispositivo in dispositivos.dispositivos:
+        dispositivo.prob_interrupcao = min(1.0, dispositivo.prob_interrupcao * fator)
+        dispositivo.sondagens_restantes = dispositivo.sortear_intervalo()
+
+
+def medir_ciclos(ciclos, repeticoes):
+    """Ciclos por segundo de Simulador.processar_ciclo em cada nível de carga."""
+    resultados = {}
+    for nivel, fator in NIVEIS_CARGA.items():
+        def rodar():
+            simulador = Simulador(tempo_total=ciclos, seed=1)
+            ajustar_carga(simulador.dispositivos, fator)
+            # Avança o tempo diretamente para não parar quando o processo termina
+            for _ in range(ciclos):
+                simulador.processar_ciclo()
+                simulador.tempo_atual += 1
+        resultados[nivel] = ciclos / cronometrar(rodar, repeticoes)
+    return resultados
+
+
+def medir_despacho(operacoes, repeticoes):
+    """Custo (ns) de um par adicionar + obter_proxima_interrupcao por profundidade de fila."""
+    tipos = ('teclado', 'impressora', 'disco')
+    resultados = {}
+    for profundidade in PROFUNDIDADES_FILA:
+        escalonador = Escalonador()
+        escalonador.adicionar_interrupcoes(
+            [Interrupcao(tipos[i % 3], i, 1) for i in range(profundidade)])
+        novas = [Interrupcao(tipos[i % 3], i, 1) for i in range(operacoes)]
+
+        def rodar():
+            for interrupcao in novas:
+                escalonador.adicionar_interrupcao(interrupcao)
+                escalonador.obter_proxima_interrupcao()
+        resultados[str(profundidade)] = cronometrar(rodar, repeticoes) / operacoes * 1e9
+    return resultados
+
+
+def medir_sondagem(ciclos, repeticoes):
+    """Custo (µs) de GerenciadorDispositivos.verificar_interrupcoes por número de dispositivos."""
+    resultados = {}
+    for quantidade in QUANTIDADES_DISPOSITIVOS:
+        gerenciador = GerenciadorDispositivos()
+        modelos = [type(d) for d in gerenciador.dispositivos]
+        gerenciador.dispositivos = [modelos[i % len(modelos)]() for i in range(quantidade)]
+
+        def rodar():
+            for tempo in range(ciclos):
+                gerenciador.verificar_interrupcoes(tempo)
+        resultados[str(quantidade)] = cronometrar(rodar, repeticoes) / ciclos * 1e6
+    return resultados
+
+
+def medir_sondagem_vetorizada(ciclos, repeticoes):
+    """Mesmo que medir_sondagem, com GeradorChegadasVetorizado (None sem NumPy)."""
+    if np is None:
+        return None
+    resultados = {}
+    for quantidade in QUANTIDADES_DISPOSITIVOS:
+        gerenciador = GerenciadorDispositivos()
+        modelos = [type(d) for d in gerenciador.dispositivos]
+        gerenciador.dispositivos = [modelos[i % len(modelos)]() for i in range(quantidade)]
+        gerador = GeradorChegadasVetorizado(gerenciador, seed=1)
+
+        def rodar():
+            for tempo in range(ciclos):
+                gerador.verificar_interrupcoes(tempo)
+        resultados[str(quantidade)] = cronometrar(rodar, repeticoes) / ciclos * 1e6
+    return resultados
+
+
+def medir_alocacoes(ciclos):
+    """
+    Objetos Interrupcao criados por mil ciclos na carga alta, sem e com PoolInterrupcoes,
+    e quantos objetos o estado lido a cada ciclo cria (obter_estado_atual contra a visão
+    Simulador.estado), contados pelo tracemalloc.
+    """
+    import tracemalloc
+
+    resultados = {}
+    for nome, pool in (('interrupcoes_sem_pool', None), ('interrupcoes_com_pool', PoolInterrupcoes())):
+        simulador = Simulador(tempo_total=ciclos, seed=1, dispositivos=lambda: GerenciadorDispositivos(pool=pool))
+        ajustar_carga(simulador.dispositivos, NIVEIS_CARGA['alta'])
+        for _ in range(ciclos):
+            simulador.processar_ciclo()
+            simulador.tempo_atual += 1
+        geradas = sum(e['total_interrupcoes'] for e in simulador.dispositivos.obter_estatisticas_gerais().values())
+        criadas = pool.criadas if pool else geradas
+        resultados[nome] = criadas / ciclos * 1000
+
+    for nome, ler in (('blocos_por_ciclo_copia', lambda s: s.obter_estado_atual()),
+                      ('blocos_por_ciclo_visao', lambda s: s.estado)):
+        simulador = Simulador(tempo_total=ciclos, seed=1)
+        # Guarda as leituras (em uma lista já alocada) para que o que elas alocam continue vivo
+        guardados = [None] * 1000
+        tracemalloc.start()
+        antes = tracemalloc.take_snapshot()
+        for i in range(len(guardados)):
+            guardados[i] = ler(simulador)
+        depois = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        blocos = sum(d.count_diff for d in depois.compare_to(antes, 'filename') if d.count_diff > 0)
+        resultados[nome] = blocos / len(guardados)
+    return resultados
+
+
+def medir_ponta_a_ponta(tempo_total, repeticoes):
+    """
+    Ciclos por segundo do __main__ em lote, com e sem log por ciclo. Do tempo de cada
+    comando é descontado o do mesmo comando com --tempo 0 (inicialização do interpretador,
+    importações e montagem da carga), para medir só os ciclos.
+    """
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    base = [sys.executable, pasta, "--carga", "200", "--seed", "1", "--quiet"]
+    resultados = {}
+    with tempfile.TemporaryDirectory() as temporaria:
+        variantes = {
+            'sem_log': base,
+            'com_log': base + ["--log", os.path.join(temporaria, "log.txt")]
+        }
+        for nome, comando in variantes.items():
+            partida = cronometrar(lambda: subprocess.run(comando + ["--tempo", "0"], check=True), repeticoes)
+            duracao = cronometrar(lambda: subprocess.run(comando + ["--tempo", str(tempo_total)], check=True),
+                                  repeticoes)
+            resultados[nome] = tempo_total / max(duracao - partida, 1e-9)
+    return resultados
+
+
+def versao_codigo():
+    """Commit atual do git (ou None fora de um repositório)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executar_benchmarks(rapido=False):
+    """Executa todas as medições e retorna um registro pronto para gravar."""
+    escala = 10 if rapido else 1
+    repeticoes = 1 if rapido else 3
+    return {
+        'commit': versao_codigo(),
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'ciclos_por_segundo': medir_ciclos(200000 // escala, repeticoes),
+        'despacho_ns': medir_despacho(100000 // escala, repeticoes),
+        'sondagem_us': medir_sondagem(20000 // escala, repeticoes),
+        'sondagem_vetorizada_us': medir_sondagem_vetorizada(20000 // escala, repeticoes),
+        'alocacoes': medir_alocacoes(200000 // escala),
+        'ponta_a_ponta_ciclos_por_segundo': medir_ponta_a_ponta(50000 // escala, repeticoes)
+    }
+
+
+def comparar(anterior, atual):
+    """Monta linhas 'métrica: antes -> depois (razão)' entre dois registros."""
+    linhas = [f"Comparando {anterior.get('commit')} -> {atual.get('commit')}"]
+    for grupo, valores in atual.items():
+        if not isinstance(valores, dict):
+            continue
+        for chave, valor in valores.items():
+            antes = (anterior.get(grupo) or {}).get(chave)
+            if antes:
+                linhas.append(f"  {grupo}[{chave}]: {antes:.4g} -> {valor:.4g} ({valor / antes:.2f}x)")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos do simulador.")
+    parser.add_argument("-o", "--saida", default="bench_resultados.jsonl",
+                        help="arquivo JSONL onde cada execução acrescenta um registro")
+    parser.add_argument("--rapido", action="store_true",
+                        help="execução curta, útil para conferir se tudo roda")
+    args = parser.parse_args(argv)
+
+    registro = executar_benchmarks(args.rapido)
+
+    anterior = None
+    if os.path.exists(args.saida):
+        with open(args.saida, encoding="utf-8") as arquivo:
+            linhas = [linha for linha in arquivo if linha.strip()]
+        if linhas:
+            anterior = json.loads(linhas[-1])
+
+    with open(args.saida, "a", encoding="utf-8") as arquivo:
+        arquivo.write(json.dumps(registro) + "\n")
+
+    print(json.dumps(registro, indent=2))
+    if anterior:
+        print(comparar(anterior, registro))
+
+
+if __name__ == "__main__":
+    main()
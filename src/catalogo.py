@@ -0,0 +1,217 @@
+import heapq
+import json
+import math
+import random
+
+from dispositivos import DispositivoBase
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+def _inteiro_nao_negativo(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool) and valor >= 0
+
+
+class DispositivoConfigurado(DispositivoBase):
+    """
+    Dispositivo criado a partir de uma entrada do catálogo, com distribuição
+    de tempo de tratamento configurável:
+    - {'distribuicao': 'uniforme', 'min': a, 'max': b}   (inteiro uniforme em [a, b])
+    - {'distribuicao': 'constante', 'valor': v}
+    - {'distribuicao': 'exponencial', 'media': m}        (arredondado para cima, mínimo 1)
+    """
+    __slots__ = ('distribuicao', 'media_servico')
+
+    def __init__(self, tipo, prioridade, nivel_prioridade, prob_interrupcao, servico, identificador,
+                 semente=None):
+        if (isinstance(prob_interrupcao, bool) or not isinstance(prob_interrupcao, (int, float))
+                or not 0.0 <= prob_interrupcao <= 1.0):
+            raise ValueError(f"Dispositivo '{identificador}': 'prob_interrupcao' deve estar entre 0 e 1 "
+                             f"(recebido: {prob_interrupcao!r}).")
+        distribuicao = servico.get('distribuicao', 'uniforme')
+        if distribuicao == 'uniforme':
+            tempo_min, tempo_max = servico.get('min'), servico.get('max')
+            if not (_inteiro_nao_negativo(tempo_min) and _inteiro_nao_negativo(tempo_max)):
+                raise ValueError(f"Dispositivo '{identificador}': a distribuição uniforme exige 'min' e "
+                                 f"'max' inteiros não negativos (recebido: {tempo_min!r}, {tempo_max!r}).")
+            if tempo_min > tempo_max:
+                raise ValueError(f"Dispositivo '{identificador}': 'min' ({tempo_min}) maior que "
+                                 f"'max' ({tempo_max}).")
+        elif distribuicao == 'constante':
+            tempo_min = tempo_max = servico.get('valor')
+            if not _inteiro_nao_negativo(tempo_min):
+                raise ValueError(f"Dispositivo '{identificador}': a distribuição constante exige 'valor' "
+                                 f"inteiro não negativo (recebido: {tempo_min!r}).")
+        elif distribuicao == 'exponencial':
+            media = servico.get('media')
+            if isinstance(media, bool) or not isinstance(media, (int, float)) or not 0 < media < math.inf:
+                raise ValueError(f"Dispositivo '{identificador}': a distribuição exponencial exige "
+                                 f"'media' positiva (recebido: {media!r}).")
+            tempo_min, tempo_max = 1, None
+        else:
+            raise ValueError(f"Dispositivo '{identificador}': distribuição de tempo de tratamento "
+                             f"desconhecida: '{distribuicao}'.")
+        self.distribuicao = distribuicao
+        self.media_servico = servico.get('media')
+
+        super().__init__(tipo, prioridade, tempo_min, tempo_max, prob_interrupcao,
+                         nivel_prioridade=nivel_prioridade, identificador=identificador, semente=semente)
+
+    def gerar_tempo_tratamento(self):
+        if self.distribuicao == 'constante':
+            return self.tempo_min
+        if self.distribuicao == 'exponencial':
+            return max(1, math.ceil(self.rng_servico.expovariate(1.0 / self.media_servico)))
+        return super().gerar_tempo_tratamento()
+
+
+class CatalogoDispositivos:
+    """
+    Fonte de interrupções montada a partir de uma configuração (JSON ou TOML), com
+    quantos dispositivos de cada tipo forem necessários. Substitui GerenciadorDispositivos.
+
+    Em vez de sondar cada dispositivo a cada ciclo, mantém um heap com a sondagem em que
+    cada dispositivo vai gerar a próxima interrupção; uma sondagem só toca nos dispositivos
+    que de fato geram interrupção, então o custo por ciclo não cresce com o número de
+    dispositivos. A ordem de sorteio é a mesma do GerenciadorDispositivos, de modo que
+    um catálogo com os três dispositivos padrão reproduz exatamente a mesma simulação.
+    Cada dispositivo tem seus próprios geradores, semeados pela 'semente' (por padrão,
+    tirada do gerador global) e pelo identificador: acrescentar dispositivos ao catálogo
+    não muda a sequência dos que já existiam.
+
+    Formato da configuração (uma entrada por tipo):
+        {"tipos": [{"tipo": "disco", "prioridade": 1, "rotulo": "Baixa",
+                    "prob_interrupcao": 0.15, "quantidade": 64,
+                    "servico": {"distribuicao": "uniforme", "min": 5, "max": 12}}]}
+    """
+
+    def __init__(self, configuracao, semente=None, pool=None):
+        if semente is None:
+            semente = random.getrandbits(64)
+        self.tipos = {}
+        self.dispositivos = []
+        for entrada in configuracao['tipos']:
+            tipo = entrada['tipo']
+            if tipo in self.tipos:
+                raise ValueError(f"Tipo de dispositivo repetido no catálogo: '{tipo}'.")
+            nivel = entrada['prioridade']
+            rotulo = entrada.get('rotulo', str(nivel))
+            self.tipos[tipo] = (nivel, rotulo)
+
+            quantidade = entrada.get('quantidade', 1)
+            if not _inteiro_nao_negativo(quantidade) or quantidade < 1:
+                raise ValueError(f"Dispositivo '{tipo}': 'quantidade' deve ser um inteiro de pelo "
+                                 f"menos 1 (recebido: {quantidade!r}).")
+            for i in range(quantidade):
+                identificador = tipo if quantidade == 1 else f"{tipo}-{i}"
+                self.dispositivos.append(DispositivoConfigurado(
+                    tipo, rotulo, nivel, entrada['prob_interrupcao'],
+                    entrada.get('servico', {'distribuicao': 'constante', 'valor': 1}),
+                    identificador, semente
+                ))
+
+        # Interrupções reaproveitadas (PoolInterrupcoes), como em GerenciadorDispositivos
+        self.pool = pool
+        for dispositivo in self.dispositivos:
+            dispositivo.pool = pool
+
+        # Busca O(1) por identificador
+        self.por_id = {d.identificador: d for d in self.dispositivos}
+
+        # Heap de (sondagem da próxima interrupção, índice do dispositivo)
+        self.sondagens_feitas = 0
+        self.proximas = [(d.sondagens_restantes, i) for i, d in enumerate(self.dispositivos)
+                         if d.sondagens_restantes != math.inf]
+        heapq.heapify(self.proximas)
+
+    def verificar_interrupcoes(self, tempo_atual):
+        """Retorna as interrupções geradas nesta sondagem, na ordem dos dispositivos."""
+        self.sondagens_feitas += 1
+        proximas = self.proximas
+        interrupcoes_geradas = []
+        while proximas and proximas[0][0] <= self.sondagens_feitas:
+            _, indice = heapq.heappop(proximas)
+            dispositivo = self.dispositivos[indice]
+            interrupcoes_geradas.append(dispositivo.gerar_interrupcao(tempo_atual))
+            heapq.heappush(proximas, (self.sondagens_feitas + dispositivo.sondagens_restantes, indice))
+        return interrupcoes_geradas
+
+    def sondagens_ate_proxima_interrupcao(self, tempo_atual=None):
+        if not self.proximas:
+            return math.inf
+        return self.proximas[0][0] - self.sondagens_feitas
+
+    def pular_sondagens(self, quantidade):
+        self.sondagens_feitas += quantidade
+
+    def ressemear(self, semente):
+        """Troca a semente de todos os dispositivos (as próximas chegadas já sorteadas são mantidas)."""
+        for dispositivo in self.dispositivos:
+            dispositivo.ressemear(semente)
+
+    def notificar_interrupcao_tratada(self, tipo_dispositivo, origem=None):
+        dispositivo = self.por_id.get(origem if origem is not None else tipo_dispositivo)
+        if dispositivo:
+            dispositivo.interrupcao_tratada()
+
+    def notificar_interrupcao_descartada(self, tipo_dispositivo, origem=None, mesclada=False):
+        dispositivo = self.por_id.get(origem if origem is not None else tipo_dispositivo)
+        if dispositivo:
+            dispositivo.interrupcao_descartada(mesclada)
+
+    def prioridades(self):
+        """Retorna {tipo: (nível numérico, rótulo)} definidos na configuração."""
+        return dict(self.tipos)
+
+    def obter_dispositivo(self, identificador):
+        return self.por_id[identificador]
+
+    def obter_estatisticas_gerais(self):
+        """Estatísticas somadas por tipo (no mesmo formato de GerenciadorDispositivos)."""
+        estatisticas = {tipo: {'tipo': tipo, 'prioridade': rotulo, 'dispositivos': 0,
+                               'total_interrupcoes': 0, 'pendentes': 0, 'descartadas': 0, 'mescladas': 0}
+                        for tipo, (_, rotulo) in self.tipos.items()}
+        for dispositivo in self.dispositivos:
+            estat = estatisticas[dispositivo.tipo]
+            estat['dispositivos'] += 1
+            estat['total_interrupcoes'] += dispositivo.total_interrupcoes_geradas
+            estat['pendentes'] += dispositivo.interrupcoes_pendentes
+            estat['descartadas'] += dispositivo.interrupcoes_descartadas
+            estat['mescladas'] += dispositivo.interrupcoes_mescladas
+        return estatisticas
+
+
+def ler_configuracao(caminho):
+    """Lê a configuração do catálogo de um arquivo .json ou .toml."""
+    if caminho.endswith('.toml'):
+        if tomllib is None:
+            raise RuntimeError("Leitura de TOML requer Python 3.11 ou superior (módulo tomllib).")
+        with open(caminho, "rb") as arquivo:
+            return tomllib.load(arquivo)
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def carregar_catalogo(caminho, semente=None):
+    """Cria um CatalogoDispositivos a partir de um arquivo de configuração."""
+    return CatalogoDispositivos(ler_configuracao(caminho), semente)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("=== TESTE DO CATÁLOGO DE DISPOSITIVOS ===\n")
+    for quantidade in (1, 100, 10000):
+        configuracao = {'tipos': [
+            {'tipo': 'nic', 'prioridade': 2, 'rotulo': 'Média', 'prob_interrupcao': 0.001,
+             'quantidade': quantidade, 'servico': {'distribuicao': 'constante', 'valor': 1}},
+        ]}
+        catalogo = CatalogoDispositivos(configuracao)
+        inicio = time.perf_counter()
+        for tempo in range(10000):
+            catalogo.verificar_interrupcoes(tempo)
+        duracao = time.perf_counter() - inicio
+        print(f"{quantidade:>6} dispositivos: {duracao / 10000 * 1e6:.2f} µs por sondagem")
@@ -0,0 +1,103 @@
+import os
+import pickle
+import random
+import zlib
+
+# Cabeçalho do formato: assinatura + versão, seguidos do estado comprimido
+ASSINATURA = b'IOSIMCP'
+VERSAO = 1
+
+
+def capturar(simulador):
+    """
+    Gera um snapshot binário compacto do simulador.
+    Inclui todo o grafo de objetos (processo, fila do escalonador com as interrupções
+    em trânsito, contadores e geradores aleatórios dos dispositivos, info) e o estado do
+    gerador global, para que a execução continue exatamente de onde parou.
+    """
+    estado = (random.getstate(), simulador)
+    corpo = zlib.compress(pickle.dumps(estado, protocol=pickle.HIGHEST_PROTOCOL))
+    return ASSINATURA + bytes([VERSAO]) + corpo
+
+
+def restaurar(dados, semente=None):
+    """
+    Reconstrói um simulador a partir de um snapshot e restaura o estado do gerador global.
+    Com 'semente', o gerador global e os geradores dos dispositivos são ressemeados após a
+    restauração: útil para bifurcar um estado já aquecido em várias execuções diferentes.
+    """
+    if not dados.startswith(ASSINATURA):
+        raise ValueError("Snapshot inválido: assinatura não reconhecida.")
+    versao = dados[len(ASSINATURA)]
+    if versao != VERSAO:
+        raise ValueError(f"Versão de snapshot não suportada: {versao} (esperada {VERSAO}).")
+
+    estado_rng, simulador = pickle.loads(zlib.decompress(dados[len(ASSINATURA) + 1:]))
+    random.setstate(estado_rng)
+    if semente is not None:
+        random.seed(semente)
+        if hasattr(simulador.dispositivos, 'ressemear'):
+            simulador.dispositivos.ressemear(semente)
+    return simulador
+
+
+def salvar_checkpoint(simulador, caminho):
+    """Grava o snapshot em disco de forma atômica (arquivo temporário + rename)."""
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(capturar(simulador))
+    os.replace(temporario, caminho)
+
+
+def carregar_checkpoint(caminho, semente=None):
+    """Lê um snapshot salvo com salvar_checkpoint e retorna o simulador restaurado."""
+    with open(caminho, "rb") as arquivo:
+        return restaurar(arquivo.read(), semente)
+
+
+def executar_com_checkpoints(simulador, caminho, intervalo):
+    """
+    Executa a simulação até o fim gravando um checkpoint a cada 'intervalo' unidades de tempo.
+    Pode ser chamado de novo sobre um simulador vindo de carregar_checkpoint para retomar.
+    """
+    if intervalo < 1:
+        raise ValueError("O intervalo entre checkpoints deve ser de pelo menos 1 unidade de tempo.")
+    horizonte = simulador.tempo_total
+    while not simulador.concluido():
+        # Limita temporariamente o horizonte para parar no próximo ponto de checkpoint
+        simulador.tempo_total = min(horizonte, simulador.tempo_atual + intervalo - 1)
+        simulador.executar()
+        simulador.tempo_total = horizonte
+        salvar_checkpoint(simulador, caminho)
+    return simulador.info
+
+
+def bifurcar(simulador, sementes):
+    """
+    Gera uma cópia independente do simulador para cada semente (execuções "e se"
+    a partir do mesmo estado aquecido, sem repetir o aquecimento).
+    Cada cópia tem os próprios geradores dos dispositivos, então podem ser executadas
+    em qualquer ordem, ou intercaladas.
+    """
+    dados = capturar(simulador)
+    for semente in sementes:
+        yield restaurar(dados, semente)
+
+
+if __name__ == "__main__":
+    from simulacao import Simulador
+
+    print("=== TESTE DE CHECKPOINT ===\n")
+    referencia = Simulador(tempo_total=5000, seed=3, modo='eventos')
+    referencia.executar()
+
+    parcial = Simulador(tempo_total=5000, seed=3, modo='eventos')
+    parcial.tempo_total = 150
+    parcial.executar()
+    parcial.tempo_total = 5000
+    dados = capturar(parcial)
+    print(f"Snapshot em T={parcial.tempo_atual}: {len(dados)} bytes")
+
+    retomado = restaurar(dados)
+    retomado.executar()
+    print("Retomada idêntica à execução contínua:", retomado.info == referencia.info)
@@ -0,0 +1,258 @@
+import random
+
+from dispositivos import GerenciadorDispositivos, Interrupcao, derivar_semente
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; só este gerador depende dele
+    np = None
+
+# Sondagem usada como "nunca" para dispositivos com probabilidade zero
+NUNCA = 2 ** 62
+
+
+class GeradorChegadasVetorizado:
+    """
+    Fonte de interrupções que sorteia as chegadas de todos os dispositivos em blocos
+    com NumPy, no lugar de sortear dispositivo a dispositivo a cada sondagem.
+
+    Para cada bloco de 'tamanho_bloco' sondagens são sorteados, de uma vez, os intervalos
+    geométricos entre chegadas de cada dispositivo (equivalentes a um teste de Bernoulli
+    com prob_interrupcao por sondagem) e os tempos de tratamento de todas as chegadas do
+    bloco. O Simulador só recebe as sondagens que de fato têm chegadas; o bloco seguinte
+    é sorteado quando o atual se esgota.
+
+    As distribuições por dispositivo são as mesmas da fonte original, mas a sequência
+    sorteada é outra (vem do gerador do NumPy), então os resultados não coincidem
+    número a número com GerenciadorDispositivos para a mesma semente.
+
+    Cada bloco vira uma lista de (sondagem, dispositivo, tempo de tratamento) e o gerador
+    guarda a sondagem da próxima chegada: uma sondagem sem chegada custa uma comparação.
+    'dispositivos' e 'pool' vêm da fonte (os dispositivos servem só de descrição; quem
+    sorteia é o gerador), como em GerenciadorDispositivos.
+    """
+
+    def __init__(self, fonte=None, seed=None, tamanho_bloco=65536):
+        """
+        fonte: GerenciadorDispositivos ou CatalogoDispositivos de onde vêm os dispositivos
+        (padrão: os três dispositivos padrão).
+        seed: semente do gerador do NumPy; por padrão é tirada do gerador global 'random',
+        de modo que a semente do Simulador também determina as chegadas.
+        """
+        if np is None:
+            raise RuntimeError("O gerador vetorizado de chegadas requer NumPy (pip install numpy).")
+        if tamanho_bloco < 1:
+            raise ValueError("O tamanho do bloco deve ser positivo.")
+
+        fonte = fonte if fonte is not None else GerenciadorDispositivos()
+        dispositivos = self.dispositivos = list(fonte.dispositivos)
+        self.pool = getattr(fonte, 'pool', None)
+        self.mapa_prioridades = fonte.prioridades()
+        self.tamanho_bloco = tamanho_bloco
+        self.rng = np.random.default_rng(seed if seed is not None else random.getrandbits(64))
+
+        self.tipos = [d.tipo for d in dispositivos]
+        self.identificadores = [d.identificador for d in dispositivos]
+        self.indice_por_id = {identificador: i for i, identificador in enumerate(self.identificadores)}
+
+        self.probabilidades = np.array([min(d.prob_interrupcao, 1.0) for d in dispositivos], dtype=np.float64)
+        self.tempo_min = np.array([d.tempo_min for d in dispositivos], dtype=np.int64)
+        self.tempo_max = np.array([d.tempo_max if d.tempo_max is not None else d.tempo_min
+                                   for d in dispositivos], dtype=np.int64)
+        # Dispositivos do catálogo com tempo de tratamento exponencial
+        self.media_exponencial = np.array(
+            [d.media_servico if getattr(d, 'distribuicao', None) == 'exponencial' else 0.0
+             for d in dispositivos], dtype=np.float64)
+
+        # Sondagem (absoluta, a partir de 1) da próxima chegada de cada dispositivo
+        self.proximas = np.full(len(dispositivos), NUNCA, dtype=np.int64)
+        ativos = self.probabilidades > 0.0
+        self.proximas[ativos] = self.rng.geometric(self.probabilidades[ativos])
+
+        # Estatísticas por dispositivo
+        self.total_geradas = [0] * len(dispositivos)
+        self.pendentes = [0] * len(dispositivos)
+        self.descartadas = [0] * len(dispositivos)
+        self.mescladas = [0] * len(dispositivos)
+
+        # Bloco atual de chegadas, já ordenado: lista de (sondagem, dispositivo, tratamento)
+        self.sondagens_feitas = 0
+        self.fim_bloco = 0
+        self.bloco = []
+        self.cursor = 0
+        self.proxima = 0  # sondagem da próxima chegada (NUNCA se não houver mais)
+        self._avancar()
+
+    def ressemear(self, semente):
+        """
+        Troca a semente (derivada da base 'semente') e sorteia de novo as chegadas a partir
+        da sondagem atual, descartando o bloco já sorteado.
+        """
+        self.rng = np.random.default_rng(derivar_semente(semente, 'chegadas_vetorizadas'))
+        self.proximas = np.full(len(self.tipos), NUNCA, dtype=np.int64)
+        ativos = self.probabilidades > 0.0
+        self.proximas[ativos] = self.sondagens_feitas + self.rng.geometric(self.probabilidades[ativos])
+        self.fim_bloco = self.sondagens_feitas + 1
+        self.bloco = []
+        self.cursor = 0
+        self._avancar()
+
+    def _sortear_bloco(self):
+        """Sorteia todas as chegadas das sondagens [fim_bloco, fim_bloco + tamanho_bloco)."""
+        fim = self.fim_bloco + self.tamanho_bloco
+        sondagens, donos = [], []
+
+        ativos = np.flatnonzero(self.proximas < fim)
+        while ativos.size:
+            # Intervalos suficientes para cobrir o bloco com folga; quem não for coberto
+            # (raro) entra na próxima volta do laço
+            esperado = self.probabilidades[ativos] * (fim - self.proximas[ativos])
+            quantidades = np.ceil(esperado + 4.0 * np.sqrt(esperado) + 1.0).astype(np.int64)
+            dono = np.repeat(ativos, quantidades)
+            intervalos = self.rng.geometric(self.probabilidades[dono])
+
+            # Soma acumulada dos intervalos dentro do trecho de cada dispositivo
+            acumulado = np.cumsum(intervalos)
+            fim_trecho = np.cumsum(quantidades)
+            inicio_trecho = fim_trecho - quantidades
+            base = np.repeat(acumulado[inicio_trecho] - intervalos[inicio_trecho], quantidades)
+            relativo = acumulado - base
+            chegadas = self.proximas[dono] + relativo - intervalos
+
+            dentro = chegadas < fim
+            sondagens.append(chegadas[dentro])
+            donos.append(dono[dentro])
+
+            # Próxima chegada de cada dispositivo: a primeira fora do bloco, ou a que vem
+            # depois da última sorteada se todas couberam
+            fora = np.minimum.reduceat(np.where(dentro, NUNCA, chegadas), inicio_trecho)
+            depois = self.proximas[ativos] + relativo[fim_trecho - 1]
+            self.proximas[ativos] = np.where(fora == NUNCA, depois, fora)
+            ativos = ativos[self.proximas[ativos] < fim]
+
+        sondagens = np.concatenate(sondagens) if sondagens else np.empty(0, dtype=np.int64)
+        donos = np.concatenate(donos) if donos else np.empty(0, dtype=np.int64)
+        # Mesma ordem do GerenciadorDispositivos: por sondagem e, nela, pela ordem dos dispositivos
+        ordem = np.lexsort((donos, sondagens))
+        sondagens, donos = sondagens[ordem], donos[ordem]
+
+        tratamentos = self.rng.integers(self.tempo_min[donos], self.tempo_max[donos] + 1)
+        medias = self.media_exponencial[donos]
+        exponenciais = medias > 0.0
+        if exponenciais.any():
+            sorteados = np.ceil(self.rng.exponential(medias[exponenciais])).astype(np.int64)
+            tratamentos[exponenciais] = np.maximum(1, sorteados)
+
+        self.fim_bloco = fim
+        self.bloco = list(zip(sondagens.tolist(), donos.tolist(), tratamentos.tolist()))
+        self.cursor = 0
+
+    def _avancar(self):
+        """Atualiza self.proxima, sorteando blocos conforme necessário."""
+        while self.cursor >= len(self.bloco):
+            if not (self.proximas < NUNCA).any():
+                self.proxima = NUNCA
+                return
+            self._sortear_bloco()
+        self.proxima = self.bloco[self.cursor][0]
+
+    def verificar_interrupcoes(self, tempo_atual):
+        self.sondagens_feitas += 1
+        # Caminho rápido: a maioria das sondagens não tem chegada
+        if self.sondagens_feitas < self.proxima:
+            return []
+        return self._entregar(tempo_atual)
+
+    def _entregar(self, tempo_atual):
+        sondagem = self.sondagens_feitas
+        tipos, identificadores = self.tipos, self.identificadores
+        total_geradas, pendentes = self.total_geradas, self.pendentes
+        criar = self.pool.obter if self.pool is not None else Interrupcao
+        interrupcoes_geradas = []
+        while self.proxima <= sondagem:
+            bloco, cursor = self.bloco, self.cursor
+            fim = len(bloco)
+            while cursor < fim:
+                chegada, indice, tratamento = bloco[cursor]
+                if chegada > sondagem:
+                    break
+                interrupcoes_geradas.append(criar(tipos[indice], tempo_atual, tratamento,
+                                                  identificadores[indice]))
+                total_geradas[indice] += 1
+                pendentes[indice] += 1
+                cursor += 1
+            self.cursor = cursor
+            self._avancar()
+        return interrupcoes_geradas
+
+    def sondagens_ate_proxima_interrupcao(self, tempo_atual=None):
+        if self.proxima == NUNCA:
+            return float('inf')
+        return self.proxima - self.sondagens_feitas
+
+    def pular_sondagens(self, quantidade):
+        self.sondagens_feitas += quantidade
+
+    def notificar_interrupcao_tratada(self, tipo_dispositivo, origem=None):
+        indice = self.indice_por_id.get(origem if origem is not None else tipo_dispositivo)
+        if indice is not None and self.pendentes[indice] > 0:
+            self.pendentes[indice] -= 1
+
+    def notificar_interrupcao_descartada(self, tipo_dispositivo, origem=None, mesclada=False):
+        indice = self.indice_por_id.get(origem if origem is not None else tipo_dispositivo)
+        if indice is not None:
+            if self.pendentes[indice] > 0:
+                self.pendentes[indice] -= 1
+            contadores = self.mescladas if mesclada else self.descartadas
+            contadores[indice] += 1
+
+    def prioridades(self):
+        return dict(self.mapa_prioridades)
+
+    def obter_estatisticas_gerais(self):
+        """Estatísticas somadas por tipo (no mesmo formato de GerenciadorDispositivos)."""
+        estatisticas = {tipo: {'tipo': tipo, 'prioridade': rotulo, 'total_interrupcoes': 0, 'pendentes': 0,
+                               'descartadas': 0, 'mescladas': 0}
+                        for tipo, (_, rotulo) in self.mapa_prioridades.items()}
+        for indice, tipo in enumerate(self.tipos):
+            estat = estatisticas[tipo]
+            estat['total_interrupcoes'] += self.total_geradas[indice]
+            estat['pendentes'] += self.pendentes[indice]
+            estat['descartadas'] += self.descartadas[indice]
+            estat['mescladas'] += self.mescladas[indice]
+        return estatisticas
+
+
+if __name__ == "__main__":
+    import time
+
+    from simulacao import Simulador
+
+    print("=== TESTE DO GERADOR VETORIZADO DE CHEGADAS ===\n")
+    ciclos = 1000000
+    for nome, fonte in (('GerenciadorDispositivos', GerenciadorDispositivos()),
+                        ('GeradorChegadasVetorizado', GeradorChegadasVetorizado(seed=1))):
+        inicio = time.perf_counter()
+        for tempo in range(ciclos):
+            fonte.verificar_interrupcoes(tempo)
+        duracao = time.perf_counter() - inicio
+        totais = {tipo: e['total_interrupcoes'] for tipo, e in fonte.obter_estatisticas_gerais().items()}
+        print(f"{nome:<26} {duracao / ciclos * 1e9:8.1f} ns por sondagem | chegadas: {totais}")
+
+    simulador = Simulador(tempo_total=100000, seed=1, modo='eventos', dispositivos=GeradorChegadasVetorizado)
+    print("\nSimulação com chegadas vetorizadas:", simulador.executar())
+
+    # Cópias bifurcadas com sementes diferentes devem seguir caminhos diferentes
+    from checkpoint import bifurcar
+    aquecido = Simulador(tempo_total=100000, seed=1, modo='eventos', dispositivos=GeradorChegadasVetorizado)
+    aquecido.tempo_total = 50
+    aquecido.executar()
+    aquecido.tempo_total = 100000
+    resultados = []
+    for copia in bifurcar(aquecido, [10, 11, 10]):
+        copia.executar()
+        resultados.append({tipo: e['total_interrupcoes']
+                           for tipo, e in copia.dispositivos.obter_estatisticas_gerais().items()})
+    assert resultados[0] != resultados[1], "cópias com sementes diferentes não divergiram"
+    assert resultados[0] == resultados[2], "cópias com a mesma semente divergiram"
+    print("Bifurcação: sementes diferentes divergem, mesma semente reproduz.")
@@ -0,0 +1,157 @@
+import math
+
+from dispositivos import Interrupcao
+from simulacao import Simulador
+
+
+class CustoLote:
+    """
+    Modelo de custo de um tratamento que atende várias interrupções de uma vez (como um
+    tratador de DMA que processa todas as conclusões pendentes): a primeira interrupção
+    custa o seu tempo de tratamento inteiro e cada adicional custa apenas a fração
+    'fator_adicional' do seu tempo, já que entrada no tratador, troca de contexto e leitura
+    dos registradores do dispositivo são pagas uma vez só. 'custo_fixo' soma um custo
+    extra por lote (ex.: programar o próximo descritor de DMA).
+    """
+
+    def __init__(self, fator_adicional=0.25, custo_fixo=0):
+        if not 0.0 <= fator_adicional <= 1.0:
+            raise ValueError("O fator adicional deve estar entre 0 e 1.")
+        if custo_fixo < 0:
+            raise ValueError("O custo fixo do lote não pode ser negativo.")
+        self.fator_adicional = fator_adicional
+        self.custo_fixo = custo_fixo
+
+    def __call__(self, membros):
+        adicionais = sum(membro.tempo_tratamento for membro in membros[1:])
+        return membros[0].tempo_tratamento + math.ceil(self.fator_adicional * adicionais) + self.custo_fixo
+
+
+class LoteInterrupcoes(Interrupcao):
+    """
+    Interrupções do mesmo dispositivo atendidas por um único tratamento.
+    O Simulador conta, notifica e mede cada uma das 'membros' individualmente.
+    """
+    __slots__ = ('membros',)
+
+    def __init__(self, membros, tempo_tratamento):
+        primeira = membros[0]
+        super().__init__(primeira.tipo, primeira.tempo_geracao, tempo_tratamento, primeira.origem)
+        self.membros = membros
+
+    def __str__(self):
+        return (f"Lote [{self.tipo.upper()}] com {len(self.membros)} interrupções | "
+                f"Gerado em: T={self.tempo_geracao} | "
+                f"Tempo de tratamento: {self.tempo_tratamento}ut")
+
+
+class Coalescencia:
+    """
+    Coalescência de interrupções (moderação no estilo de controladoras de disco e rede),
+    passada ao Simulador.
+
+    As interrupções dos 'tipos' indicados não vão direto para o escalonador: ficam retidas
+    por dispositivo e são entregues como um único lote quando o dispositivo acumula
+    'limite' interrupções ou quando a mais antiga completa 'janela' unidades de tempo.
+    Enquanto isso o processo principal continua executando; cada lote custa uma troca de
+    contexto e o tempo de tratamento dado pelo modelo 'custo' (padrão: CustoLote()).
+    A liberação por tempo é verificada nas sondagens dos dispositivos, como as chegadas.
+    Guarda as interrupções retidas, então cada Simulador precisa da sua instância.
+    """
+
+    def __init__(self, tipos=('disco',), limite=8, janela=10, custo=None):
+        if limite < 1:
+            raise ValueError("O limite do lote deve ser pelo menos 1.")
+        if janela < 0:
+            raise ValueError("A janela de coalescência não pode ser negativa.")
+        self.tipos = frozenset(tipos)
+        self.limite = limite
+        self.janela = janela
+        self.custo = custo if custo is not None else CustoLote()
+
+        # Interrupções retidas por dispositivo (origem, ou tipo se a origem não for conhecida)
+        self.retidas = {}
+
+    def _lote(self, membros):
+        if len(membros) == 1:
+            return membros[0]
+        return LoteInterrupcoes(membros, self.custo(membros))
+
+    def filtrar(self, novas, tempo_atual):
+        """
+        Recebe as interrupções geradas nesta sondagem e retorna as que devem ir para o
+        escalonador agora: as de tipos sem coalescência e os lotes que ficaram prontos.
+        """
+        entregues = []
+        for interrupcao in novas:
+            if interrupcao.tipo not in self.tipos:
+                entregues.append(interrupcao)
+                continue
+            chave = interrupcao.origem if interrupcao.origem is not None else interrupcao.tipo
+            membros = self.retidas.setdefault(chave, [])
+            membros.append(interrupcao)
+            if len(membros) >= self.limite:
+                entregues.append(self._lote(self.retidas.pop(chave)))
+
+        if self.retidas:
+            vencidas = [chave for chave, membros in self.retidas.items()
+                        if membros[0].tempo_geracao + self.janela <= tempo_atual]
+            for chave in vencidas:
+                entregues.append(self._lote(self.retidas.pop(chave)))
+        return entregues
+
+    def ciclos_ate_liberacao(self, tempo_atual):
+        """Ciclos até o próximo lote retido vencer a janela (infinito se nada está retido)."""
+        if not self.retidas:
+            return math.inf
+        return min(membros[0].tempo_geracao for membros in self.retidas.values()) + self.janela - tempo_atual
+
+    def total_retidas(self):
+        return sum(len(membros) for membros in self.retidas.values())
+
+
+def comparar_coalescencia(tempo_total, coalescencia, seed=0, modo='eventos'):
+    """
+    Executa o mesmo cenário sem e com coalescência e retorna, para cada caso, as trocas de
+    contexto (uma por tratamento iniciado), o tempo de CPU gasto em tratadores e a vazão
+    do processo principal (unidades executadas por unidade de tempo decorrida).
+    """
+    resultados = {}
+    for nome, configuracao in (('sem_coalescencia', None), ('com_coalescencia', coalescencia)):
+        simulador = Simulador(tempo_total, seed=seed, modo=modo, coalescencia=configuracao)
+        info = simulador.executar()
+        trocas = info['total_interrupcoes'] - info.get('interrupcoes_agrupadas', 0)
+        decorrido = min(simulador.tempo_atual, tempo_total + 1)
+        resultados[nome] = {
+            'trocas_contexto': trocas,
+            'interrupcoes_tratadas': info['total_interrupcoes'],
+            'tempo_interrupcoes': info['tempo_interrupcoes'],
+            'tempo_processo': info['tempo_processo'],
+            'tempo_decorrido': decorrido,
+            'vazao_processo': info['tempo_processo'] / decorrido if decorrido else 0.0
+        }
+    antes, depois = resultados['sem_coalescencia'], resultados['com_coalescencia']
+    resultados['trocas_evitadas'] = antes['trocas_contexto'] - depois['trocas_contexto']
+    resultados['ganho_vazao'] = (depois['vazao_processo'] / antes['vazao_processo']
+                                 if antes['vazao_processo'] else None)
+    return resultados
+
+
+def formatar_comparacao(resultados):
+    """Tabela com as métricas sem e com coalescência, mais trocas evitadas e ganho de vazão."""
+    antes, depois = resultados['sem_coalescencia'], resultados['com_coalescencia']
+    linhas = [f"{'Métrica':<24} {'sem':>12} {'com':>12}"]
+    for chave in antes:
+        if isinstance(antes[chave], float):
+            linhas.append(f"{chave:<24} {antes[chave]:>12.4f} {depois[chave]:>12.4f}")
+        else:
+            linhas.append(f"{chave:<24} {antes[chave]:>12} {depois[chave]:>12}")
+    linhas.append(f"\nTrocas de contexto evitadas: {resultados['trocas_evitadas']}")
+    if resultados['ganho_vazao'] is not None:
+        linhas.append(f"Ganho de vazão do processo principal: {resultados['ganho_vazao']:.2f}x")
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    print("=== TESTE DA COALESCÊNCIA DE INTERRUPÇÕES ===\n")
+    print(formatar_comparacao(comparar_coalescencia(tempo_total=5000, coalescencia=Coalescencia(), seed=1)))
@@ -1,12 +1,39 @@
+import hashlib
+import math
 import random
 
+# Prioridades dos dispositivos padrão: tipo -> (nível numérico, rótulo).
+# Valores numéricos maiores indicam maior prioridade. Escalonador, Simulador e o log
+# obtêm as prioridades daqui (ou do catálogo configurado), e não de cópias próprias.
+PRIORIDADES_PADRAO = {
+    'teclado': (3, 'Alta'),
+    'impressora': (2, 'Média'),
+    'disco': (1, 'Baixa')
+}
+
+
+def derivar_semente(semente_base, *chaves):
+    """
+    Deriva uma semente de 64 bits a partir da semente base e de chaves (índice da
+    replicação, identificador do dispositivo, nome do fluxo...).
+    Usa um hash para que sementes de chaves vizinhas não sejam correlacionadas.
+    """
+    dados = ":".join(str(parte) for parte in (semente_base,) + chaves).encode()
+    return int.from_bytes(hashlib.sha256(dados).digest()[:8], 'big')
+
+
 class Interrupcao:
     """
     Classe base que representa uma interrupção gerada por um dispositivo.
     Esta classe é usada pelo Escalonador para gerenciar prioridades.
+    Usa __slots__ (sem __dict__ por objeto), já que é criada a cada chegada.
     """
-    def __init__(self, tipo, tempo_geracao, tempo_tratamento):
+    __slots__ = ('tipo', 'origem', 'tempo_geracao', 'tempo_tratamento',
+                 'tempo_inicio_tratamento', 'tempo_fim_tratamento')
+
+    def __init__(self, tipo, tempo_geracao, tempo_tratamento, origem=None):
         self.tipo = tipo  # 'teclado', 'impressora' ou 'disco'
+        self.origem = origem  # Identificador do dispositivo que gerou a interrupção
         self.tempo_geracao = tempo_geracao  # Quando a interrupção foi gerada
         self.tempo_tratamento = tempo_tratamento  # Quanto tempo leva para tratar
         self.tempo_inicio_tratamento = None  # Será definido quando começar o tratamento
@@ -18,13 +45,67 @@ class Interrupcao:
                 f"Tempo de tratamento: {self.tempo_tratamento}ut")
 
 
+class PoolInterrupcoes:
+    """
+    Lista de objetos Interrupcao livres para reaproveitamento (free-list), para que
+    simulações muito longas não criem um objeto novo a cada chegada.
+
+    Os dispositivos tiram objetos com 'obter' e o Simulador os devolve com 'liberar' ao fim
+    do tratamento (ou quando uma fila limitada os descarta). Só deve ser usado quando nada
+    guarda referências às interrupções depois disso: MetricasLatencia e o log apenas leem
+    os campos na hora, mas um observador próprio que as armazene veria objetos reciclados.
+    """
+
+    def __init__(self, capacidade=1024):
+        if capacidade < 1:
+            raise ValueError("A capacidade do pool deve ser positiva.")
+        self.capacidade = capacidade
+        self.livres = []
+
+        # Objetos criados de fato e pedidos atendidos com um objeto reaproveitado
+        self.criadas = 0
+        self.reaproveitadas = 0
+
+    def obter(self, tipo, tempo_geracao, tempo_tratamento, origem=None):
+        """Retorna uma Interrupcao com os campos informados, reaproveitando uma livre se houver."""
+        if not self.livres:
+            self.criadas += 1
+            return Interrupcao(tipo, tempo_geracao, tempo_tratamento, origem)
+        interrupcao = self.livres.pop()
+        interrupcao.tipo = tipo
+        interrupcao.origem = origem
+        interrupcao.tempo_geracao = tempo_geracao
+        interrupcao.tempo_tratamento = tempo_tratamento
+        interrupcao.tempo_inicio_tratamento = None
+        interrupcao.tempo_fim_tratamento = None
+        self.reaproveitadas += 1
+        return interrupcao
+
+    def liberar(self, interrupcao):
+        """Devolve uma interrupção que não será mais usada."""
+        # Lotes e outras subclasses têm campos próprios e não são reaproveitados
+        if type(interrupcao) is Interrupcao and len(self.livres) < self.capacidade:
+            self.livres.append(interrupcao)
+
+
 class DispositivoBase:
     """
     Classe base abstrata para todos os dispositivos de I/O.
     Define o comportamento comum e a interface que todos os dispositivos devem implementar.
-    
+
+    Cada dispositivo sorteia com geradores próprios (random.Random), um para as chegadas e
+    outro para os tempos de tratamento, semeados a partir da semente e do identificador.
+    Assim a sequência de um dispositivo não depende de quais outros existem nem da ordem
+    em que são sondados, e dois cenários com a mesma semente usam os mesmos números
+    aleatórios em tudo o que têm em comum (números aleatórios comuns).
     """
-    def __init__(self, tipo, prioridade, tempo_min, tempo_max, prob_interrupcao):
+    __slots__ = ('tipo', 'identificador', 'prioridade', 'nivel_prioridade', 'tempo_min', 'tempo_max',
+                 'prob_interrupcao', 'total_interrupcoes_geradas', 'interrupcoes_pendentes',
+                 'interrupcoes_descartadas', 'interrupcoes_mescladas', 'rng_chegadas', 'rng_servico',
+                 'sondagens_restantes', 'pool')
+
+    def __init__(self, tipo, prioridade, tempo_min, tempo_max, prob_interrupcao,
+                 nivel_prioridade=0, identificador=None, semente=None):
         """
         Parâmetros:
         - tipo: string identificadora ('teclado', 'impressora', 'disco')
@@ -32,9 +113,14 @@ class DispositivoBase:
         - tempo_min: tempo mínimo de tratamento da interrupção (em unidades de tempo)
         - tempo_max: tempo máximo de tratamento da interrupção (em unidades de tempo)
         - prob_interrupcao: probabilidade de gerar interrupção em cada unidade de tempo (0.0 a 1.0)
+        - nivel_prioridade: valor numérico da prioridade usado pelo Escalonador
+        - identificador: nome único do dispositivo (padrão: o próprio tipo)
+        - semente: semente base dos geradores do dispositivo (padrão: tirada do gerador global)
         """
         self.tipo = tipo
+        self.identificador = identificador or tipo
         self.prioridade = prioridade
+        self.nivel_prioridade = nivel_prioridade
         self.tempo_min = tempo_min
         self.tempo_max = tempo_max
         self.prob_interrupcao = prob_interrupcao
@@ -42,22 +128,59 @@ class DispositivoBase:
         # Estatísticas do dispositivo
         self.total_interrupcoes_geradas = 0
         self.interrupcoes_pendentes = 0
+        self.interrupcoes_descartadas = 0  # Perdidas por fila cheia
+        self.interrupcoes_mescladas = 0  # Absorvidas por uma pendente do mesmo dispositivo
+
+        # PoolInterrupcoes de onde saem as interrupções geradas (None: sempre cria objetos novos)
+        self.pool = None
+
+        self.rng_chegadas = random.Random()
+        self.rng_servico = random.Random()
+        self.ressemear(semente)
+
+        # Quantas sondagens faltam até a próxima interrupção (sorteado antecipadamente)
+        self.sondagens_restantes = self.sortear_intervalo()
+
+    def ressemear(self, semente=None):
+        """
+        Semeia os geradores do dispositivo a partir da semente base.
+        Sem semente, a base é tirada do gerador global 'random'.
+        """
+        if semente is None:
+            semente = random.getrandbits(64)
+        self.rng_chegadas.seed(derivar_semente(semente, self.identificador, 'chegadas'))
+        self.rng_servico.seed(derivar_semente(semente, self.identificador, 'servico'))
+
+    def sortear_intervalo(self):
+        """
+        Sorteia o número de sondagens até a próxima interrupção.
+        Como cada sondagem gera interrupção com probabilidade prob_interrupcao,
+        o intervalo segue uma distribuição geométrica (amostrada por inversão).
+        """
+        if self.prob_interrupcao <= 0.0:
+            return math.inf
+        if self.prob_interrupcao >= 1.0:
+            return 1
+        return int(math.log(1.0 - self.rng_chegadas.random()) / math.log(1.0 - self.prob_interrupcao)) + 1
 
     def pode_gerar_interrupcao(self):
         """
-        Utiliza RNG (Random Number Generator) para determinar se o dispositivo
-        gera uma interrupção neste momento.
-        
-        Retorna True com probabilidade definida em prob_interrupcao.
+        Conta uma sondagem e indica se o dispositivo gera uma interrupção nela.
+
+        Não sorteia nada aqui: decrementa sondagens_restantes, o intervalo geométrico
+        sorteado antecipadamente por sortear_intervalo, e retorna True quando ele chega
+        a zero (gerar_interrupcao sorteia então o próximo intervalo). O efeito é o mesmo de
+        sortear a cada sondagem com probabilidade prob_interrupcao.
         """
-        return random.random() < self.prob_interrupcao
+        self.sondagens_restantes -= 1
+        return self.sondagens_restantes <= 0
 
     def gerar_tempo_tratamento(self):
         """
         Gera aleatoriamente o tempo que será necessário para tratar a interrupção.
         Usa distribuição uniforme entre tempo_min e tempo_max.
         """
-        return random.randint(self.tempo_min, self.tempo_max)
+        return self.rng_servico.randint(self.tempo_min, self.tempo_max)
 
     def tentar_gerar_interrupcao(self, tempo_atual):
         """
@@ -68,16 +191,26 @@ class DispositivoBase:
         - None caso contrário
         """
         if self.pode_gerar_interrupcao():
-            tempo_tratamento = self.gerar_tempo_tratamento()
-            interrupcao = Interrupcao(self.tipo, tempo_atual, tempo_tratamento)
-            
-            self.total_interrupcoes_geradas += 1
-            self.interrupcoes_pendentes += 1
-            
-            return interrupcao
+            return self.gerar_interrupcao(tempo_atual)
         
         return None
 
+    def gerar_interrupcao(self, tempo_atual):
+        """
+        Gera a interrupção deste instante e já sorteia o intervalo até a próxima.
+        """
+        tempo_tratamento = self.gerar_tempo_tratamento()
+        if self.pool is not None:
+            interrupcao = self.pool.obter(self.tipo, tempo_atual, tempo_tratamento, self.identificador)
+        else:
+            interrupcao = Interrupcao(self.tipo, tempo_atual, tempo_tratamento, self.identificador)
+        self.sondagens_restantes = self.sortear_intervalo()
+        
+        self.total_interrupcoes_geradas += 1
+        self.interrupcoes_pendentes += 1
+        
+        return interrupcao
+
     def interrupcao_tratada(self):
         """
         Deve ser chamado quando uma interrupção deste dispositivo foi completamente tratada.
@@ -85,6 +218,18 @@ class DispositivoBase:
         if self.interrupcoes_pendentes > 0:
             self.interrupcoes_pendentes -= 1
 
+    def interrupcao_descartada(self, mesclada=False):
+        """
+        Deve ser chamado quando uma interrupção deste dispositivo saiu da fila sem ser
+        tratada (descartada, ou mesclada a outra pendente do mesmo dispositivo).
+        """
+        if self.interrupcoes_pendentes > 0:
+            self.interrupcoes_pendentes -= 1
+        if mesclada:
+            self.interrupcoes_mescladas += 1
+        else:
+            self.interrupcoes_descartadas += 1
+
     def obter_estatisticas(self):
         """
         Retorna um dicionário com estatísticas do dispositivo.
@@ -93,7 +238,9 @@ class DispositivoBase:
             'tipo': self.tipo,
             'prioridade': self.prioridade,
             'total_interrupcoes': self.total_interrupcoes_geradas,
-            'pendentes': self.interrupcoes_pendentes
+            'pendentes': self.interrupcoes_pendentes,
+            'descartadas': self.interrupcoes_descartadas,
+            'mescladas': self.interrupcoes_mescladas
         }
 
     def __str__(self):
@@ -110,13 +257,17 @@ class Teclado(DispositivoBase):
     - Tempo de tratamento: RÁPIDO (1-3 unidades de tempo)
     - Frequência: BAIXA (usuário não digita constantemente)
     """
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(self, semente=None):
         super().__init__(
             tipo='teclado',
-            prioridade='Alta',
+            prioridade=PRIORIDADES_PADRAO['teclado'][1],
+            nivel_prioridade=PRIORIDADES_PADRAO['teclado'][0],
             tempo_min=1,
             tempo_max=3,
-            prob_interrupcao=0.05  # 5% de chance por unidade de tempo
+            prob_interrupcao=0.05,  # 5% de chance por unidade de tempo
+            semente=semente
         )
 
 
@@ -127,13 +278,17 @@ class Impressora(DispositivoBase):
     - Tempo de tratamento: MODERADO (3-7 unidades de tempo)
     - Frequência: MODERADA 
     """
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(self, semente=None):
         super().__init__(
             tipo='impressora',
-            prioridade='Média',
+            prioridade=PRIORIDADES_PADRAO['impressora'][1],
+            nivel_prioridade=PRIORIDADES_PADRAO['impressora'][0],
             tempo_min=3,
             tempo_max=7,
-            prob_interrupcao=0.08  # 8% de chance por unidade de tempo
+            prob_interrupcao=0.08,  # 8% de chance por unidade de tempo
+            semente=semente
         )
 
 
@@ -144,13 +299,17 @@ class Disco(DispositivoBase):
     - Tempo de tratamento: LENTO (5-12 unidades de tempo)
     - Frequência: ALTA (muitas operações de I/O)
     """
-    def __init__(self):
+    __slots__ = ()
+
+    def __init__(self, semente=None):
         super().__init__(
             tipo='disco',
-            prioridade='Baixa',
+            prioridade=PRIORIDADES_PADRAO['disco'][1],
+            nivel_prioridade=PRIORIDADES_PADRAO['disco'][0],
             tempo_min=5,
             tempo_max=12,
-            prob_interrupcao=0.15  # 15% de chance por unidade de tempo
+            prob_interrupcao=0.15,  # 15% de chance por unidade de tempo
+            semente=semente
         )
 
 
@@ -161,15 +320,32 @@ class GerenciadorDispositivos:
     
     Responsabilidade: Coordenar a geração de interrupções de múltiplos dispositivos.
     """
-    def __init__(self):
+    def __init__(self, semente=None, pool=None):
+        """
+        'semente' é a semente base dos geradores de cada dispositivo; por padrão é tirada
+        do gerador global 'random', de modo que random.seed (ou a semente do Simulador)
+        também determina as chegadas.
+        'pool' (PoolInterrupcoes) faz os dispositivos reaproveitarem as interrupções que o
+        Simulador libera ao fim de cada tratamento.
+        """
+        if semente is None:
+            semente = random.getrandbits(64)
+
         # Instancia os três dispositivos
-        self.teclado = Teclado()
-        self.impressora = Impressora()
-        self.disco = Disco()
+        self.teclado = Teclado(semente)
+        self.impressora = Impressora(semente)
+        self.disco = Disco(semente)
         
         # Lista para facilitar iteração
         self.dispositivos = [self.teclado, self.impressora, self.disco]
 
+        self.pool = pool
+        for dispositivo in self.dispositivos:
+            dispositivo.pool = pool
+
+        # Índice por tipo para localizar o dispositivo em O(1)
+        self.por_tipo = {dispositivo.tipo: dispositivo for dispositivo in self.dispositivos}
+
     def verificar_interrupcoes(self, tempo_atual):
         """
         Verifica todos os dispositivos e retorna uma lista de interrupções geradas
@@ -189,14 +365,55 @@ class GerenciadorDispositivos:
         
         return interrupcoes_geradas
 
-    def notificar_interrupcao_tratada(self, tipo_dispositivo):
+    def sondagens_ate_proxima_interrupcao(self, tempo_atual=None):
         """
-        Notifica o dispositivo específico que sua interrupção foi tratada.
+        Retorna quantas sondagens faltam até que algum dispositivo gere interrupção
+        (1 significa que a próxima chamada de verificar_interrupcoes gera ao menos uma).
+        'tempo_atual' não é usado aqui (as chegadas contam sondagens, não o relógio), mas faz
+        parte da interface para fontes de interrupção baseadas em tempo, como traços gravados.
+        """
+        return min(dispositivo.sondagens_restantes for dispositivo in self.dispositivos)
+
+    def pular_sondagens(self, quantidade):
+        """
+        Avança várias sondagens de uma vez, sem gerar interrupções.
+        Só deve ser chamado com quantidade menor que sondagens_ate_proxima_interrupcao().
         """
         for dispositivo in self.dispositivos:
-            if dispositivo.tipo == tipo_dispositivo:
-                dispositivo.interrupcao_tratada()
-                break
+            dispositivo.sondagens_restantes -= quantidade
+
+    def ressemear(self, semente):
+        """
+        Troca a semente de todos os dispositivos (ex.: para bifurcar um estado salvo).
+        As próximas chegadas, já sorteadas, são mantidas.
+        """
+        for dispositivo in self.dispositivos:
+            dispositivo.ressemear(semente)
+
+    def notificar_interrupcao_tratada(self, tipo_dispositivo, origem=None):
+        """
+        Notifica o dispositivo específico que sua interrupção foi tratada.
+        Aqui há um dispositivo por tipo, então 'origem' não é necessária.
+        """
+        dispositivo = self.por_tipo.get(tipo_dispositivo)
+        if dispositivo:
+            dispositivo.interrupcao_tratada()
+
+    def notificar_interrupcao_descartada(self, tipo_dispositivo, origem=None, mesclada=False):
+        """
+        Notifica o dispositivo de que uma interrupção sua foi descartada (ou mesclada)
+        por uma fila de capacidade limitada.
+        """
+        dispositivo = self.por_tipo.get(tipo_dispositivo)
+        if dispositivo:
+            dispositivo.interrupcao_descartada(mesclada)
+
+    def prioridades(self):
+        """
+        Retorna {tipo: (nível numérico, rótulo)} dos dispositivos gerenciados.
+        """
+        return {dispositivo.tipo: (dispositivo.nivel_prioridade, dispositivo.prioridade)
+                for dispositivo in self.dispositivos}
 
     def obter_estatisticas_gerais(self):
         """
@@ -1,34 +1,81 @@
+import heapq
+from collections import deque
+
+from dispositivos import PRIORIDADES_PADRAO
+
+
 class Escalonador:
     """
     Classe responsável por gerenciar a fila de interrupções e aplicar a lógica de
     prioridade (Teclado > Impressora > Disco).
+
+    A fila é um heap (heapq) cujas entradas são tuplas (-prioridade, sequencia, interrupcao).
+    A sequência é um contador de chegada, então interrupções de mesma prioridade
+    são atendidas na ordem em que chegaram (FIFO) e cada operação custa O(log n).
     """
 
-    def __init__(self):
-        # Lista que armazena as interrupções pendentes
+    def __init__(self, prioridades=None):
+        """
+        'prioridades' é um mapa tipo -> valor numérico; por padrão usa as prioridades
+        dos dispositivos padrão (PRIORIDADES_PADRAO).
+        """
+        # Heap que armazena as interrupções pendentes
         self.fila_interrupcoes = []
-        
+
+        # Contador de chegada usado para desempate FIFO dentro da mesma prioridade
+        self.sequencia = 0
+
+        # Maior tamanho que a fila já atingiu
+        self.marca_maxima = 0
+
         # Mapa de prioridades: Valores numéricos maiores indicam maior prioridade
-        self.prioridades = {
-            'teclado': 3,
-            'impressora': 2,
-            'disco': 1
-        }
+        if prioridades is None:
+            prioridades = {tipo: nivel for tipo, (nivel, _) in PRIORIDADES_PADRAO.items()}
+        self.prioridades = dict(prioridades)
 
-    def adicionar_interrupcao(self, interrupcao):
+    def _validar(self, interrupcao):
         """
-        Recebe um objeto de interrupção e o adiciona à fila de espera.
-        Realiza validação para garantir que o objeto possui o atributo 'tipo' necessário.
+        Realiza validação para garantir que o objeto possui o atributo 'tipo' necessário
+        e retorna a prioridade numérica correspondente.
         """
         # Validação: Garante que o objeto recebido é compatível com o escalonador
         if not hasattr(interrupcao, 'tipo'):
             raise ValueError("Erro de Integração: O objeto de interrupção deve possuir o atributo 'tipo'.")
-            
+
         # Verifica se o tipo é conhecido pelo sistema de prioridades
         if interrupcao.tipo not in self.prioridades:
             print(f"   [Aviso] Tipo de interrupção '{interrupcao.tipo}' desconhecido. Será tratado com prioridade mínima.")
+            return 0
+
+        return self.prioridades[interrupcao.tipo]
 
-        self.fila_interrupcoes.append(interrupcao)
+    def adicionar_interrupcao(self, interrupcao):
+        """
+        Recebe um objeto de interrupção e o adiciona à fila de espera.
+        """
+        prioridade = self._validar(interrupcao)
+        heapq.heappush(self.fila_interrupcoes, (-prioridade, self.sequencia, interrupcao))
+        self.sequencia += 1
+        self.marca_maxima = max(self.marca_maxima, len(self.fila_interrupcoes))
+
+    def adicionar_interrupcoes(self, interrupcoes):
+        """
+        Adiciona de uma vez uma lista de interrupções (por exemplo, o retorno de
+        GerenciadorDispositivos.verificar_interrupcoes), preservando a ordem da lista
+        como ordem de chegada.
+        """
+        entradas = [(-self._validar(i), self.sequencia + n, i) for n, i in enumerate(interrupcoes)]
+        self.sequencia += len(entradas)
+
+        # Para lotes grandes é mais barato reconstruir o heap em O(n) do que
+        # inserir um a um em O(k log n)
+        if len(entradas) > len(self.fila_interrupcoes):
+            self.fila_interrupcoes.extend(entradas)
+            heapq.heapify(self.fila_interrupcoes)
+        else:
+            for entrada in entradas:
+                heapq.heappush(self.fila_interrupcoes, entrada)
+        self.marca_maxima = max(self.marca_maxima, len(self.fila_interrupcoes))
 
     def tem_interrupcao_pendente(self):
         """
@@ -38,27 +85,208 @@ class Escalonador:
 
     def obter_proxima_interrupcao(self):
         """
-        Reordena a fila com base na prioridade e retorna a interrupção mais prioritária.
-        Resolve conflitos de interrupções simultâneas garantindo que a de maior valor seja atendida primeiro.
+        Remove e retorna a interrupção mais prioritária.
+        Resolve conflitos de interrupções simultâneas garantindo que a de maior valor seja
+        atendida primeiro e, entre as de mesma prioridade, a mais antiga.
         """
         if not self.fila_interrupcoes:
             return None
 
-        # Ordena a lista in-place.
-        # A chave de ordenação busca o valor numérico no dicionário 'prioridades'.
-        # reverse=True garante que a maior prioridade fique no índice 0.
-        self.fila_interrupcoes.sort(
-            key=lambda x: self.prioridades.get(x.tipo, 0), 
-            reverse=True
-        )
+        return heapq.heappop(self.fila_interrupcoes)[2]
+
+    def ver_maior_prioridade(self):
+        """
+        Retorna a prioridade numérica da próxima interrupção da fila, sem removê-la
+        (None se a fila estiver vazia).
+        """
+        if not self.fila_interrupcoes:
+            return None
+        return -self.fila_interrupcoes[0][0]
 
-        # Remove e retorna o primeiro elemento (o de maior prioridade)
-        proxima = self.fila_interrupcoes.pop(0)
-        
-        return proxima
+    def prioridade_de(self, interrupcao):
+        """Retorna a prioridade numérica de uma interrupção (0 para tipos desconhecidos)."""
+        return self.prioridades.get(interrupcao.tipo, 0)
 
     def ver_tamanho_fila(self):
         """
         Retorna a quantidade de interrupções atualmente na fila.
         """
-        return len(self.fila_interrupcoes)
\ No newline at end of file
+        return len(self.fila_interrupcoes)
+
+
+# Políticas de transbordo de EscalonadorLimitado
+POLITICAS_FILA = ('descartar_nova', 'descartar_antiga', 'descartar_menor_prioridade', 'mesclar')
+
+
+class EscalonadorLimitado(Escalonador):
+    """
+    Escalonador com capacidade limitada, para cenários saturados rodarem em memória constante.
+
+    'capacidade' limita quantas interrupções de cada prioridade podem esperar na fila
+    (um inteiro vale para todas; um dicionário {nível: capacidade} limita só os níveis
+    indicados) e 'capacidade_total' limita a fila inteira. Quando uma chegada encontra o
+    limite cheio, a 'politica' decide o que acontece:
+    - 'descartar_nova': a interrupção que chegou é descartada;
+    - 'descartar_antiga': sai a mais antiga da mesma prioridade (ou da fila, se o limite
+      atingido foi o total) e a nova entra;
+    - 'descartar_menor_prioridade': no limite total, sai a mais recente da menor prioridade
+      presente, se ela for menor que a da nova; caso contrário a nova é descartada;
+    - 'mesclar': se já há uma interrupção pendente do mesmo dispositivo, a nova é absorvida
+      por ela (como um bit de pendência já ligado); caso contrário é descartada.
+
+    Cada interrupção descartada ou mesclada é informada a 'ao_descartar(interrupcao, mesclada)'.
+    As removidas do meio do heap ficam marcadas e são limpas quando chegam ao topo ou
+    quando passam de metade do heap, então a memória fica limitada pela capacidade.
+    """
+
+    def __init__(self, prioridades=None, capacidade=None, capacidade_total=None,
+                 politica='descartar_nova', ao_descartar=None):
+        if politica not in POLITICAS_FILA:
+            raise ValueError(f"Política de fila desconhecida: '{politica}'. Use uma de {POLITICAS_FILA}.")
+        super().__init__(prioridades)
+
+        if isinstance(capacidade, int):
+            capacidade = {nivel: capacidade for nivel in set(self.prioridades.values()) | {0}}
+        self.capacidade = dict(capacidade or {})
+        if any(limite < 1 for limite in self.capacidade.values()) or (
+                capacidade_total is not None and capacidade_total < 1):
+            raise ValueError("As capacidades da fila devem ser positivas.")
+        self.capacidade_total = capacidade_total
+        self.politica = politica
+        self.ao_descartar = ao_descartar
+
+        # Interrupções vivas de cada nível, em ordem de chegada: (sequencia, interrupcao)
+        self.por_nivel = {}
+        self.pendentes_por_origem = {}
+        self.tamanho = 0
+
+        # Sequências removidas do meio do heap (ainda presentes nele)
+        self.removidas = set()
+
+        self.descartadas = 0
+        self.mescladas = 0
+
+    @staticmethod
+    def _origem(interrupcao):
+        return interrupcao.origem if interrupcao.origem is not None else interrupcao.tipo
+
+    def _descartar(self, interrupcao, mesclada=False):
+        if mesclada:
+            self.mescladas += 1
+        else:
+            self.descartadas += 1
+        if self.ao_descartar:
+            self.ao_descartar(interrupcao, mesclada)
+
+    def _retirar_viva(self, nivel, da_frente):
+        """Remove do nível a interrupção mais antiga (ou a mais recente) e a marca no heap."""
+        fila_nivel = self.por_nivel[nivel]
+        sequencia, interrupcao = fila_nivel.popleft() if da_frente else fila_nivel.pop()
+        self.removidas.add(sequencia)
+        self._contar_saida(interrupcao)
+        if len(self.removidas) > len(self.fila_interrupcoes) // 2:
+            # Compacta o heap quando as marcadas passam de metade
+            self.fila_interrupcoes = [e for e in self.fila_interrupcoes if e[1] not in self.removidas]
+            heapq.heapify(self.fila_interrupcoes)
+            self.removidas.clear()
+        return interrupcao
+
+    def _contar_saida(self, interrupcao):
+        self.tamanho -= 1
+        origem = self._origem(interrupcao)
+        self.pendentes_por_origem[origem] -= 1
+        if not self.pendentes_por_origem[origem]:
+            del self.pendentes_por_origem[origem]
+
+    def _abrir_espaco(self, interrupcao, nivel):
+        """Aplica a política de transbordo; retorna True se a nova interrupção pode entrar."""
+        quantidade_nivel = len(self.por_nivel.get(nivel, ()))
+        nivel_cheio = nivel in self.capacidade and quantidade_nivel >= self.capacidade[nivel]
+        total_cheio = self.capacidade_total is not None and self.tamanho >= self.capacidade_total
+        if not (nivel_cheio or total_cheio):
+            return True
+
+        if self.politica == 'mesclar':
+            self._descartar(interrupcao, mesclada=self._origem(interrupcao) in self.pendentes_por_origem)
+            return False
+
+        if self.politica == 'descartar_antiga':
+            if nivel_cheio:
+                self._descartar(self._retirar_viva(nivel, da_frente=True))
+            if total_cheio and self.tamanho >= self.capacidade_total:
+                mais_antigo = min((fila_nivel[0][0], n) for n, fila_nivel in self.por_nivel.items() if fila_nivel)[1]
+                self._descartar(self._retirar_viva(mais_antigo, da_frente=True))
+            return True
+
+        if self.politica == 'descartar_menor_prioridade' and not nivel_cheio:
+            menor = min(n for n, fila_nivel in self.por_nivel.items() if fila_nivel)
+            if menor < nivel:
+                self._descartar(self._retirar_viva(menor, da_frente=False))
+                return True
+
+        self._descartar(interrupcao)
+        return False
+
+    def adicionar_interrupcao(self, interrupcao):
+        nivel = self._validar(interrupcao)
+        if not self._abrir_espaco(interrupcao, nivel):
+            return
+        heapq.heappush(self.fila_interrupcoes, (-nivel, self.sequencia, interrupcao))
+        self.por_nivel.setdefault(nivel, deque()).append((self.sequencia, interrupcao))
+        origem = self._origem(interrupcao)
+        self.pendentes_por_origem[origem] = self.pendentes_por_origem.get(origem, 0) + 1
+        self.sequencia += 1
+        self.tamanho += 1
+        self.marca_maxima = max(self.marca_maxima, self.tamanho)
+
+    def adicionar_interrupcoes(self, interrupcoes):
+        for interrupcao in interrupcoes:
+            self.adicionar_interrupcao(interrupcao)
+
+    def _limpar_topo(self):
+        fila = self.fila_interrupcoes
+        while fila and fila[0][1] in self.removidas:
+            self.removidas.discard(heapq.heappop(fila)[1])
+
+    def tem_interrupcao_pendente(self):
+        return self.tamanho > 0
+
+    def obter_proxima_interrupcao(self):
+        self._limpar_topo()
+        if not self.fila_interrupcoes:
+            return None
+        prioridade, _, interrupcao = heapq.heappop(self.fila_interrupcoes)
+        # A mais prioritária é sempre a mais antiga do seu nível
+        self.por_nivel[-prioridade].popleft()
+        self._contar_saida(interrupcao)
+        return interrupcao
+
+    def ver_maior_prioridade(self):
+        self._limpar_topo()
+        return super().ver_maior_prioridade()
+
+    def ver_tamanho_fila(self):
+        return self.tamanho
+
+
+if __name__ == "__main__":
+    from dispositivos import Interrupcao
+
+    print("=== TESTE DAS POLÍTICAS DE FILA CHEIA ===\n")
+    # Fila total de 3: três chegadas do disco (menor prioridade) e depois uma do teclado
+    chegadas = [Interrupcao('disco', t, 5) for t in range(3)] + [Interrupcao('teclado', 3, 2)]
+    resultados = {}
+    for politica in ('descartar_nova', 'descartar_menor_prioridade'):
+        escalonador = EscalonadorLimitado(capacidade_total=3, politica=politica)
+        escalonador.adicionar_interrupcoes(chegadas)
+        ordem = []
+        while escalonador.tem_interrupcao_pendente():
+            interrupcao = escalonador.obter_proxima_interrupcao()
+            ordem.append((interrupcao.tipo, interrupcao.tempo_geracao))
+        resultados[politica] = ordem
+        print(f"{politica}: atendidas {ordem} | descartadas {escalonador.descartadas}")
+
+    # descartar_nova perde o teclado; descartar_menor_prioridade perde o disco mais recente
+    assert resultados['descartar_nova'] == [('disco', 0), ('disco', 1), ('disco', 2)]
+    assert resultados['descartar_menor_prioridade'] == [('teclado', 3), ('disco', 0), ('disco', 1)]
+    print("\nAs políticas diferem como esperado.")
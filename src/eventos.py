@@ -0,0 +1,211 @@
+import asyncio
+import threading
+from collections import deque
+
+# Tipos de evento emitidos pelo Simulador aos observadores inscritos (só quando o estado muda)
+INTERRUPCAO_GERADA = 'INTERRUPCAO_GERADA'
+INTERRUPCAO_DESCARTADA = 'INTERRUPCAO_DESCARTADA'
+INTERRUPCAO_MESCLADA = 'INTERRUPCAO_MESCLADA'
+TRATAMENTO_INICIADO = 'TRATAMENTO_INICIADO'
+TRATAMENTO_FINALIZADO = 'TRATAMENTO_FINALIZADO'
+CONTEXTO_SALVO = 'CONTEXTO_SALVO'
+CONTEXTO_RESTAURADO = 'CONTEXTO_RESTAURADO'
+PROCESSO_FINALIZADO = 'PROCESSO_FINALIZADO'
+
+TIPOS_EVENTO = (INTERRUPCAO_GERADA, INTERRUPCAO_DESCARTADA, INTERRUPCAO_MESCLADA, TRATAMENTO_INICIADO,
+                TRATAMENTO_FINALIZADO, CONTEXTO_SALVO, CONTEXTO_RESTAURADO, PROCESSO_FINALIZADO)
+
+
+class EventoSimulacao:
+    """
+    Mudança de estado da simulação, entregue aos observadores de Simulador.inscrever.
+
+    Os campos da interrupção envolvida são copiados para o evento (e não referenciados),
+    então o evento continua válido depois que a interrupção é tratada ou reaproveitada
+    por um PoolInterrupcoes. Nos eventos de contexto, 'dispositivo' é o tipo do tratador
+    suspenso ou retomado, ou None quando o contexto é o do processo principal.
+    """
+    __slots__ = ('tipo', 'tempo', 'dispositivo', 'origem', 'tempo_geracao', 'tempo_tratamento')
+
+    def __init__(self, tipo, tempo, interrupcao=None):
+        self.tipo = tipo
+        self.tempo = tempo
+        if interrupcao is None:
+            self.dispositivo = self.origem = self.tempo_geracao = self.tempo_tratamento = None
+        else:
+            self.dispositivo = interrupcao.tipo
+            self.origem = interrupcao.origem
+            self.tempo_geracao = interrupcao.tempo_geracao
+            self.tempo_tratamento = interrupcao.tempo_tratamento
+
+    def para_dict(self):
+        return {
+            'tipo': self.tipo,
+            'tempo': self.tempo,
+            'dispositivo': self.dispositivo,
+            'origem': self.origem,
+            'tempo_geracao': self.tempo_geracao,
+            'tempo_tratamento': self.tempo_tratamento
+        }
+
+    def __repr__(self):
+        return f"EventoSimulacao({self.tipo}, T={self.tempo}, dispositivo={self.dispositivo})"
+
+
+class AssinaturaAssincrona:
+    """
+    Fila de lotes de eventos de um assinante asyncio, criada por PublicadorAssincrono.assinar.
+    Use com 'async for lote in assinatura'; a iteração termina quando o publicador é encerrado.
+
+    A fila guarda no máximo 'capacidade' lotes: se o assinante não acompanhar, os lotes
+    mais antigos são descartados (e contados em 'eventos_descartados'), de modo que um
+    assinante lento nunca faz a simulação esperar nem acumula memória sem limite.
+    """
+
+    def __init__(self, capacidade):
+        if capacidade < 1:
+            raise ValueError("A capacidade da assinatura deve ser positiva.")
+        self.capacidade = capacidade
+        self.lotes = deque()
+        self.eventos_descartados = 0
+        self.encerrada = False
+        self._disponivel = asyncio.Event()
+
+    def _receber(self, lote):
+        if len(self.lotes) >= self.capacidade:
+            self.eventos_descartados += len(self.lotes.popleft())
+        self.lotes.append(lote)
+        self._disponivel.set()
+
+    def _encerrar(self):
+        self.encerrada = True
+        self._disponivel.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self.lotes:
+            if self.encerrada:
+                raise StopAsyncIteration
+            self._disponivel.clear()
+            await self._disponivel.wait()
+        return self.lotes.popleft()
+
+
+class PublicadorAssincrono:
+    """
+    Observador do Simulador que repassa os eventos, em lotes de até 'tamanho_lote', para
+    assinantes asyncio (painéis, métricas ao vivo...).
+
+    Deve ser criado dentro do laço de eventos. A simulação roda em outra thread (veja
+    executar_com_assinantes): cada lote completo entra em uma fila limitada a 'capacidade'
+    lotes, e só há uma entrega agendada no laço (call_soon_threadsafe) por vez. Se o laço
+    não acompanhar, os lotes mais antigos da fila são descartados (e contados em
+    'eventos_descartados'), então a simulação nunca espera e a memória fica limitada.
+    Cada assinante ainda tem sua própria fila limitada (AssinaturaAssincrona).
+    """
+
+    def __init__(self, tamanho_lote=256, loop=None, capacidade=64):
+        if tamanho_lote < 1 or capacidade < 1:
+            raise ValueError("O tamanho do lote e a capacidade devem ser positivos.")
+        self.tamanho_lote = tamanho_lote
+        self.capacidade = capacidade
+        self.loop = loop or asyncio.get_running_loop()
+        self.assinaturas = []
+        self.pendentes = []
+
+        # Lotes enviados pela thread da simulação e ainda não entregues no laço
+        self.em_transito = deque()
+        self.trava = threading.Lock()
+        self.entrega_agendada = False
+        self.eventos_descartados = 0
+
+    def assinar(self, capacidade=64):
+        """Cria uma assinatura que recebe todos os lotes publicados a partir de agora."""
+        assinatura = AssinaturaAssincrona(capacidade)
+        self.assinaturas.append(assinatura)
+        return assinatura
+
+    def __call__(self, evento):
+        # Chamado pelo Simulador, na thread da simulação
+        self.pendentes.append(evento)
+        if len(self.pendentes) >= self.tamanho_lote:
+            self._enviar()
+
+    def _enviar(self):
+        lote, self.pendentes = self.pendentes, []
+        with self.trava:
+            if len(self.em_transito) >= self.capacidade:
+                self.eventos_descartados += len(self.em_transito.popleft())
+            self.em_transito.append(lote)
+            if self.entrega_agendada:
+                return
+            self.entrega_agendada = True
+        self.loop.call_soon_threadsafe(self._entregar)
+
+    def _entregar(self):
+        # No laço de eventos: entrega de uma vez tudo o que chegou desde a última entrega
+        with self.trava:
+            lotes = list(self.em_transito)
+            self.em_transito.clear()
+            self.entrega_agendada = False
+        for lote in lotes:
+            for assinatura in self.assinaturas:
+                assinatura._receber(lote)
+
+    def _encerrar_assinaturas(self):
+        self._entregar()
+        for assinatura in self.assinaturas:
+            assinatura._encerrar()
+
+    def encerrar(self):
+        """Envia o lote incompleto e encerra as assinaturas (depois dos lotes já enviados)."""
+        if self.pendentes:
+            self._enviar()
+        self.loop.call_soon_threadsafe(self._encerrar_assinaturas)
+
+
+async def executar_com_assinantes(simulador, publicador):
+    """
+    Executa a simulação em uma thread, publicando seus eventos, e retorna Simulador.info.
+    O laço de eventos continua livre para os assinantes enquanto a simulação roda.
+    """
+    simulador.inscrever(publicador)
+    try:
+        return await asyncio.to_thread(simulador.executar)
+    finally:
+        simulador.cancelar_inscricao(publicador)
+        publicador.encerrar()
+
+
+if __name__ == "__main__":
+    from multiprocesso import SimuladorMultiprocesso, gerar_carga_aleatoria
+
+    print("=== TESTE DO FLUXO DE EVENTOS ===\n")
+
+    async def contar(assinatura, atraso=0.0):
+        contagem = {}
+        async for lote in assinatura:
+            for evento in lote:
+                contagem[evento.tipo] = contagem.get(evento.tipo, 0) + 1
+            if atraso:
+                await asyncio.sleep(atraso)  # assinante lento
+        return contagem
+
+    async def demonstrar():
+        # Uma carga com muitos processos mantém a CPU ocupada até o fim do tempo total
+        simulador = SimuladorMultiprocesso(tempo_total=200000, carga=lambda: gerar_carga_aleatoria(4000),
+                                           seed=1)
+        publicador = PublicadorAssincrono(tamanho_lote=128)
+        rapido = publicador.assinar()
+        lento = publicador.assinar(capacidade=4)
+        info, contagem_rapida, contagem_lenta = await asyncio.gather(
+            executar_com_assinantes(simulador, publicador), contar(rapido), contar(lento, atraso=0.01))
+        print("Simulação:", info)
+        print(f"Descartados antes de chegar ao laço: {publicador.eventos_descartados}")
+        print("\nAssinante rápido:", contagem_rapida, f"| descartados: {rapido.eventos_descartados}")
+        print("Assinante lento:", sum(contagem_lenta.values()), "eventos recebidos",
+              f"| descartados: {lento.eventos_descartados}")
+
+    asyncio.run(demonstrar())
@@ -0,0 +1,303 @@
+import cProfile
+import gc
+import json
+import os
+import sys
+import threading
+import time
+
+# Métodos medidos em cada fase: (objeto, onde 'simulador' ou 'escalonador', nomes dos métodos)
+FASES = (
+    ('ciclo', 'simulador', ('processar_ciclo',)),
+    ('sondagem', 'simulador', ('gerar_interrupcoes',)),
+    ('fila', 'escalonador', ('adicionar_interrupcoes', 'tem_interrupcao_pendente', 'obter_proxima_interrupcao')),
+    ('tratamento', 'simulador', ('iniciar_tratamento', 'finalizar_tratamento')),
+    ('contexto', 'simulador', ('salvar_contexto', 'restaurar_contexto')),
+    ('processo', 'simulador', ('executar_processo',)),
+)
+
+
+class Instrumentacao:
+    """
+    Instrumentação opcional do Simulador: tempo de parede e número de chamadas por fase
+    do ciclo (sondagem dos dispositivos, operações da fila, tratamento, troca de contexto,
+    execução do processo), profundidade da fila, coletas do coletor de lixo e alocações.
+
+    'ativar' troca os métodos medidos, só na instância do simulador (e do seu escalonador),
+    por versões cronometradas; 'desativar' os devolve. Desligada, não existe nenhum custo:
+    o Simulador não tem código de instrumentação. Os tempos são exclusivos (o tempo da fila
+    dentro da sondagem conta só para 'fila'), e 'ciclo' fica com o que processar_ciclo gasta
+    fora das demais fases. O que acontece fora de processar_ciclo (por exemplo os saltos do
+    modo 'eventos') aparece como 'fora_das_fases' no snapshot. O custo da própria medição,
+    calibrado ao ativar, é descontado da fase que fez a chamada medida; mesmo assim a
+    execução instrumentada fica mais lenta, então compare as fases entre si.
+
+    Enquanto ativa, o simulador não pode ser salvo com checkpoint (os métodos trocados
+    não são serializáveis).
+    """
+
+    def __init__(self, simulador):
+        self.simulador = simulador
+        self.tempos_ns = {fase: 0 for fase, _, _ in FASES}
+        self.chamadas = {fase: 0 for fase, _, _ in FASES}
+        self.ciclos_medidos = 0
+        self.soma_profundidade = 0
+        self.profundidade_maxima = 0
+        self.coletas_gc = [0, 0, 0]
+        self.tempo_gc_ns = 0
+
+        self._trocados = []  # (objeto, nome) com método trocado
+        self._pilha = []     # tempo gasto pelas chamadas internas de cada fase aberta
+        self._inicio_gc = None
+        self._inicio = None
+        self._decorrido_ns = 0
+
+        # Custo (ns) que cada chamada medida acrescenta à fase que a chamou
+        self.sobrecarga_ns = 0
+
+    def envolver(self, objeto, nome, fase):
+        """Troca objeto.nome por uma versão que soma seu tempo (exclusivo) e chamadas em 'fase'."""
+        original = getattr(objeto, nome)
+        tempos, chamadas, pilha = self.tempos_ns, self.chamadas, self._pilha
+        tempos.setdefault(fase, 0)
+        chamadas.setdefault(fase, 0)
+        relogio = time.perf_counter_ns
+        sobrecarga = self.sobrecarga_ns
+
+        def medido(*args, **kwargs):
+            pilha.append(0)
+            inicio = relogio()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                decorrido = relogio() - inicio
+                tempos[fase] += decorrido - pilha.pop()
+                chamadas[fase] += 1
+                if pilha:
+                    pilha[-1] += decorrido + sobrecarga
+
+        setattr(objeto, nome, medido)
+        self._trocados.append((objeto, nome))
+
+    @staticmethod
+    def _calibrar(repeticoes=20000):
+        """Estima quanto uma chamada medida custa a mais para quem a chamou (menor de 3 medições)."""
+        class Alvo:
+            def vazio(self):
+                pass
+
+        melhor = None
+        for _ in range(3):
+            alvo = Alvo()
+            calibracao = Instrumentacao(None)
+            calibracao.envolver(alvo, 'vazio', 'vazio')
+            calibracao._pilha.append(0)  # simula uma fase aberta que chama a medida
+            inicio = time.perf_counter_ns()
+            for _ in range(repeticoes):
+                alvo.vazio()
+            total = time.perf_counter_ns() - inicio
+            estimativa = (total - calibracao.tempos_ns['vazio']) / repeticoes
+            melhor = estimativa if melhor is None else min(melhor, estimativa)
+        return max(0, int(melhor))
+
+    def _amostrar_fila(self, processar_ciclo):
+        escalonador = self.simulador.escalonador
+
+        def com_amostra():
+            status = processar_ciclo()
+            profundidade = escalonador.ver_tamanho_fila()
+            self.ciclos_medidos += 1
+            self.soma_profundidade += profundidade
+            if profundidade > self.profundidade_maxima:
+                self.profundidade_maxima = profundidade
+            return status
+        return com_amostra
+
+    def _ao_coletar(self, fase, dados):
+        if fase == 'start':
+            self._inicio_gc = time.perf_counter_ns()
+        elif self._inicio_gc is not None:
+            self.tempo_gc_ns += time.perf_counter_ns() - self._inicio_gc
+            self.coletas_gc[dados['generation']] += 1
+            self._inicio_gc = None
+
+    def ativar(self):
+        """Começa a medir (troca os métodos das fases)."""
+        if self._trocados:
+            return self
+        self.sobrecarga_ns = self._calibrar()
+        alvos = {'simulador': self.simulador, 'escalonador': self.simulador.escalonador}
+        for fase, onde, nomes in FASES:
+            for nome in nomes:
+                self.envolver(alvos[onde], nome, fase)
+        # A amostra da fila fica por fora da medição do ciclo, sem entrar no tempo dele
+        self.simulador.processar_ciclo = self._amostrar_fila(self.simulador.processar_ciclo)
+        gc.callbacks.append(self._ao_coletar)
+        self._inicio = time.perf_counter_ns()
+        return self
+
+    def desativar(self):
+        """Para de medir e devolve os métodos originais."""
+        for objeto, nome in reversed(self._trocados):
+            if nome in vars(objeto):
+                delattr(objeto, nome)
+        self._trocados.clear()
+        if self._ao_coletar in gc.callbacks:
+            gc.callbacks.remove(self._ao_coletar)
+        if self._inicio is not None:
+            self._decorrido_ns += time.perf_counter_ns() - self._inicio
+            self._inicio = None
+
+    def decorrido_ns(self):
+        if self._inicio is None:
+            return self._decorrido_ns
+        return self._decorrido_ns + time.perf_counter_ns() - self._inicio
+
+    def snapshot(self):
+        """Contadores atuais em um dicionário (segundos, chamadas, fila, GC e alocações)."""
+        decorrido = self.decorrido_ns()
+        tempos = dict(self.tempos_ns)
+        medido = sum(tempos.values())
+        snapshot = {
+            'tempo_simulado': self.simulador.tempo_atual,
+            'decorrido_s': decorrido / 1e9,
+            'fases': {fase: {'segundos': tempos[fase] / 1e9, 'chamadas': self.chamadas[fase]}
+                      for fase in tempos},
+            'fora_das_fases_s': max(0, decorrido - medido) / 1e9,
+            'sobrecarga_por_chamada_ns': self.sobrecarga_ns,
+            'fila': {
+                'profundidade_media': self.soma_profundidade / self.ciclos_medidos if self.ciclos_medidos else 0.0,
+                'profundidade_maxima': self.profundidade_maxima,
+                'marca_maxima': getattr(self.simulador.escalonador, 'marca_maxima', None)
+            },
+            'gc': {'coletas': list(self.coletas_gc), 'segundos': self.tempo_gc_ns / 1e9},
+            'alocacoes': {'blocos_vivos': sys.getallocatedblocks()}
+        }
+        pool = getattr(self.simulador, 'pool', None)
+        if pool is not None:
+            snapshot['alocacoes']['interrupcoes_criadas'] = pool.criadas
+            snapshot['alocacoes']['interrupcoes_reaproveitadas'] = pool.reaproveitadas
+        return snapshot
+
+
+def formatar_prometheus(snapshot, prefixo='iosim'):
+    """Snapshot no formato de texto de exposição do Prometheus."""
+    linhas = []
+
+    def metrica(nome, tipo, ajuda, amostras):
+        linhas.append(f"# HELP {prefixo}_{nome} {ajuda}")
+        linhas.append(f"# TYPE {prefixo}_{nome} {tipo}")
+        for rotulos, valor in amostras:
+            linhas.append(f"{prefixo}_{nome}{rotulos} {valor}")
+
+    fases = snapshot['fases']
+    metrica('fase_segundos_total', 'counter', 'Tempo de parede exclusivo por fase do ciclo.',
+            [(f'{{fase="{fase}"}}', dados['segundos']) for fase, dados in fases.items()]
+            + [('{fase="fora_das_fases"}', snapshot['fora_das_fases_s'])])
+    metrica('fase_chamadas_total', 'counter', 'Chamadas por fase do ciclo.',
+            [(f'{{fase="{fase}"}}', dados['chamadas']) for fase, dados in fases.items()])
+    metrica('tempo_simulado', 'gauge', 'Tempo atual da simulação.', [('', snapshot['tempo_simulado'])])
+    metrica('fila_profundidade_media', 'gauge', 'Profundidade média da fila ao fim de cada ciclo.',
+            [('', snapshot['fila']['profundidade_media'])])
+    metrica('fila_profundidade_maxima', 'gauge', 'Maior profundidade da fila ao fim de um ciclo.',
+            [('', snapshot['fila']['profundidade_maxima'])])
+    metrica('gc_coletas_total', 'counter', 'Coletas do coletor de lixo por geração.',
+            [(f'{{geracao="{geracao}"}}', total) for geracao, total in enumerate(snapshot['gc']['coletas'])])
+    metrica('gc_segundos_total', 'counter', 'Tempo gasto em coletas do coletor de lixo.',
+            [('', snapshot['gc']['segundos'])])
+    for nome, valor in snapshot['alocacoes'].items():
+        tipo = 'gauge' if nome == 'blocos_vivos' else 'counter'
+        sufixo = '' if tipo == 'gauge' else '_total'
+        metrica(f'{nome}{sufixo}', tipo, f'Alocações: {nome.replace("_", " ")}.', [('', valor)])
+    return "\n".join(linhas) + "\n"
+
+
+class ExportadorSnapshots:
+    """
+    Grava periodicamente o snapshot de uma Instrumentacao em 'caminho', em uma thread
+    separada, de forma atômica (arquivo temporário + rename). O formato é Prometheus se o
+    caminho terminar em .prom e JSON nos demais casos.
+    """
+
+    def __init__(self, instrumentacao, caminho, intervalo=1.0):
+        if intervalo <= 0:
+            raise ValueError("O intervalo entre snapshots deve ser positivo.")
+        self.instrumentacao = instrumentacao
+        self.caminho = caminho
+        self.intervalo = intervalo
+        self.prometheus = caminho.endswith('.prom')
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, daemon=True)
+
+    def gravar(self):
+        snapshot = self.instrumentacao.snapshot()
+        texto = formatar_prometheus(snapshot) if self.prometheus else json.dumps(snapshot, indent=2)
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+        os.replace(temporario, self.caminho)
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            self.gravar()
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def parar(self):
+        """Encerra a thread e grava o snapshot final."""
+        self._parar.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.gravar()
+
+
+def executar_com_perfil(funcao, caminho):
+    """
+    Executa funcao() sob o cProfile e grava as estatísticas em 'caminho' (formato pstats,
+    aceito por snakeviz, gprof2dot e flameprof para gerar grafos e flamegraphs).
+    Retorna o resultado da função.
+    """
+    perfil = cProfile.Profile()
+    try:
+        return perfil.runcall(funcao)
+    finally:
+        perfil.dump_stats(caminho)
+
+
+def formatar_instrumentacao(snapshot):
+    """Tabela de texto com o tempo e as chamadas de cada fase."""
+    decorrido = snapshot['decorrido_s'] or 1e-12
+    linhas = [f"{'Fase':<16} {'segundos':>10} {'%':>6} {'chamadas':>12} {'ns/chamada':>11}"]
+    fases = dict(snapshot['fases'])
+    fases['fora_das_fases'] = {'segundos': snapshot['fora_das_fases_s'], 'chamadas': 0}
+    for fase, dados in fases.items():
+        por_chamada = f"{dados['segundos'] / dados['chamadas'] * 1e9:.0f}" if dados['chamadas'] else "-"
+        linhas.append(f"{fase:<16} {dados['segundos']:>10.4f} {dados['segundos'] / decorrido:>6.1%} "
+                      f"{dados['chamadas']:>12} {por_chamada:>11}")
+    fila, coletor = snapshot['fila'], snapshot['gc']
+    linhas.append(f"\nFila: média {fila['profundidade_media']:.2f}, máxima {fila['profundidade_maxima']}")
+    linhas.append(f"GC: {sum(coletor['coletas'])} coletas {tuple(coletor['coletas'])}, {coletor['segundos']:.4f}s")
+    linhas.append("Alocações: " + ", ".join(f"{nome} {valor}" for nome, valor in snapshot['alocacoes'].items()))
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    from simulacao import Simulador
+
+    print("=== TESTE DA INSTRUMENTAÇÃO ===\n")
+    ciclos = 300000
+    for nome, instrumentar in (('sem instrumentação', False), ('com instrumentação', True)):
+        simulador = Simulador(tempo_total=ciclos, seed=1)
+        instrumentacao = Instrumentacao(simulador).ativar() if instrumentar else None
+        inicio = time.perf_counter()
+        for _ in range(ciclos):
+            simulador.processar_ciclo()
+            simulador.tempo_atual += 1
+        duracao = time.perf_counter() - inicio
+        print(f"{nome}: {duracao / ciclos * 1e9:.0f} ns por ciclo")
+        if instrumentacao:
+            instrumentacao.desativar()
+            print()
+            print(formatar_instrumentacao(instrumentacao.snapshot()))
@@ -0,0 +1,133 @@
+class HistogramaLog:
+    """
+    Histograma em escala logarítmica (no estilo HDR) para valores inteiros não negativos.
+
+    Valores menores que 2**bits_precisao têm um balde cada; acima disso, cada potência
+    de dois é dividida em 2**(bits_precisao - 1) baldes. O erro relativo dos percentis
+    fica abaixo de 2**-(bits_precisao - 1) e a memória depende só da magnitude do maior
+    valor (no máximo algumas centenas de baldes), não da quantidade de amostras.
+    """
+
+    def __init__(self, bits_precisao=7):
+        self.bits = bits_precisao
+        self.sub_baldes = 1 << bits_precisao
+        self.meio = self.sub_baldes >> 1
+        self.contagens = []
+        self.total = 0
+        self.soma = 0
+        self.minimo = None
+        self.maximo = None
+
+    def _indice(self, valor):
+        if valor < self.sub_baldes:
+            return valor
+        expoente = valor.bit_length() - self.bits
+        return expoente * self.meio + (valor >> expoente)
+
+    def _limite_superior(self, indice):
+        """Maior valor que cai no balde 'indice'."""
+        if indice < self.sub_baldes:
+            return indice
+        expoente, resto = divmod(indice - self.meio, self.meio)
+        mantissa = resto + self.meio
+        return ((mantissa + 1) << expoente) - 1
+
+    def registrar(self, valor):
+        valor = int(valor)
+        if valor < 0:
+            raise ValueError("O histograma só aceita valores não negativos.")
+        indice = self._indice(valor)
+        if indice >= len(self.contagens):
+            self.contagens.extend([0] * (indice + 1 - len(self.contagens)))
+        self.contagens[indice] += 1
+        self.total += 1
+        self.soma += valor
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+
+    def percentil(self, p):
+        """Valor abaixo do qual estão p% das amostras (None se vazio)."""
+        if not self.total:
+            return None
+        alvo = max(1, -(-self.total * p // 100))  # teto de total * p / 100
+        acumulado = 0
+        for indice, contagem in enumerate(self.contagens):
+            acumulado += contagem
+            if acumulado >= alvo:
+                return min(self._limite_superior(indice), self.maximo)
+        return self.maximo
+
+    def media(self):
+        return self.soma / self.total if self.total else None
+
+    def resumo(self):
+        return {
+            'n': self.total,
+            'media': self.media(),
+            'p50': self.percentil(50),
+            'p95': self.percentil(95),
+            'p99': self.percentil(99),
+            'max': self.maximo
+        }
+
+
+class MetricasLatencia:
+    """
+    Coleta online de latências por tipo de dispositivo, alimentada pelo Simulador
+    em iniciar_tratamento e finalizar_tratamento:
+    - espera: do momento em que a interrupção foi gerada até o início do tratamento
+    - servico: tempo de execução do próprio tratador (sem o tempo em que ficou suspenso
+      por tratadores aninhados)
+    - resposta: da geração até o fim do tratamento
+    """
+
+    METRICAS = ('espera', 'servico', 'resposta')
+
+    def __init__(self, bits_precisao=7):
+        self.bits_precisao = bits_precisao
+        self.por_tipo = {}
+
+    def _histogramas(self, tipo):
+        if tipo not in self.por_tipo:
+            self.por_tipo[tipo] = {nome: HistogramaLog(self.bits_precisao) for nome in self.METRICAS}
+        return self.por_tipo[tipo]
+
+    def ao_iniciar(self, interrupcao):
+        """Registra o tempo de espera na fila."""
+        self._histogramas(interrupcao.tipo)['espera'].registrar(
+            interrupcao.tempo_inicio_tratamento - interrupcao.tempo_geracao)
+
+    def ao_finalizar(self, interrupcao, tempo_suspenso=0):
+        """Registra os tempos de serviço e de resposta."""
+        histogramas = self._histogramas(interrupcao.tipo)
+        histogramas['servico'].registrar(
+            interrupcao.tempo_fim_tratamento - interrupcao.tempo_inicio_tratamento - tempo_suspenso)
+        histogramas['resposta'].registrar(interrupcao.tempo_fim_tratamento - interrupcao.tempo_geracao)
+
+    def resumo(self):
+        """Retorna {tipo: {métrica: {n, media, p50, p95, p99, max}}}."""
+        return {tipo: {nome: h.resumo() for nome, h in histogramas.items()}
+                for tipo, histogramas in self.por_tipo.items()}
+
+
+def formatar_latencias(resumo):
+    """Formata o resumo de MetricasLatencia como tabela de texto."""
+    linhas = [f"{'Dispositivo':<12} {'Métrica':<9} {'n':>8} {'média':>9} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}"]
+    for tipo, metricas in resumo.items():
+        for nome, r in metricas.items():
+            if not r['n']:
+                continue
+            linhas.append(f"{tipo:<12} {nome:<9} {r['n']:>8} {r['media']:>9.2f} "
+                          f"{r['p50']:>7} {r['p95']:>7} {r['p99']:>7} {r['max']:>7}")
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    from simulacao import Simulador
+
+    print("=== TESTE DAS MÉTRICAS DE LATÊNCIA ===\n")
+    simulador = Simulador(tempo_total=100000, seed=1, modo='eventos', metricas=MetricasLatencia())
+    simulador.executar()
+    print(formatar_latencias(simulador.metricas.resumo()))
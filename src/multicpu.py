@@ -0,0 +1,175 @@
+import random
+from itertools import cycle
+
+from dispositivos import GerenciadorDispositivos
+from processo import Processo
+from simulacao import Simulador
+
+
+class NucleoCPU(Simulador):
+    """
+    Uma CPU do sistema: tem seu próprio processo, fila de interrupções e tratador.
+    Não sonda os dispositivos; as interrupções chegam pelo roteador via receber().
+    """
+
+    def __init__(self, indice, tempo_total, dispositivos):
+        super().__init__(tempo_total, dispositivos=dispositivos)
+        self.indice = indice
+        self.processo = Processo(pid=indice + 1)
+
+        # Trabalho de tratamento ainda pendente (fila + tratador ativo), usado no roteamento
+        self.trabalho_pendente = 0
+
+    def receber(self, interrupcao):
+        """Coloca uma interrupção roteada para esta CPU na fila dela."""
+        self.escalonador.adicionar_interrupcao(interrupcao)
+        self.trabalho_pendente += interrupcao.tempo_tratamento
+
+    def gerar_interrupcoes(self):
+        """As chegadas são entregues pelo SimuladorMultiCPU, não sondadas pela CPU"""
+        return []
+
+    def processar_ciclo(self):
+        if self.interrupcao_ativa:
+            self.trabalho_pendente -= 1
+        return super().processar_ciclo()
+
+    def utilizacao(self, decorrido):
+        """Fração do tempo em que a CPU esteve ocupada (processo ou tratador)."""
+        return (self.info['tempo_processo'] + self.info['tempo_interrupcoes']) / max(decorrido, 1)
+
+
+class AfinidadeFixa:
+    """Cada tipo de dispositivo é sempre atendido pela mesma CPU."""
+
+    def __init__(self, mapa=None):
+        self.mapa = mapa or {}
+        self.padrao = {}
+
+    def escolher(self, interrupcao, cpus):
+        if interrupcao.tipo in self.mapa:
+            return self.mapa[interrupcao.tipo] % len(cpus)
+        # Tipos sem afinidade configurada são distribuídos na ordem em que aparecem
+        if interrupcao.tipo not in self.padrao:
+            self.padrao[interrupcao.tipo] = len(self.padrao) % len(cpus)
+        return self.padrao[interrupcao.tipo]
+
+
+class RoteamentoCircular:
+    """Distribui as interrupções entre as CPUs em rodízio."""
+
+    def __init__(self):
+        self.proxima = None
+
+    def escolher(self, interrupcao, cpus):
+        if self.proxima is None:
+            self.proxima = cycle(range(len(cpus)))
+        return next(self.proxima)
+
+
+class MenosCarregada:
+    """Envia cada interrupção para a CPU com menos trabalho de tratamento pendente."""
+
+    def escolher(self, interrupcao, cpus):
+        return min(range(len(cpus)), key=lambda i: cpus[i].trabalho_pendente)
+
+
+ROTEAMENTOS = {
+    'afinidade': AfinidadeFixa,
+    'circular': RoteamentoCircular,
+    'menos_carregada': MenosCarregada
+}
+
+
+class SimuladorMultiCPU:
+    """
+    Simula N CPUs, cada uma com seu processo e seu tratador de interrupções.
+    A cada ciclo os dispositivos (compartilhados) são sondados e cada interrupção
+    gerada é roteada para uma CPU pela política de roteamento.
+    Diferente do Simulador de uma CPU, os dispositivos são sondados em todo ciclo,
+    já que sempre pode haver alguma CPU livre para atender.
+    """
+
+    def __init__(self, tempo_total, num_cpus=2, roteamento='menos_carregada', seed=None):
+        if num_cpus < 1:
+            raise ValueError("O número de CPUs deve ser pelo menos 1.")
+
+        # A semente precisa ser aplicada antes de criar os dispositivos
+        if seed is not None:
+            random.seed(seed)
+        self.dispositivos = GerenciadorDispositivos()
+        self.cpus = [NucleoCPU(i, tempo_total, self.dispositivos) for i in range(num_cpus)]
+
+        if isinstance(roteamento, str):
+            if roteamento not in ROTEAMENTOS:
+                raise ValueError(f"Roteamento desconhecido: '{roteamento}'. Use um de {tuple(ROTEAMENTOS)}.")
+            roteamento = ROTEAMENTOS[roteamento]()
+        self.roteamento = roteamento
+
+        self.tempo_atual = 0
+        self.tempo_total = tempo_total
+
+    def processar_ciclo(self):
+        """Sonda os dispositivos, roteia as chegadas e executa um ciclo em cada CPU."""
+        for interrupcao in self.dispositivos.verificar_interrupcoes(self.tempo_atual):
+            self.cpus[self.roteamento.escolher(interrupcao, self.cpus)].receber(interrupcao)
+        return [cpu.processar_ciclo() for cpu in self.cpus]
+
+    def avancar_tempo(self):
+        """Avança o tempo; continua enquanto houver tempo e algum processo não finalizado."""
+        self.tempo_atual += 1
+        for cpu in self.cpus:
+            cpu.tempo_atual = self.tempo_atual
+        return (self.tempo_atual <= self.tempo_total
+                and any(cpu.processo.estado != 'FINALIZADO' for cpu in self.cpus))
+
+    def executar(self):
+        """Executa a simulação inteira e retorna o relatório por CPU."""
+        executando = True
+        while executando:
+            self.processar_ciclo()
+            executando = self.avancar_tempo()
+        return self.relatorio()
+
+    @property
+    def info(self):
+        """Estatísticas somadas de todas as CPUs, no mesmo formato de Simulador.info."""
+        total = {
+            'tempo_processo': 0,
+            'tempo_interrupcoes': 0,
+            'total_interrupcoes': 0,
+            'por_tipo': {}
+        }
+        for cpu in self.cpus:
+            for chave in ('tempo_processo', 'tempo_interrupcoes', 'total_interrupcoes'):
+                total[chave] += cpu.info[chave]
+            for tipo, quantidade in cpu.info['por_tipo'].items():
+                total['por_tipo'][tipo] = total['por_tipo'].get(tipo, 0) + quantidade
+        return total
+
+    def relatorio(self):
+        """Utilização, tempo de interrupção e interrupções atendidas por CPU."""
+        decorrido = self.tempo_atual
+        return [
+            {
+                'cpu': cpu.indice,
+                'utilizacao': cpu.utilizacao(decorrido),
+                'tempo_processo': cpu.info['tempo_processo'],
+                'tempo_interrupcoes': cpu.info['tempo_interrupcoes'],
+                'total_interrupcoes': cpu.info['total_interrupcoes'],
+                'por_tipo': dict(cpu.info['por_tipo']),
+                'fila_tamanho': cpu.escalonador.ver_tamanho_fila(),
+                'processo': cpu.processo.estado
+            }
+            for cpu in self.cpus
+        ]
+
+
+if __name__ == "__main__":
+    print("=== TESTE DO SIMULADOR MULTI-CPU ===\n")
+    for nome in ROTEAMENTOS:
+        simulador = SimuladorMultiCPU(tempo_total=2000, num_cpus=4, roteamento=nome, seed=7)
+        relatorio = simulador.executar()
+        print(f"--- Roteamento: {nome} (tempo final {simulador.tempo_atual}) ---")
+        for linha in relatorio:
+            print(linha)
@@ -0,0 +1,297 @@
+import heapq
+import random
+from array import array
+from collections import deque
+
+from eventos import CONTEXTO_RESTAURADO, CONTEXTO_SALVO
+from simulacao import Simulador
+
+# Códigos de estado guardados na tabela (um byte por processo)
+NOVO, PRONTO, RODANDO, ESPERA, FINALIZADO = range(5)
+NOMES_ESTADO = ('NOVO', 'PRONTO', 'RODANDO', 'ESPERA', 'FINALIZADO')
+
+
+class RegistroProcesso:
+    """
+    Visão de um processo dentro da TabelaProcessos, com a mesma interface de leitura
+    de Processo (pid, programa_contador, ponto_pilha, progresso_execucao, estado).
+    Não copia dados: cada atributo é lido diretamente dos vetores da tabela.
+    """
+    __slots__ = ('tabela', 'pid')
+
+    def __init__(self, tabela, pid):
+        self.tabela = tabela
+        self.pid = pid
+
+    @property
+    def programa_contador(self):
+        return self.tabela.programa_contador[self.pid]
+
+    @property
+    def ponto_pilha(self):
+        return self.tabela.ponto_pilha[self.pid]
+
+    @property
+    def progresso_execucao(self):
+        return self.tabela.progresso_execucao[self.pid]
+
+    @property
+    def estado(self):
+        return NOMES_ESTADO[self.tabela.estado[self.pid]]
+
+    def __str__(self):
+        return (f"PID: {self.pid} | Estado: {self.estado:^10} | "
+                f"PC: {self.programa_contador:04} | Progresso: {self.progresso_execucao:.1f}%")
+
+
+class TabelaProcessos:
+    """
+    Tabela de PCBs em formato de vetores (um array por campo, indexado pelo pid).
+    Evita um objeto Python por processo, de modo que centenas de milhares de processos
+    ocupam apenas algumas dezenas de bytes cada.
+    """
+
+    def __init__(self, carga):
+        """
+        carga: iterável de tuplas (chegada, duracao, prioridade), uma por processo.
+        Os processos são numerados (pid) na ordem de chegada.
+        """
+        carga = sorted(carga, key=lambda p: p[0])
+        n = len(carga)
+
+        # Parâmetros da carga
+        self.chegada = array('q', (p[0] for p in carga))
+        self.duracao = array('q', (p[1] for p in carga))
+        self.prioridade = array('i', (p[2] for p in carga))
+
+        # Campos do PCB
+        self.programa_contador = array('q', bytes(8 * n))
+        self.ponto_pilha = array('q', bytes(8 * n))
+        self.progresso_execucao = array('d', bytes(8 * n))
+        self.estado = array('b', bytes(n))  # todos começam como NOVO
+
+        # Métricas
+        self.tempo_fim = array('q', [-1]) * n
+
+        self.finalizados = 0
+
+    def __len__(self):
+        return len(self.chegada)
+
+    def processo(self, pid):
+        """Retorna uma visão (RegistroProcesso) do processo 'pid'."""
+        return RegistroProcesso(self, pid)
+
+    def executar(self, pid):
+        """Executa uma unidade de tempo do processo; retorna True se ele terminou."""
+        pc = self.programa_contador[pid] + 1
+        self.programa_contador[pid] = pc
+        self.progresso_execucao[pid] = 100.0 * pc / self.duracao[pid]
+        return pc >= self.duracao[pid]
+
+    def turnaround(self, pid):
+        """Tempo entre a chegada e o término do processo (None se ainda não terminou)."""
+        if self.tempo_fim[pid] < 0:
+            return None
+        return self.tempo_fim[pid] - self.chegada[pid] + 1
+
+
+class FilaFIFO:
+    """Fila de prontos em ordem de chegada (também usada pelo round-robin)."""
+
+    def __init__(self, tabela):
+        self.fila = deque()
+
+    def inserir(self, pid):
+        self.fila.append(pid)
+
+    def remover(self):
+        return self.fila.popleft()
+
+    def __len__(self):
+        return len(self.fila)
+
+
+class FilaPrioridade:
+    """Fila de prontos por prioridade (maior valor primeiro, FIFO em caso de empate)."""
+
+    def __init__(self, tabela):
+        self.tabela = tabela
+        self.heap = []
+        self.sequencia = 0
+
+    def inserir(self, pid):
+        heapq.heappush(self.heap, (-self.tabela.prioridade[pid], self.sequencia, pid))
+        self.sequencia += 1
+
+    def remover(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+# Políticas de escalonamento de CPU: nome -> (fila de prontos, usa quantum)
+POLITICAS = {
+    'fifo': (FilaFIFO, False),
+    'rr': (FilaFIFO, True),
+    'prioridade': (FilaPrioridade, False)
+}
+
+
+def gerar_carga_aleatoria(quantidade, duracao_min=20, duracao_max=200,
+                          intervalo_medio=50.0, prioridades=(1, 2, 3)):
+    """
+    Gera uma carga de 'quantidade' processos com chegadas de Poisson
+    (intervalos exponenciais de média intervalo_medio), duração uniforme e prioridade sorteada.
+    """
+    carga = []
+    chegada = 0.0
+    for _ in range(quantidade):
+        carga.append((int(chegada), random.randint(duracao_min, duracao_max), random.choice(prioridades)))
+        chegada += random.expovariate(1.0 / intervalo_medio)
+    return carga
+
+
+class SimuladorMultiprocesso(Simulador):
+    """
+    Simulador com vários processos de usuário, fila de prontos e política de
+    escalonamento de CPU (FIFO, round-robin com quantum ou prioridade).
+    O tratamento de interrupções é o mesmo do Simulador: o processo em execução
+    tem o contexto salvo e é retomado ao fim do tratamento.
+    """
+
+    # O salto de eventos do Simulador só conhece um processo
+    MODOS = ('ciclo',)
+
+    def __init__(self, tempo_total, carga, politica='fifo', quantum=4, seed=None, metricas=None):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de escalonamento desconhecida: '{politica}'. Use uma de {tuple(POLITICAS)}.")
+        super().__init__(tempo_total, seed=seed, metricas=metricas)
+
+        if callable(carga):
+            # A carga pode ser gerada depois da semente aplicada (ex.: gerar_carga_aleatoria)
+            carga = carga()
+        self.tabela = TabelaProcessos(carga)
+        tipo_fila, usa_quantum = POLITICAS[politica]
+        self.politica = politica
+        self.prontos = tipo_fila(self.tabela)
+        self.quantum = quantum if usa_quantum else None
+
+        self.proximo_admitido = 0  # próximo pid ainda não admitido (a tabela é ordenada por chegada)
+        self.atual = None          # pid em execução na CPU
+        self.fatia_restante = 0    # quantum restante do processo atual
+
+        self.processo = None
+        self.info['tempo_ocioso'] = 0
+        self.info['processos_finalizados'] = 0
+        self.info['trocas_processo'] = 0
+
+    def admitir_chegadas(self):
+        """Move para a fila de prontos os processos que já chegaram."""
+        tabela = self.tabela
+        while (self.proximo_admitido < len(tabela)
+               and tabela.chegada[self.proximo_admitido] <= self.tempo_atual):
+            pid = self.proximo_admitido
+            tabela.estado[pid] = PRONTO
+            self.prontos.inserir(pid)
+            self.proximo_admitido += 1
+
+    def despachar(self):
+        """Escolhe o próximo processo da fila de prontos para a CPU."""
+        self.atual = self.prontos.remover()
+        self.tabela.estado[self.atual] = RODANDO
+        self.fatia_restante = self.quantum or 0
+        self.processo = self.tabela.processo(self.atual)
+        self.info['trocas_processo'] += 1
+
+    def executar_processo(self):
+        """Executa uma unidade de tempo do processo escolhido pela política de escalonamento"""
+        self.admitir_chegadas()
+
+        if self.atual is None:
+            if not len(self.prontos):
+                self.info['tempo_ocioso'] += 1
+                return 'CPU_OCIOSA'
+            self.despachar()
+
+        tabela = self.tabela
+        pid = self.atual
+        self.info['tempo_processo'] += 1
+
+        if tabela.executar(pid):
+            tabela.estado[pid] = FINALIZADO
+            tabela.tempo_fim[pid] = self.tempo_atual
+            tabela.finalizados += 1
+            self.info['processos_finalizados'] += 1
+            self.atual = None
+            return 'PROCESSO_CONCLUIDO'
+
+        if self.quantum:
+            self.fatia_restante -= 1
+            if self.fatia_restante <= 0 and len(self.prontos):
+                # Quantum esgotado: volta para o fim da fila de prontos
+                tabela.estado[pid] = PRONTO
+                self.prontos.inserir(pid)
+                self.atual = None
+
+        return 'PROCESSO_EXECUTANDO'
+
+    def salvar_contexto(self):
+        """Salva o contexto do processo em execução (PC e progresso já estão na tabela)"""
+        if self.atual is not None:
+            self.tabela.estado[self.atual] = ESPERA
+        if self.observadores:
+            self.emitir(CONTEXTO_SALVO, self.interrupcao_ativa)
+
+    def restaurar_contexto(self):
+        """Devolve a CPU ao processo interrompido"""
+        if self.atual is not None:
+            self.tabela.estado[self.atual] = RODANDO
+        if self.observadores:
+            self.emitir(CONTEXTO_RESTAURADO)
+
+    def concluido(self):
+        """A simulação termina quando acaba o tempo ou todos os processos finalizam"""
+        return self.tempo_atual > self.tempo_total or self.tabela.finalizados >= len(self.tabela)
+
+    def turnarounds(self):
+        """Gera (pid, turnaround) de cada processo finalizado."""
+        for pid in range(len(self.tabela)):
+            turnaround = self.tabela.turnaround(pid)
+            if turnaround is not None:
+                yield pid, turnaround
+
+    def relatorio(self):
+        """Resumo da carga: vazão, turnaround médio/máximo e ocupação da CPU."""
+        n = 0
+        soma = 0
+        maximo = 0
+        for _, turnaround in self.turnarounds():
+            n += 1
+            soma += turnaround
+            maximo = max(maximo, turnaround)
+        decorrido = max(self.tempo_atual, 1)
+        return {
+            'politica': self.politica,
+            'processos': len(self.tabela),
+            'finalizados': n,
+            'vazao': n / decorrido,
+            'turnaround_medio': soma / n if n else 0.0,
+            'turnaround_maximo': maximo,
+            'uso_cpu_processos': self.info['tempo_processo'] / decorrido,
+            'uso_cpu_interrupcoes': self.info['tempo_interrupcoes'] / decorrido
+        }
+
+
+if __name__ == "__main__":
+    print("=== TESTE DO SIMULADOR MULTIPROCESSO ===\n")
+    for politica in POLITICAS:
+        simulador = SimuladorMultiprocesso(
+            tempo_total=100000,
+            carga=lambda: gerar_carga_aleatoria(200, intervalo_medio=400.0),
+            politica=politica,
+            seed=1
+        )
+        simulador.executar()
+        print(simulador.relatorio())
@@ -0,0 +1,144 @@
+from dispositivos import GerenciadorDispositivos, derivar_semente
+from eventos import CONTEXTO_RESTAURADO
+from metricas import MetricasLatencia
+from simulacao import Simulador
+
+
+class SimuladorPreemptivo(Simulador):
+    """
+    Simulador com tratamento de interrupções aninhado e preemptivo.
+
+    Os dispositivos continuam sendo sondados enquanto um tratador executa. Se chegar
+    uma interrupção de prioridade maior (segundo Escalonador.prioridades), o tratador
+    atual é suspenso em uma pilha de contextos e o novo começa; ao terminar, o tratador
+    suspenso é retomado de onde parou. O processo principal só volta quando a pilha esvazia.
+    """
+
+    # O salto de eventos do Simulador não sonda dispositivos durante o tratamento
+    MODOS = ('ciclo',)
+
+    def __init__(self, tempo_total, profundidade_maxima=2, seed=None, metricas=None, dispositivos=None,
+                 escalonador=None):
+        """
+        profundidade_maxima: quantos tratadores podem ficar suspensos ao mesmo tempo
+        (0 desativa a preempção, mantendo a sondagem contínua dos dispositivos).
+        """
+        super().__init__(tempo_total, seed=seed, metricas=metricas, dispositivos=dispositivos,
+                         escalonador=escalonador)
+        self.profundidade_maxima = profundidade_maxima
+
+        # Pilha de contextos de tratadores suspensos: (interrupcao, tempo_restante, suspenso_em)
+        self.pilha_contextos = []
+        # Tempo total suspenso de cada tratador já retomado e ainda não concluído
+        self.suspensoes = {}
+
+        self.info['preempcoes'] = 0
+        self.info['profundidade_atingida'] = 0
+
+    def deve_preemptar(self):
+        """True se a próxima interrupção da fila tem prioridade maior que a ativa e há espaço na pilha."""
+        if len(self.pilha_contextos) >= self.profundidade_maxima:
+            return False
+        prioridade_fila = self.escalonador.ver_maior_prioridade()
+        return (prioridade_fila is not None
+                and prioridade_fila > self.escalonador.prioridade_de(self.interrupcao_ativa))
+
+    def processar_ciclo(self):
+        """Executa um passo da simulação, permitindo preempção de tratadores"""
+        if not self.interrupcao_ativa:
+            return super().processar_ciclo()
+
+        # Durante o tratamento os dispositivos continuam gerando interrupções
+        self.gerar_interrupcoes()
+
+        if self.deve_preemptar():
+            # Salva o contexto do tratador atual e inicia o mais prioritário
+            self.pilha_contextos.append((self.interrupcao_ativa, self.tempo_restante, self.tempo_atual))
+            self.info['preempcoes'] += 1
+            self.info['profundidade_atingida'] = max(self.info['profundidade_atingida'],
+                                                     len(self.pilha_contextos))
+            self.iniciar_tratamento(self.escalonador.obter_proxima_interrupcao())
+            return 'INTERRUPCAO_ANINHADA'
+
+        self.tempo_restante -= 1
+        self.info['tempo_interrupcoes'] += 1
+
+        # Se tempo do tratamento acabou
+        if self.tempo_restante <= 0:
+            self.finalizar_tratamento()
+            return 'INTERRUPCAO_FINALIZADA'
+        return 'TRATANDO_INTERRUPCAO'
+
+    def restaurar_contexto(self):
+        """Só devolve a CPU ao processo quando não há tratador suspenso"""
+        if not self.pilha_contextos:
+            super().restaurar_contexto()
+
+    def tempo_suspenso(self, interrupcao):
+        return self.suspensoes.pop(interrupcao, 0)
+
+    def finalizar_tratamento(self):
+        """Conclui o tratamento e retoma o tratador suspenso no topo da pilha, se houver"""
+        super().finalizar_tratamento()
+        if self.pilha_contextos:
+            self.interrupcao_ativa, self.tempo_restante, suspenso_em = self.pilha_contextos.pop()
+            # Ficou suspenso do ciclo da preempção até este, gasto pelo tratador que terminou
+            self.suspensoes[self.interrupcao_ativa] = (self.suspensoes.get(self.interrupcao_ativa, 0)
+                                                       + self.tempo_atual - suspenso_em + 1)
+            if self.observadores:
+                self.emitir(CONTEXTO_RESTAURADO, self.interrupcao_ativa)
+
+
+def ajustar_carga(fonte, carga):
+    """
+    Escala prob_interrupcao de todos os dispositivos de 'fonte' para que a carga com sondagem
+    contínua, ρ = Σ p·(1 + E[S]), fique igual a 'carga', e retorna a fonte.
+    Os dispositivos padrão somam ρ ≈ 1.78: sem ajuste a fila do disco cresce sem parar.
+    """
+    from analitico import momentos_tratamento  # analitico importa este módulo
+
+    atual = sum(d.prob_interrupcao * (1 + momentos_tratamento(d)[0]) for d in fonte.dispositivos)
+    for dispositivo in fonte.dispositivos:
+        dispositivo.prob_interrupcao *= carga / atual
+        dispositivo.sondagens_restantes = dispositivo.sortear_intervalo()
+    return fonte
+
+
+def comparar_preempcao(tempo_total, profundidade_maxima=2, seed=0, carga=0.7, replicacoes=200):
+    """
+    Executa os mesmos cenários (mesmas sementes, logo as mesmas chegadas) sem e com preempção
+    e retorna, por dispositivo, os percentis do tempo de resposta nos dois casos.
+    'carga' é a carga ρ a que os dispositivos padrão são ajustados (ver ajustar_carga);
+    a comparação só faz sentido com ρ < 1, em que a fila não cresce sem limite. Como cada
+    execução termina junto com o processo principal, as latências de 'replicacoes'
+    execuções são somadas nos mesmos histogramas.
+    """
+    if not 0 < carga < 1:
+        raise ValueError("A carga da comparação deve estar entre 0 e 1 (fila estável).")
+    resultados = {}
+    for nome, profundidade in (('sem_preempcao', 0), ('com_preempcao', profundidade_maxima)):
+        metricas = MetricasLatencia()
+        for indice in range(replicacoes):
+            simulador = SimuladorPreemptivo(tempo_total, profundidade_maxima=profundidade,
+                                            seed=derivar_semente(seed, indice), metricas=metricas,
+                                            dispositivos=lambda: ajustar_carga(GerenciadorDispositivos(), carga))
+            simulador.executar()
+        resultados[nome] = {tipo: resumo['resposta'] for tipo, resumo in metricas.resumo().items()}
+    return resultados
+
+
+def formatar_comparacao(resultados):
+    """Tabela com p50/p95/p99 de resposta por dispositivo, antes e depois da preempção."""
+    antes, depois = resultados['sem_preempcao'], resultados['com_preempcao']
+    linhas = [f"{'Dispositivo':<12} {'p50':>17} {'p95':>17} {'p99':>17}   (sem -> com preempção)"]
+    for tipo in antes:
+        if tipo not in depois:
+            continue
+        colunas = [f"{antes[tipo][p]} -> {depois[tipo][p]}" for p in ('p50', 'p95', 'p99')]
+        linhas.append(f"{tipo:<12} " + " ".join(f"{c:>17}" for c in colunas))
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    print("=== TESTE DO TRATAMENTO PREEMPTIVO ===\n")
+    print(formatar_comparacao(comparar_preempcao(tempo_total=200000, seed=1, replicacoes=500)))
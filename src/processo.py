@@ -1,8 +1,12 @@
+import math
+
+
 class Processo:
     """
     Representa o Process Control Block (PCB) e o processo no sistema operacional simulado.
     Responsabilidade do Membro 1: Gerenciamento de Contexto.
     """
+    __slots__ = ('pid', 'programa_contador', 'ponto_pilha', 'progresso_execucao', 'estado')
 
     def __init__(self, pid):
         self.pid = pid
@@ -14,17 +18,18 @@ class Processo:
         self.progresso_execucao = 0.0 
         self.estado = 'RODANDO'     # Estados: RODANDO, ESPERA, FINALIZADO
 
-    def executa_processo(self):
+    def executa_processo(self, unidades=1):
         """
         Simula a execução do processo incrementando o PC e o progresso.
         O processo só executa se estiver no estado RODANDO.
+        'unidades' permite executar vários ciclos de uma vez (sem ultrapassar o término).
         """
         if self.estado == 'RODANDO':
             if self.progresso_execucao < 100.0:
-                self.progresso_execucao += 1.0 # Avança 1.0 por unidade de tempo
+                self.progresso_execucao += 1.0 * unidades # Avança 1.0 por unidade de tempo
             
             # Incrementa o PC
-            self.programa_contador += 1
+            self.programa_contador += unidades
             
             # Verifica se o processo terminou
             if self.progresso_execucao >= 100.0:
@@ -34,6 +39,10 @@ class Processo:
         
         return False # Processo não está em RODANDO
 
+    def unidades_restantes(self):
+        """Retorna quantos ciclos de execução faltam para o processo terminar."""
+        return max(1, math.ceil(100.0 - self.progresso_execucao))
+
     def backup_processo(self):
         """
         Salva o estado atual do processo e o move para o estado de ESPERA.
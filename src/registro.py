@@ -0,0 +1,248 @@
+import json
+import os
+import queue
+import threading
+from functools import partial
+
+from dispositivos import PRIORIDADES_PADRAO
+
+# Ordem dos níveis: eventos de nível menor que o mínimo configurado são descartados
+NIVEIS = {
+    'PROCESSO_EXECUTANDO': 0,
+    'CPU_OCIOSA': 0,
+    'TRATANDO_INTERRUPCAO': 1,
+    'INTERRUPCAO_INICIADA': 2,
+    'INTERRUPCAO_ANINHADA': 2,
+    'INTERRUPCAO_FINALIZADA': 2,
+    'PROCESSO_CONCLUIDO': 2,
+    'PROCESSO_FINALIZADO': 3
+}
+
+# Mapa padrão para mostrar as prioridades em texto
+mapa_prioridade = {tipo: rotulo for tipo, (_, rotulo) in PRIORIDADES_PADRAO.items()}
+
+
+class EventoLog:
+    """
+    Evento estruturado de um ciclo da simulação.
+    Guarda apenas dados simples; a formatação em texto só acontece na thread de escrita.
+    """
+    __slots__ = ('tempo', 'status', 'tipo', 'fila_tamanho', 'progresso', 'pid')
+
+    def __init__(self, tempo, status, tipo=None, fila_tamanho=0, progresso=None, pid=None):
+        self.tempo = tempo
+        self.status = status
+        self.tipo = tipo  # tipo do dispositivo da interrupção ativa, se houver
+        self.fila_tamanho = fila_tamanho
+        self.progresso = progresso  # progresso do processo em execução, se houver
+        self.pid = pid
+
+    @classmethod
+    def do_estado(cls, status, dados):
+        """Cria o evento a partir do status de processar_ciclo e de obter_estado_atual."""
+        interrupcao = dados['interrupcao_ativa']
+        processo = dados['processo']
+        return cls(
+            dados['tempo'],
+            status,
+            interrupcao.tipo if interrupcao else None,
+            dados['fila_tamanho'],
+            processo.progresso_execucao if processo else None,
+            processo.pid if processo else None
+        )
+
+    def para_dict(self):
+        return {
+            'tempo': self.tempo,
+            'status': self.status,
+            'tipo': self.tipo,
+            'fila_tamanho': self.fila_tamanho,
+            'progresso': self.progresso,
+            'pid': self.pid
+        }
+
+
+def formatar_texto(evento, rotulos=mapa_prioridade):
+    """
+    Formata o evento no formato legível original do log (pode gerar mais de uma linha).
+    'rotulos' mapeia o tipo do dispositivo para o texto da prioridade.
+    """
+    tempo = evento.tempo
+    linhas = []
+    mensagem = ""
+
+    if evento.status == 'INTERRUPCAO_INICIADA':
+        # Descobre texto da prioridade de acordo com o dispositivo
+        prio_texto = rotulos.get(evento.tipo, "Desconhecida")
+        mensagem = f"Interrupção: {evento.tipo.capitalize()} - Prioridade: {prio_texto} - Armazenando contexto..."
+
+    elif evento.status == 'INTERRUPCAO_ANINHADA':
+        prio_texto = rotulos.get(evento.tipo, "Desconhecida")
+        mensagem = f"Interrupção: {evento.tipo.capitalize()} - Prioridade: {prio_texto} - Suspendendo o tratador em andamento..."
+
+    elif evento.status == 'TRATANDO_INTERRUPCAO':
+        mensagem = f"Tratando a interrupção do {evento.tipo}..."
+
+    elif evento.status == 'INTERRUPCAO_FINALIZADA':
+        mensagem = "Interrupção tratada. Restaurando o contexto do processo principal."
+        linhas.append(f"[Tempo {tempo}] - Processo principal retomado.")
+
+    elif evento.status == 'PROCESSO_EXECUTANDO':
+        mensagem = f"Processo principal em execução. (Progresso: {evento.progresso:.1f}%)"
+
+    elif evento.status == 'PROCESSO_FINALIZADO':
+        mensagem = "Processo principal finalizado."
+
+    elif evento.status == 'PROCESSO_CONCLUIDO':
+        mensagem = f"Processo {evento.pid} concluído."
+
+    elif evento.status == 'CPU_OCIOSA':
+        mensagem = "CPU ociosa. Nenhum processo pronto."
+
+    if mensagem:
+        linhas.append(f"[Tempo {tempo}] - {mensagem}")
+    return "".join(linha + "\n" for linha in linhas)
+
+
+def formatar_jsonl(evento, rotulos=None):
+    """Formata o evento como uma linha JSON."""
+    return json.dumps(evento.para_dict(), ensure_ascii=False) + "\n"
+
+
+FORMATOS = {
+    'texto': formatar_texto,
+    'jsonl': formatar_jsonl
+}
+
+
+class RegistradorAssincrono:
+    """
+    Escritor de log em segundo plano.
+
+    O simulador chama registrar() com eventos estruturados, que vão para uma fila limitada;
+    uma thread separada retira os eventos em lotes, formata e grava tudo com uma única
+    chamada de write por lote. Com a fila cheia, registrar() bloqueia, limitando a memória.
+    O arquivo é rotacionado (arquivo.1, arquivo.2, ...) ao passar de tamanho_maximo bytes
+    (bytes gravados em UTF-8, não caracteres). Se a thread de escrita falhar, registrar()
+    e fechar() levantam RuntimeError com o erro original como causa, em vez de bloquear.
+    """
+
+    def __init__(self, caminho, formato='texto', nivel_minimo=0, capacidade=65536,
+                 tamanho_lote=4096, tamanho_maximo=None, max_arquivos=5, cabecalho=None,
+                 descarregar_sempre=False, rotulos=None):
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de log desconhecido: '{formato}'. Use um de {tuple(FORMATOS)}.")
+        self.caminho = caminho
+        # 'rotulos' (tipo -> texto da prioridade) normalmente vem de dispositivos.prioridades()
+        self.formatar = partial(FORMATOS[formato], rotulos=rotulos or mapa_prioridade)
+        self.nivel_minimo = nivel_minimo
+        self.tamanho_lote = tamanho_lote
+        self.tamanho_maximo = tamanho_maximo
+        self.max_arquivos = max_arquivos
+        self.cabecalho = cabecalho
+        self.descarregar_sempre = descarregar_sempre  # flush a cada lote (útil para acompanhar o log ao vivo)
+
+        self.fila = queue.Queue(maxsize=capacidade)
+        self.eventos_gravados = 0
+        self.eventos_filtrados = 0
+
+        self.arquivo = None
+        self.bytes_escritos = 0
+        self.erro = None  # exceção que encerrou a thread de escrita, se houver
+        self._abrir()
+
+        self._fim = object()  # sentinela que encerra a thread de escrita
+        self.thread = threading.Thread(target=self._escrever, name="registrador-log", daemon=True)
+        self.thread.start()
+
+    def _abrir(self):
+        # Modo binário: write retorna bytes, que é o que conta para a rotação
+        self.arquivo = open(self.caminho, "wb")
+        self.bytes_escritos = 0
+        if self.cabecalho:
+            self.bytes_escritos += self.arquivo.write(self.cabecalho.encode("utf-8"))
+
+    def _rotacionar(self):
+        """Fecha o arquivo atual e desloca arquivo -> arquivo.1 -> arquivo.2 ..."""
+        self.arquivo.close()
+        for indice in range(self.max_arquivos - 1, 0, -1):
+            origem = f"{self.caminho}.{indice}"
+            if os.path.exists(origem):
+                os.replace(origem, f"{self.caminho}.{indice + 1}")
+        if self.max_arquivos > 0:
+            os.replace(self.caminho, f"{self.caminho}.1")
+        self._abrir()
+
+    def _verificar(self):
+        if self.erro is not None:
+            raise RuntimeError(f"A gravação do log '{self.caminho}' falhou.") from self.erro
+
+    def _enfileirar(self, evento):
+        # Com a fila cheia, espera em intervalos curtos para notar se a thread de escrita morreu
+        while True:
+            self._verificar()
+            try:
+                self.fila.put(evento, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def registrar(self, evento):
+        """Enfileira um evento para gravação (descartado se estiver abaixo do nível mínimo)."""
+        if NIVEIS.get(evento.status, 0) < self.nivel_minimo:
+            self.eventos_filtrados += 1
+            return
+        self._enfileirar(evento)
+
+    def registrar_ciclo(self, status, dados):
+        """Atalho para registrar o resultado de um ciclo do Simulador."""
+        if NIVEIS.get(status, 0) < self.nivel_minimo:
+            self.eventos_filtrados += 1
+            return
+        self._enfileirar(EventoLog.do_estado(status, dados))
+
+    def _escrever(self):
+        try:
+            self._gravar_lotes()
+        except BaseException as erro:
+            self.erro = erro
+        finally:
+            self.arquivo.close()
+
+    def _gravar_lotes(self):
+        encerrar = False
+        while not encerrar:
+            # Bloqueia até o primeiro evento e junta o que mais estiver disponível
+            lote = [self.fila.get()]
+            while len(lote) < self.tamanho_lote:
+                try:
+                    lote.append(self.fila.get_nowait())
+                except queue.Empty:
+                    break
+
+            if lote[-1] is self._fim:
+                lote.pop()
+                encerrar = True
+
+            texto = "".join(self.formatar(evento) for evento in lote)
+            if texto:
+                self.bytes_escritos += self.arquivo.write(texto.encode("utf-8"))
+                if self.descarregar_sempre:
+                    self.arquivo.flush()
+            self.eventos_gravados += len(lote)
+
+            if self.tamanho_maximo and self.bytes_escritos >= self.tamanho_maximo:
+                self._rotacionar()
+
+    def fechar(self):
+        """Grava os eventos pendentes, encerra a thread e fecha o arquivo."""
+        if self.thread.is_alive():
+            self._enfileirar(self._fim)
+            self.thread.join()
+        self._verificar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,204 @@
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from statistics import NormalDist
+
+from dispositivos import derivar_semente
+from simulacao import Simulador
+
+
+def metricas_da_simulacao(simulador):
+    """Achata Simulador.info em um dicionário métrica -> valor numérico."""
+    info = simulador.info
+    metricas = {
+        'tempo_processo': info['tempo_processo'],
+        'tempo_interrupcoes': info['tempo_interrupcoes'],
+        'total_interrupcoes': info['total_interrupcoes'],
+    }
+    for tipo, total in info['por_tipo'].items():
+        metricas[f'por_tipo.{tipo}'] = total
+    return metricas
+
+
+def executar_lote(tempo_total, semente_base, inicio, quantidade, modo):
+    """
+    Executa as replicações [inicio, inicio + quantidade) e retorna a lista de métricas.
+    Roda dentro dos processos do pool, por isso é uma função de módulo.
+    """
+    resultados = []
+    for indice in range(inicio, inicio + quantidade):
+        simulador = Simulador(tempo_total, seed=derivar_semente(semente_base, indice), modo=modo)
+        simulador.executar()
+        resultados.append(metricas_da_simulacao(simulador))
+    return resultados
+
+
+class EstatisticaOnline:
+    """
+    Acumula média e variância de uma métrica em memória constante (algoritmo de Welford).
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    def adicionar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+
+    def variancia(self):
+        """Variância amostral (n - 1); zero se houver menos de duas observações."""
+        if self.n < 2:
+            return 0.0
+        return self.m2 / (self.n - 1)
+
+    def intervalo_confianca(self, nivel=0.95):
+        """Intervalo de confiança da média pela aproximação normal."""
+        if self.n < 2:
+            return (self.media, self.media)
+        z = NormalDist().inv_cdf(0.5 + nivel / 2)
+        margem = z * math.sqrt(self.variancia() / self.n)
+        return (self.media - margem, self.media + margem)
+
+    def resumo(self, nivel=0.95):
+        inferior, superior = self.intervalo_confianca(nivel)
+        return {
+            'n': self.n,
+            'media': self.media,
+            'variancia': self.variancia(),
+            'ic_inferior': inferior,
+            'ic_superior': superior
+        }
+
+
+class ExecutorReplicacoes:
+    """
+    Distribui replicações independentes do Simulador entre processos (ProcessPoolExecutor)
+    e agrega os resultados à medida que chegam, sem guardar cada replicação em memória.
+    """
+
+    def __init__(self, tempo_total, replicacoes, semente=0, processos=None,
+                 tamanho_lote=None, modo='eventos', nivel_confianca=0.95):
+        self.tempo_total = tempo_total
+        self.replicacoes = replicacoes
+        self.semente = semente
+        self.processos = processos or os.cpu_count() or 1
+        self.modo = modo
+        self.nivel_confianca = nivel_confianca
+
+        # Lotes pequenos equilibram a carga; lotes grandes reduzem o custo de comunicação
+        if tamanho_lote is None:
+            tamanho_lote = max(1, min(256, replicacoes // (self.processos * 8)))
+        self.tamanho_lote = tamanho_lote
+
+        self.estatisticas = {}
+
+    def _acumular(self, metricas):
+        for nome, valor in metricas.items():
+            if nome not in self.estatisticas:
+                self.estatisticas[nome] = EstatisticaOnline()
+            self.estatisticas[nome].adicionar(valor)
+
+    def _lotes(self):
+        for inicio in range(0, self.replicacoes, self.tamanho_lote):
+            yield inicio, min(self.tamanho_lote, self.replicacoes - inicio)
+
+    def executar(self, ao_receber=None):
+        """
+        Executa todas as replicações e retorna o resumo por métrica.
+        'ao_receber', se informado, é chamado com as métricas de cada replicação
+        conforme elas chegam (por exemplo, para gravá-las em disco).
+        """
+        lotes = self._lotes()
+        # Limita os lotes em voo para não acumular resultados pendentes na memória
+        max_em_voo = self.processos * 2
+
+        with ProcessPoolExecutor(max_workers=self.processos) as pool:
+            em_voo = set()
+            for inicio, quantidade in lotes:
+                em_voo.add(pool.submit(executar_lote, self.tempo_total, self.semente,
+                                       inicio, quantidade, self.modo))
+                if len(em_voo) < max_em_voo:
+                    continue
+                prontos, em_voo = wait(em_voo, return_when=FIRST_COMPLETED)
+                self._consumir(prontos, ao_receber)
+
+            while em_voo:
+                prontos, em_voo = wait(em_voo, return_when=FIRST_COMPLETED)
+                self._consumir(prontos, ao_receber)
+
+        return self.resumo()
+
+    def _consumir(self, futuros, ao_receber):
+        for futuro in futuros:
+            for metricas in futuro.result():
+                self._acumular(metricas)
+                if ao_receber:
+                    ao_receber(metricas)
+
+    def resumo(self):
+        """Retorna {métrica: {n, media, variancia, ic_inferior, ic_superior}}."""
+        return {nome: estat.resumo(self.nivel_confianca)
+                for nome, estat in self.estatisticas.items()}
+
+
+def comparar_cenarios(cenario_a, cenario_b, replicacoes, semente_base=0, comuns=True, nivel=0.95):
+    """
+    Estima a diferença (b - a) de cada métrica entre dois cenários, replicação a replicação.
+    'cenario_a' e 'cenario_b' recebem uma semente e retornam o Simulador configurado.
+
+    Com 'comuns', as duas execuções de cada replicação usam a mesma semente (números
+    aleatórios comuns): como cada dispositivo sorteia com geradores próprios, tudo o que
+    os cenários têm em comum recebe os mesmos sorteios e a variância da diferença cai.
+    Retorna o resumo da diferença no formato de ExecutorReplicacoes.resumo.
+    """
+    diferencas = {}
+    for indice in range(replicacoes):
+        semente = derivar_semente(semente_base, indice)
+        simulador_a = cenario_a(semente)
+        simulador_a.executar()
+        simulador_b = cenario_b(semente if comuns else derivar_semente(semente_base, indice, 'b'))
+        simulador_b.executar()
+
+        metricas_b = metricas_da_simulacao(simulador_b)
+        for nome, valor in metricas_da_simulacao(simulador_a).items():
+            if nome in metricas_b:
+                diferencas.setdefault(nome, EstatisticaOnline()).adicionar(metricas_b[nome] - valor)
+    return {nome: estat.resumo(nivel) for nome, estat in diferencas.items()}
+
+
+def formatar_resumo_replicacoes(resumo, nivel=0.95):
+    """Formata o resumo das replicações como tabela de texto."""
+    linhas = [f"{'Métrica':<24} {'Média':>12} {'Variância':>14} {f'IC {nivel:.0%}':>27}"]
+    for nome, r in resumo.items():
+        ic = f"[{r['ic_inferior']:.3f}, {r['ic_superior']:.3f}]"
+        linhas.append(f"{nome:<24} {r['media']:>12.3f} {r['variancia']:>14.3f} {ic:>27}")
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    print("=== TESTE DO EXECUTOR DE REPLICAÇÕES ===\n")
+    executor = ExecutorReplicacoes(tempo_total=1000, replicacoes=200, semente=42)
+    print(formatar_resumo_replicacoes(executor.executar()))
+
+    from catalogo import CatalogoDispositivos, ler_configuracao
+
+    # Disco mais rápido (4-10 no lugar de 5-12) contra a configuração padrão
+    configuracao = ler_configuracao(os.path.join(os.path.dirname(__file__), '..', 'exemplos',
+                                                 'dispositivos_padrao.json'))
+    configuracao['tipos'][2]['servico'] = {'distribuicao': 'uniforme', 'min': 4, 'max': 10}
+
+    def padrao(semente):
+        return Simulador(1000, seed=semente, modo='eventos')
+
+    def disco_rapido(semente):
+        return Simulador(1000, seed=semente, modo='eventos',
+                         dispositivos=lambda: CatalogoDispositivos(configuracao))
+
+    for comuns in (False, True):
+        diferenca = comparar_cenarios(padrao, disco_rapido, 500, semente_base=42, comuns=comuns)
+        print(f"\nDisco rápido - padrão, {'com' if comuns else 'sem'} números aleatórios comuns:")
+        print(formatar_resumo_replicacoes(diferenca))
@@ -1,40 +1,182 @@
+import random
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from processo import Processo
 from dispositivos import GerenciadorDispositivos, Interrupcao
 from escalonador import Escalonador
+from eventos import (CONTEXTO_RESTAURADO, CONTEXTO_SALVO, INTERRUPCAO_DESCARTADA, INTERRUPCAO_GERADA,
+                     INTERRUPCAO_MESCLADA, PROCESSO_FINALIZADO, TIPOS_EVENTO, TRATAMENTO_FINALIZADO,
+                     TRATAMENTO_INICIADO, EventoSimulacao)
+
+
+class EstadoSimulador(Mapping):
+    """
+    Visão somente leitura do estado atual do Simulador, com as mesmas chaves de
+    obter_estado_atual, mas sem copiar nada: cada chave é lida do simulador no momento
+    do acesso ('info' vem como MappingProxyType). O Simulador cria uma única visão
+    (Simulador.estado), reaproveitada em todos os ciclos; para guardar o estado de um
+    ciclo, use obter_estado_atual.
+    """
+    __slots__ = ('_simulador',)
+
+    CHAVES = ('tempo', 'processo', 'interrupcao_ativa', 'fila_tamanho', 'info')
+
+    def __init__(self, simulador):
+        self._simulador = simulador
+
+    def __getitem__(self, chave):
+        simulador = self._simulador
+        if chave == 'tempo':
+            return simulador.tempo_atual
+        if chave == 'processo':
+            return simulador.processo
+        if chave == 'interrupcao_ativa':
+            return simulador.interrupcao_ativa
+        if chave == 'fila_tamanho':
+            return simulador.escalonador.ver_tamanho_fila()
+        if chave == 'info':
+            return MappingProxyType(simulador.info)
+        raise KeyError(chave)
+
+    def __iter__(self):
+        return iter(self.CHAVES)
+
+    def __len__(self):
+        return len(self.CHAVES)
+
 
 class Simulador:
     """Gerencia o fluxo principal da simulação"""
     
-    def __init__(self, tempo_total, seed=None):
-        """Inicializa os componentes da simulação"""
+    # Modos de execução: 'ciclo' avança uma unidade de tempo por vez,
+    # 'eventos' salta direto para o próximo evento (chegada, fim de tratamento, fim do processo)
+    MODOS = ('ciclo', 'eventos')
+
+    def __init__(self, tempo_total, seed=None, modo='ciclo', dispositivos=None, metricas=None,
+                 coalescencia=None, escalonador=None):
+        """
+        Inicializa os componentes da simulação.
+        'dispositivos' permite trocar a fonte de interrupções (por padrão, um novo
+        GerenciadorDispositivos) ou compartilhá-la entre vários simuladores. Pode ser uma
+        função sem argumentos, chamada depois de aplicar a semente (ex.: carregar um catálogo).
+        As prioridades do escalonador e as contagens por tipo vêm dessa fonte.
+        'metricas' (ex.: MetricasLatencia) é notificado no início e no fim de cada tratamento.
+        'coalescencia' (ex.: coalescencia.Coalescencia) retém as interrupções de alguns
+        dispositivos e as entrega ao escalonador agrupadas, cada grupo em um único tratamento.
+        'escalonador' é uma função que recebe {tipo: nível} e cria o escalonador (por padrão,
+        Escalonador); por exemplo functools.partial(EscalonadorLimitado, capacidade=64).
+        """
         
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de simulação desconhecido: '{modo}'. Use um de {self.MODOS}.")
+        self.modo = modo
+
+        # A semente precisa ser aplicada antes de criar os dispositivos: a fonte tira do
+        # gerador global a semente base dos geradores próprios de cada dispositivo, que
+        # depois não usam mais o estado global
+        if seed is not None:
+            random.seed(seed)
+
         # Instância dos componentes principais
         self.processo = Processo(pid=1)
-        self.dispositivos = GerenciadorDispositivos()
-        self.escalonador = Escalonador()
+        if dispositivos is None:
+            dispositivos = GerenciadorDispositivos()
+        elif callable(dispositivos):
+            dispositivos = dispositivos()
+        self.dispositivos = dispositivos
+        # Com um PoolInterrupcoes na fonte, as interrupções tratadas ou descartadas voltam para ele
+        self.pool = getattr(dispositivos, 'pool', None)
+        prioridades = self.dispositivos.prioridades()
+        self.escalonador = (escalonador or Escalonador)({tipo: nivel for tipo, (nivel, _) in prioridades.items()})
+        if hasattr(self.escalonador, 'ao_descartar'):
+            # Fila limitada: interrupções descartadas ou mescladas voltam para os dispositivos
+            self.escalonador.ao_descartar = self.interrupcao_descartada
         
         # Informações de tempo e estados
         self.tempo_atual = 0
         self.tempo_total = tempo_total
         self.interrupcao_ativa = None
         self.tempo_restante = 0
+        self.metricas = metricas
+        self.coalescencia = coalescencia
         
         # Informações da simulação
         self.info = {
             'tempo_processo': 0,
             'tempo_interrupcoes': 0,
             'total_interrupcoes': 0,
-            'por_tipo': {'teclado': 0, 'impressora': 0, 'disco': 0}
+            'por_tipo': {tipo: 0 for tipo in prioridades}
         }
+        if hasattr(self.escalonador, 'ao_descartar'):
+            self.info['descartadas'] = 0
+            self.info['mescladas'] = 0
+        if coalescencia is not None:
+            # Interrupções atendidas dentro de um lote sem troca de contexto própria
+            self.info['interrupcoes_agrupadas'] = 0
+
+        # Visão do estado sem cópias, para quem acompanha a simulação ciclo a ciclo
+        self.estado = EstadoSimulador(self)
+
+        # Observadores inscritos: (função, tipos de evento aceitos ou None para todos)
+        self.observadores = []
+
+    def __getstate__(self):
+        # Observadores (funções, publicadores asyncio...) não fazem parte de um snapshot
+        estado = self.__dict__.copy()
+        estado['observadores'] = []
+        return estado
+
+    def inscrever(self, observador, tipos=None):
+        """
+        Inscreve 'observador', uma função que recebe um EventoSimulacao a cada mudança de
+        estado (chegada, descarte, início e fim de tratamento, contexto salvo ou restaurado,
+        fim do processo). 'tipos' restringe os eventos recebidos (padrão: todos).
+        Sem observadores inscritos, nenhum evento é criado. Retorna o próprio observador.
+        """
+        if tipos is not None:
+            tipos = frozenset(tipos)
+            desconhecidos = tipos - set(TIPOS_EVENTO)
+            if desconhecidos:
+                raise ValueError(f"Tipos de evento desconhecidos: {sorted(desconhecidos)}. Use {TIPOS_EVENTO}.")
+        self.observadores.append((observador, tipos))
+        return observador
+
+    def cancelar_inscricao(self, observador):
+        """Remove um observador inscrito com inscrever."""
+        self.observadores = [(o, tipos) for o, tipos in self.observadores if o is not observador]
+
+    def emitir(self, tipo, interrupcao=None):
+        """Entrega um evento aos observadores interessados (chamado só quando há observadores)."""
+        evento = EventoSimulacao(tipo, self.tempo_atual, interrupcao)
+        for observador, tipos in self.observadores:
+            if tipos is None or tipo in tipos:
+                observador(evento)
     
     def gerar_interrupcoes(self):
         """Verifica se algum dispositivo gerou interrupções neste ciclo"""
         novas = self.dispositivos.verificar_interrupcoes(self.tempo_atual)
-        for interrupcao in novas:
-            # Coloca cada nova interrupção na fila do escalonador
-            self.escalonador.adicionar_interrupcao(interrupcao)
+        if self.observadores:
+            for interrupcao in novas:
+                self.emitir(INTERRUPCAO_GERADA, interrupcao)
+        if self.coalescencia is not None:
+            novas = self.coalescencia.filtrar(novas, self.tempo_atual)
+        if novas:
+            # Coloca as novas interrupções na fila do escalonador, em lote
+            self.escalonador.adicionar_interrupcoes(novas)
         return novas
     
+    def interrupcao_descartada(self, interrupcao, mesclada):
+        """Registra uma interrupção que a fila limitada descartou ou mesclou a outra"""
+        membros = getattr(interrupcao, 'membros', (interrupcao,))
+        self.info['mescladas' if mesclada else 'descartadas'] += len(membros)
+        for membro in membros:
+            self.dispositivos.notificar_interrupcao_descartada(membro.tipo, membro.origem, mesclada)
+            if self.observadores:
+                self.emitir(INTERRUPCAO_MESCLADA if mesclada else INTERRUPCAO_DESCARTADA, membro)
+            if self.pool is not None:
+                self.pool.liberar(membro)
+
     def processar_ciclo(self):
         """Executa um passo da simulação"""
         
@@ -60,57 +202,166 @@ class Simulador:
                 return 'INTERRUPCAO_INICIADA'
         
         # Caso contrário, o processo principal continua executando
+        return self.executar_processo()
+
+    def executar_processo(self):
+        """Executa uma unidade de tempo do processo principal e retorna o status do ciclo"""
         if self.processo.executa_processo():
             self.info['tempo_processo'] += 1
+            if self.observadores and self.processo.estado == 'FINALIZADO':
+                self.emitir(PROCESSO_FINALIZADO)
             return 'PROCESSO_EXECUTANDO'
         
         # Se o processo terminou, finaliza
         return 'PROCESSO_FINALIZADO'
     
     def iniciar_tratamento(self, interrupcao):
-        """Começa o tratamento de uma interrupção"""
+        """Começa o tratamento de uma interrupção (ou de um lote de interrupções)"""
         
         # Guarda as informações do processo
-        self.processo.backup_processo()
+        self.salvar_contexto()
         
         # Configura o estado atual
         self.interrupcao_ativa = interrupcao
         self.tempo_restante = interrupcao.tempo_tratamento
         
-        # Atualiza estatísticas
-        self.info['total_interrupcoes'] += 1
-        self.info['por_tipo'][interrupcao.tipo] += 1
+        # Atualiza estatísticas (um lote conta cada interrupção que agrupa)
+        membros = getattr(interrupcao, 'membros', (interrupcao,))
+        self.info['total_interrupcoes'] += len(membros)
+        self.info['por_tipo'][interrupcao.tipo] = self.info['por_tipo'].get(interrupcao.tipo, 0) + len(membros)
+        if len(membros) > 1:
+            self.info['interrupcoes_agrupadas'] += len(membros) - 1
         
         # Marca o início do tratamento
-        interrupcao.tempo_inicio_tratamento = self.tempo_atual
+        for membro in membros:
+            membro.tempo_inicio_tratamento = self.tempo_atual
+            if self.metricas:
+                self.metricas.ao_iniciar(membro)
+            if self.observadores:
+                self.emitir(TRATAMENTO_INICIADO, membro)
     
     def finalizar_tratamento(self):
         """Conclui o tratamento da interrupção"""
         if not self.interrupcao_ativa:
             return
         
-        # Notifica o dispositivo de que a interrupção foi tratada
-        self.dispositivos.notificar_interrupcao_tratada(self.interrupcao_ativa.tipo)
+        # Notifica o dispositivo de que a interrupção (ou cada uma do lote) foi tratada
+        membros = getattr(self.interrupcao_ativa, 'membros', (self.interrupcao_ativa,))
+        for membro in membros:
+            self.dispositivos.notificar_interrupcao_tratada(membro.tipo, membro.origem)
         
+        # Marca o fim do tratamento
+        suspenso = self.tempo_suspenso(self.interrupcao_ativa) if self.metricas else 0
+        for membro in membros:
+            membro.tempo_fim_tratamento = self.tempo_atual
+            if self.metricas:
+                self.metricas.ao_finalizar(membro, suspenso)
+            if self.observadores:
+                self.emitir(TRATAMENTO_FINALIZADO, membro)
+
         # Restaura o contexto do processo
-        self.processo.restaura_processo(
-            self.processo.programa_contador,
-            self.processo.progresso_execucao
-        )
+        self.restaurar_contexto()
         
         # Limpa estado interno
-        self.interrupcao_ativa.tempo_fim_tratamento = self.tempo_atual
+        if self.pool is not None:
+            for membro in membros:
+                self.pool.liberar(membro)
         self.interrupcao_ativa = None
         self.tempo_restante = 0
     
+    def tempo_suspenso(self, interrupcao):
+        """Tempo em que o tratador da interrupção ficou suspenso (só há suspensão com preempção)."""
+        return 0
+
+    def salvar_contexto(self):
+        """Salva o contexto do processo interrompido (troca de contexto na entrada do tratador)"""
+        self.processo.backup_processo()
+        if self.observadores:
+            self.emitir(CONTEXTO_SALVO, self.interrupcao_ativa)
+
+    def restaurar_contexto(self):
+        """Restaura o contexto do processo interrompido ao fim do tratamento"""
+        self.processo.restaura_processo(
+            self.processo.programa_contador,
+            self.processo.progresso_execucao
+        )
+        if self.observadores:
+            self.emitir(CONTEXTO_RESTAURADO)
+
     def avancar_tempo(self):
         """Avança o tempo global da simulação"""
         self.tempo_atual += 1
         # Continua enquanto houver tempo e o processo não estiver encerrado
-        return self.tempo_atual <= self.tempo_total and self.processo.estado != 'FINALIZADO'
+        return not self.concluido()
+
+    def concluido(self):
+        """Retorna True se o tempo acabou ou o processo principal foi encerrado"""
+        return self.tempo_atual > self.tempo_total or self.processo.estado == 'FINALIZADO'
     
+    def executar(self):
+        """
+        Executa a simulação inteira (até o tempo total ou o fim do processo)
+        e retorna as estatísticas em self.info.
+        Os dois modos produzem as mesmas estatísticas para a mesma semente.
+        """
+        if self.modo == 'eventos':
+            self._executar_eventos()
+        else:
+            while not self.concluido():
+                self.processar_ciclo()
+                self.avancar_tempo()
+        return self.info
+
+    def _executar_eventos(self):
+        """
+        Motor orientado a eventos: em vez de avançar ciclo a ciclo, pula os trechos
+        em que nada muda de forma observável (tratamento em andamento ou processo
+        executando sem chegadas) e só chama processar_ciclo nos ciclos com eventos.
+        """
+        while not self.concluido():
+            if self.interrupcao_ativa:
+                # Tratamento em andamento: salta para o ciclo em que ele termina
+                passos = max(self.tempo_restante, 1)
+                fim = self.tempo_atual + passos - 1
+                if fim > self.tempo_total:
+                    # O horizonte acaba antes do fim do tratamento
+                    passos = self.tempo_total - self.tempo_atual + 1
+                    self.tempo_restante -= passos
+                    self.info['tempo_interrupcoes'] += passos
+                    self.tempo_atual = self.tempo_total + 1
+                    return
+                self.info['tempo_interrupcoes'] += passos
+                self.tempo_atual = fim
+                self.finalizar_tratamento()
+
+            elif not self.escalonador.tem_interrupcao_pendente():
+                # Ciclos sem chegadas antes da próxima interrupção
+                livres = self.dispositivos.sondagens_ate_proxima_interrupcao(self.tempo_atual) - 1
+                passos = min(livres,
+                             self.processo.unidades_restantes(),
+                             self.tempo_total - self.tempo_atual + 1)
+                if self.coalescencia is not None:
+                    # Não salta o ciclo em que um grupo retido deve ser liberado
+                    passos = min(passos, self.coalescencia.ciclos_ate_liberacao(self.tempo_atual))
+                if passos >= 1 and self.processo.executa_processo(passos):
+                    self.dispositivos.pular_sondagens(passos)
+                    self.info['tempo_processo'] += passos
+                    self.tempo_atual += passos - 1
+                    if self.observadores and self.processo.estado == 'FINALIZADO':
+                        self.emitir(PROCESSO_FINALIZADO)
+                else:
+                    self.processar_ciclo()
+
+            else:
+                self.processar_ciclo()
+
+            self.avancar_tempo()
+
     def obter_estado_atual(self):
-        """Retorna as informações do estado atual"""
+        """
+        Retorna uma cópia das informações do estado atual.
+        Para ler o estado a cada ciclo sem criar dicionários, use self.estado.
+        """
         return {
             'tempo': self.tempo_atual,
             'processo': self.processo,
@@ -0,0 +1,295 @@
+import mmap
+import struct
+
+from dispositivos import PRIORIDADES_PADRAO, Interrupcao
+
+# Formato do arquivo de traço (little-endian, largura fixa):
+#   cabeçalho de 16 bytes: assinatura, versão, tamanho do registro, número de tipos
+#   tabela de tipos: um nome de 16 bytes (utf-8, completado com zeros) por tipo
+#   registros de 16 bytes: tempo (u64), tempo de tratamento (u32), índice do tipo (u16)
+ASSINATURA = b'IOTRACE'
+VERSAO = 1
+CABECALHO = struct.Struct('<7sBHH4x')
+NOME_TIPO = struct.Struct('<16s')
+REGISTRO = struct.Struct('<QIH2x')
+
+
+def _deslocamento_registros(quantidade_tipos):
+    return CABECALHO.size + NOME_TIPO.size * quantidade_tipos
+
+
+class EscritorTraco:
+    """Grava registros (tempo, tipo, tempo_tratamento) em um arquivo de traço, em blocos."""
+
+    def __init__(self, caminho, tipos, tamanho_bloco=4096):
+        self.tipos = list(tipos)
+        nomes = [tipo.encode('utf-8') for tipo in self.tipos]
+        for tipo, nome in zip(self.tipos, nomes):
+            if len(nome) > NOME_TIPO.size:
+                raise ValueError(f"Tipo '{tipo}' ocupa {len(nome)} bytes em UTF-8; o traço "
+                                 f"guarda no máximo {NOME_TIPO.size}.")
+        self.indices = {tipo: i for i, tipo in enumerate(self.tipos)}
+        self.tamanho_bloco = tamanho_bloco
+        self.buffer = bytearray()
+        self.pendentes = 0
+        self.total = 0
+
+        self.arquivo = open(caminho, "wb")
+        self.arquivo.write(CABECALHO.pack(ASSINATURA, VERSAO, REGISTRO.size, len(self.tipos)))
+        for nome in nomes:
+            self.arquivo.write(NOME_TIPO.pack(nome))
+
+    def escrever(self, tempo, tipo, tempo_tratamento):
+        if tipo not in self.indices:
+            raise ValueError(f"Tipo '{tipo}' não está na tabela de tipos do traço.")
+        self.buffer += REGISTRO.pack(tempo, tempo_tratamento, self.indices[tipo])
+        self.pendentes += 1
+        self.total += 1
+        if self.pendentes >= self.tamanho_bloco:
+            self.descarregar()
+
+    def descarregar(self):
+        self.arquivo.write(self.buffer)
+        self.buffer.clear()
+        self.pendentes = 0
+
+    def fechar(self):
+        if not self.arquivo.closed:
+            self.descarregar()
+            self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class LeitorTraco:
+    """
+    Lê um arquivo de traço via mmap. A iteração decodifica os registros em blocos de
+    BLOCO_LEITURA registros copiados da memória mapeada, então traços de centenas de
+    milhões de chegadas são percorridos sem carregá-los na RAM.
+
+    Depois de fechar(), os iteradores ainda abertos entregam o resto do bloco já copiado
+    e terminam normalmente (como no fim do traço), em vez de lerem memória já liberada.
+    """
+
+    BLOCO_LEITURA = 65536
+
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "rb")
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        assinatura, versao, tamanho_registro, quantidade_tipos = CABECALHO.unpack_from(self.mapa, 0)
+        if assinatura != ASSINATURA:
+            raise ValueError("Arquivo de traço inválido: assinatura não reconhecida.")
+        if versao != VERSAO or tamanho_registro != REGISTRO.size:
+            raise ValueError(f"Versão de traço não suportada: {versao}.")
+
+        self.tipos = [
+            NOME_TIPO.unpack_from(self.mapa, CABECALHO.size + i * NOME_TIPO.size)[0].rstrip(b'\0').decode('utf-8')
+            for i in range(quantidade_tipos)
+        ]
+        self.inicio = _deslocamento_registros(quantidade_tipos)
+
+    def __len__(self):
+        return (len(self.mapa) - self.inicio) // REGISTRO.size
+
+    def __iter__(self):
+        """Gera (tempo, tipo, tempo_tratamento) para cada registro, em ordem."""
+        tipos, mapa = self.tipos, self.mapa
+        fim = self.inicio + len(self) * REGISTRO.size
+        passo = self.BLOCO_LEITURA * REGISTRO.size
+        for posicao in range(self.inicio, fim, passo):
+            if mapa.closed:
+                return
+            # Cópia do bloco: nenhum iterador mantém referência à memória mapeada
+            bloco = mapa[posicao:min(posicao + passo, fim)]
+            for tempo, tempo_tratamento, indice in REGISTRO.iter_unpack(bloco):
+                yield tempo, tipos[indice], tempo_tratamento
+
+    def fechar(self):
+        if not self.mapa.closed:
+            self.mapa.close()
+            self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+class GravadorTraco:
+    """
+    Envolve uma fonte de interrupções (ex.: GerenciadorDispositivos) e grava no traço
+    cada chegada que ela produz. Pode ser passado ao Simulador no lugar da fonte original.
+    """
+
+    def __init__(self, dispositivos, caminho):
+        self.dispositivos = dispositivos
+        # Um nome por tipo (não por dispositivo): o cabeçalho não cresce com a quantidade
+        self.escritor = EscritorTraco(caminho, list(dispositivos.prioridades()))
+
+    def verificar_interrupcoes(self, tempo_atual):
+        novas = self.dispositivos.verificar_interrupcoes(tempo_atual)
+        for interrupcao in novas:
+            self.escritor.escrever(tempo_atual, interrupcao.tipo, interrupcao.tempo_tratamento)
+        return novas
+
+    def fechar(self):
+        self.escritor.fechar()
+
+    def __getattr__(self, nome):
+        # Demais operações (estatísticas, notificações, sondagens) vão para a fonte original
+        if nome == 'dispositivos':
+            raise AttributeError(nome)
+        return getattr(self.dispositivos, nome)
+
+
+class FonteTraco:
+    """
+    Fonte de interrupções que reproduz um traço gravado, no lugar de GerenciadorDispositivos.
+
+    Cada registro é entregue na primeira sondagem com tempo maior ou igual ao dele
+    (como uma linha de interrupção que fica pendente até a CPU olhar), então o mesmo
+    traço pode alimentar variantes do escalonador que sondam em momentos diferentes.
+    """
+
+    def __init__(self, caminho, prioridades=None):
+        """
+        prioridades: {tipo: (nível, rótulo)} dos tipos do traço; por padrão usa
+        PRIORIDADES_PADRAO e prioridade mínima para tipos desconhecidos.
+        """
+        self.leitor = LeitorTraco(caminho)
+        self.registros = iter(self.leitor)
+        self.proximo = next(self.registros, None)
+
+        prioridades = prioridades or PRIORIDADES_PADRAO
+        self.mapa_prioridades = {tipo: prioridades.get(tipo, (0, 'Desconhecida'))
+                                 for tipo in self.leitor.tipos}
+        self.estatisticas = {
+            tipo: {'tipo': tipo, 'prioridade': self.mapa_prioridades[tipo][1],
+                   'total_interrupcoes': 0, 'pendentes': 0, 'descartadas': 0, 'mescladas': 0}
+            for tipo in self.leitor.tipos
+        }
+
+    def verificar_interrupcoes(self, tempo_atual):
+        interrupcoes_geradas = []
+        while self.proximo is not None and self.proximo[0] <= tempo_atual:
+            _, tipo, tempo_tratamento = self.proximo
+            interrupcoes_geradas.append(Interrupcao(tipo, tempo_atual, tempo_tratamento))
+            estat = self.estatisticas[tipo]
+            estat['total_interrupcoes'] += 1
+            estat['pendentes'] += 1
+            self.proximo = next(self.registros, None)
+        return interrupcoes_geradas
+
+    def sondagens_ate_proxima_interrupcao(self, tempo_atual=None):
+        if self.proximo is None:
+            return float('inf')
+        return max(1, self.proximo[0] - tempo_atual + 1)
+
+    def pular_sondagens(self, quantidade):
+        # As chegadas do traço dependem do relógio, não do número de sondagens
+        pass
+
+    def prioridades(self):
+        return dict(self.mapa_prioridades)
+
+    def notificar_interrupcao_tratada(self, tipo_dispositivo, origem=None):
+        estat = self.estatisticas.get(tipo_dispositivo)
+        if estat and estat['pendentes'] > 0:
+            estat['pendentes'] -= 1
+
+    def notificar_interrupcao_descartada(self, tipo_dispositivo, origem=None, mesclada=False):
+        estat = self.estatisticas.get(tipo_dispositivo)
+        if estat:
+            if estat['pendentes'] > 0:
+                estat['pendentes'] -= 1
+            estat['mescladas' if mesclada else 'descartadas'] += 1
+
+    def obter_estatisticas_gerais(self):
+        return {tipo: dict(estat) for tipo, estat in self.estatisticas.items()}
+
+    def fechar(self):
+        """Fecha o traço; as sondagens seguintes se comportam como no fim do traço."""
+        self.registros = iter(())
+        self.proximo = None
+        self.leitor.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def ler_proc_interrupts(texto):
+    """
+    Converte uma amostra de /proc/interrupts em {irq: total de interrupções somado entre as CPUs}.
+    """
+    linhas = texto.strip().splitlines()
+    quantidade_cpus = len(linhas[0].split())
+    totais = {}
+    for linha in linhas[1:]:
+        irq, _, resto = linha.partition(':')
+        contagens = resto.split()[:quantidade_cpus]
+        total = 0
+        for valor in contagens:
+            if not valor.isdigit():
+                break
+            total += int(valor)
+        totais[irq.strip()] = total
+    return totais
+
+
+def converter_proc_interrupts(amostras, caminho, mapa_tipos, tempo_tratamento, unidades_por_amostra=1):
+    """
+    Gera um traço a partir de amostras sucessivas de /proc/interrupts (textos).
+
+    mapa_tipos: {irq: tipo} indica quais linhas viram quais dispositivos do simulador.
+    tempo_tratamento: {tipo: unidades} com o tempo de tratamento gravado para cada tipo.
+    As interrupções contadas entre duas amostras são distribuídas uniformemente pelas
+    'unidades_por_amostra' unidades de tempo do intervalo. Retorna o número de registros.
+    """
+    tipos = sorted(set(mapa_tipos.values()))
+    anterior = None
+    with EscritorTraco(caminho, tipos) as escritor:
+        for indice, texto in enumerate(amostras):
+            atual = ler_proc_interrupts(texto)
+            if anterior is not None:
+                inicio = (indice - 1) * unidades_por_amostra
+                chegadas = []
+                for irq, tipo in mapa_tipos.items():
+                    quantidade = atual.get(irq, 0) - anterior.get(irq, 0)
+                    for n in range(max(quantidade, 0)):
+                        chegadas.append((inicio + n * unidades_por_amostra // quantidade, tipo))
+                for tempo, tipo in sorted(chegadas, key=lambda c: c[0]):
+                    escritor.escrever(tempo, tipo, tempo_tratamento[tipo])
+            anterior = atual
+        return escritor.total
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from simulacao import Simulador
+
+    print("=== TESTE DE GRAVAÇÃO E REPRODUÇÃO DE TRAÇOS ===\n")
+    caminho = os.path.join(tempfile.gettempdir(), "traco_teste.bin")
+
+    original = Simulador(tempo_total=5000, seed=9)
+    gravador = GravadorTraco(original.dispositivos, caminho)
+    original.dispositivos = gravador
+    original.executar()
+    gravador.fechar()
+
+    fonte = FonteTraco(caminho)
+    print(f"Traço com {len(fonte.leitor)} chegadas ({os.path.getsize(caminho)} bytes)")
+    reproducao = Simulador(tempo_total=5000, modo='eventos', dispositivos=fonte)
+    reproducao.executar()
+    fonte.fechar()
+    print("Reprodução idêntica à execução gravada:", reproducao.info == original.info)
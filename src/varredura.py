@@ -0,0 +1,328 @@
+import argparse
+import copy
+import hashlib
+import itertools
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from catalogo import CatalogoDispositivos, ler_configuracao
+from dispositivos import GerenciadorDispositivos, derivar_semente
+from replicacoes import EstatisticaOnline, metricas_da_simulacao
+from simulacao import Simulador
+
+# Campos de um tipo de dispositivo que podem variar na varredura ('tipo.campo')
+CAMPOS_VARREDURA = ('prob_interrupcao', 'tempo_min', 'tempo_max', 'prioridade', 'quantidade')
+
+# Módulos que determinam o resultado de uma replicação: esta varredura (executar_replicacao,
+# aplicar_parametros) e o que ela usa. A varredura não liga coalescência, métricas de latência
+# nem o estimador analítico, então mudar esses módulos ou ferramentas como benchmark.py não
+# invalida o cache
+MODULOS_SIMULACAO = ('varredura', 'simulacao', 'processo', 'dispositivos', 'escalonador', 'eventos',
+                     'catalogo', 'replicacoes')
+
+_versao_codigo = None
+
+
+def versao_codigo():
+    """
+    Hash do código-fonte dos módulos da simulação (MODULOS_SIMULACAO). Faz parte da chave
+    do cache, então alterar esses módulos invalida os resultados guardados.
+    """
+    global _versao_codigo
+    if _versao_codigo is None:
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        resumo = hashlib.sha256()
+        for modulo in MODULOS_SIMULACAO:
+            nome = modulo + '.py'
+            resumo.update(nome.encode())
+            with open(os.path.join(pasta, nome), 'rb') as arquivo:
+                resumo.update(arquivo.read())
+        _versao_codigo = resumo.hexdigest()[:16]
+    return _versao_codigo
+
+
+def configuracao_padrao():
+    """Configuração de catálogo equivalente aos três dispositivos padrão."""
+    return {'tipos': [
+        {'tipo': d.tipo, 'prioridade': d.nivel_prioridade, 'rotulo': d.prioridade,
+         'prob_interrupcao': d.prob_interrupcao,
+         'servico': {'distribuicao': 'uniforme', 'min': d.tempo_min, 'max': d.tempo_max}}
+        for d in GerenciadorDispositivos(semente=0).dispositivos
+    ]}
+
+
+def aplicar_parametros(configuracao, parametros):
+    """
+    Retorna uma cópia da configuração do catálogo com os parâmetros aplicados.
+    Cada parâmetro é 'tipo.campo' (campos em CAMPOS_VARREDURA), por exemplo
+    {'disco.prob_interrupcao': 0.1, 'disco.tempo_max': 10, 'teclado.prioridade': 4}.
+    """
+    configuracao = copy.deepcopy(configuracao)
+    entradas = {entrada['tipo']: entrada for entrada in configuracao['tipos']}
+    for nome, valor in parametros.items():
+        tipo, _, campo = nome.partition('.')
+        if tipo not in entradas:
+            raise ValueError(f"Tipo de dispositivo desconhecido no parâmetro '{nome}'.")
+        if campo not in CAMPOS_VARREDURA:
+            raise ValueError(f"Campo desconhecido no parâmetro '{nome}'. Use um de {CAMPOS_VARREDURA}.")
+        entrada = entradas[tipo]
+        if campo in ('tempo_min', 'tempo_max'):
+            servico = entrada.setdefault('servico', {'distribuicao': 'constante', 'valor': 1})
+            if servico.get('distribuicao', 'uniforme') == 'constante':
+                servico = entrada['servico'] = {'distribuicao': 'uniforme',
+                                                'min': servico['valor'], 'max': servico['valor']}
+            elif servico['distribuicao'] != 'uniforme':
+                raise ValueError(f"'{nome}' só se aplica a tempos de tratamento uniformes ou constantes.")
+            servico['min' if campo == 'tempo_min' else 'max'] = valor
+        else:
+            entrada[campo] = valor
+
+    for entrada in configuracao['tipos']:
+        servico = entrada.get('servico', {})
+        if servico.get('distribuicao', 'uniforme') == 'uniforme' and servico.get('min', 0) > servico.get('max', 0):
+            raise ValueError(f"Tempo mínimo maior que o máximo no tipo '{entrada['tipo']}'.")
+    return configuracao
+
+
+def grade(espaco):
+    """Todas as combinações de {parâmetro: [valores]} (produto cartesiano)."""
+    nomes = list(espaco)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(espaco[n] for n in nomes))]
+
+
+def amostra_aleatoria(espaco, quantidade, semente=0):
+    """
+    'quantidade' pontos sorteados do espaço: cada parâmetro é uma lista de valores
+    (sorteia um deles) ou um intervalo {'min': a, 'max': b} (uniforme; inteiro se os
+    dois limites forem inteiros).
+    """
+    rng = random.Random(semente)
+    pontos = []
+    for _ in range(quantidade):
+        ponto = {}
+        for nome, valores in espaco.items():
+            if isinstance(valores, dict):
+                if isinstance(valores['min'], int) and isinstance(valores['max'], int):
+                    ponto[nome] = rng.randint(valores['min'], valores['max'])
+                else:
+                    ponto[nome] = rng.uniform(valores['min'], valores['max'])
+            else:
+                ponto[nome] = rng.choice(valores)
+        pontos.append(ponto)
+    return pontos
+
+
+class CacheResultados:
+    """
+    Cache em disco dos resultados de replicações: um arquivo JSON por chave na 'pasta'.
+
+    Quando o total passa de 'tamanho_maximo' bytes, os arquivos usados há mais tempo são
+    removidos até o cache voltar a 90% do limite (uma leitura atualiza o horário do arquivo).
+    Vários processos podem compartilhar a pasta: as gravações são atômicas e um arquivo
+    removido por outro processo conta apenas como falta.
+    """
+
+    def __init__(self, pasta, tamanho_maximo=64 * 1024 * 1024):
+        if tamanho_maximo < 1:
+            raise ValueError("O tamanho máximo do cache deve ser positivo.")
+        self.pasta = pasta
+        self.tamanho_maximo = tamanho_maximo
+        os.makedirs(pasta, exist_ok=True)
+        self.tamanho = sum(e.stat().st_size for e in os.scandir(pasta) if e.name.endswith('.json'))
+
+        self.acertos = 0
+        self.faltas = 0
+        self.removidos = 0
+        if self.tamanho > self.tamanho_maximo:
+            # O limite pode ter sido reduzido desde a última execução
+            self._remover_antigos()
+
+    def _caminho(self, chave):
+        return os.path.join(self.pasta, chave + '.json')
+
+    @staticmethod
+    def chave(*partes):
+        """Hash das partes (qualquer valor serializável em JSON)."""
+        return hashlib.sha256(json.dumps(partes, sort_keys=True).encode()).hexdigest()
+
+    def obter(self, chave):
+        """Valor guardado para a chave, ou None."""
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                valor = json.load(arquivo)
+            os.utime(caminho)
+        except (OSError, ValueError):
+            self.faltas += 1
+            return None
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave, valor):
+        """Grava o valor de forma atômica (arquivo temporário + rename) e aplica o limite."""
+        caminho = self._caminho(chave)
+        # Temporário com nome único: outro processo pode estar gravando a mesma chave
+        descritor, temporario = tempfile.mkstemp(dir=self.pasta, suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+                json.dump(valor, arquivo)
+        except BaseException:
+            os.remove(temporario)
+            raise
+        try:
+            anterior = os.path.getsize(caminho)
+        except OSError:
+            anterior = 0
+        os.replace(temporario, caminho)
+        self.tamanho += os.path.getsize(caminho) - anterior
+        if self.tamanho > self.tamanho_maximo:
+            self._remover_antigos()
+
+    def _remover_antigos(self):
+        entradas = sorted((e for e in os.scandir(self.pasta) if e.name.endswith('.json')),
+                          key=lambda e: e.stat().st_mtime)
+        self.tamanho = sum(e.stat().st_size for e in entradas)
+        alvo = self.tamanho_maximo * 0.9
+        for entrada in entradas:
+            if self.tamanho <= alvo:
+                break
+            tamanho = entrada.stat().st_size
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                continue
+            self.tamanho -= tamanho
+            self.removidos += 1
+
+
+def executar_replicacao(configuracao, tempo_total, semente, modo):
+    """Executa uma replicação do catálogo 'configuracao' e retorna suas métricas."""
+    simulador = Simulador(tempo_total, seed=semente, modo=modo,
+                          dispositivos=lambda: CatalogoDispositivos(configuracao))
+    simulador.executar()
+    return metricas_da_simulacao(simulador)
+
+
+def _executar_tarefa(tarefa):
+    # Função de módulo para rodar dentro dos processos do pool
+    return executar_replicacao(*tarefa)
+
+
+def executar_varredura(pontos, tempo_total, sementes=10, semente_base=0, cache=None, modo='eventos',
+                       configuracao=None, processos=1, nivel_confianca=0.95):
+    """
+    Executa 'sementes' replicações de cada ponto (dicionário de parâmetros, ver
+    aplicar_parametros) e retorna, por ponto, o resumo das métricas no formato de
+    ExecutorReplicacoes.resumo.
+
+    A replicação i usa a mesma semente em todos os pontos (números aleatórios comuns).
+    Com 'cache' (CacheResultados), cada replicação é guardada com chave dada pela
+    configuração, horizonte, modo, semente e versão do código: repetir a varredura,
+    ampliar a grade ou aumentar 'sementes' só executa as replicações que faltam.
+    'configuracao' é o catálogo base (padrão: os dispositivos padrão); com 'processos'
+    maior que 1, as replicações que faltam rodam em paralelo.
+    """
+    base = configuracao if configuracao is not None else configuracao_padrao()
+    versao = versao_codigo()
+    metricas = {}   # (ponto, replicação) -> métricas
+    tarefas = []    # replicações fora do cache: ((ponto, replicação), argumentos, chave)
+    for indice_ponto, parametros in enumerate(pontos):
+        configuracao_ponto = aplicar_parametros(base, parametros)
+        for replicacao in range(sementes):
+            semente = derivar_semente(semente_base, replicacao)
+            chave = None
+            if cache is not None:
+                chave = cache.chave(configuracao_ponto, tempo_total, modo, semente, versao)
+                guardado = cache.obter(chave)
+                if guardado is not None:
+                    metricas[indice_ponto, replicacao] = guardado
+                    continue
+            tarefas.append(((indice_ponto, replicacao), (configuracao_ponto, tempo_total, semente, modo), chave))
+
+    if processos > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            calculadas = pool.map(_executar_tarefa, [argumentos for _, argumentos, _ in tarefas],
+                                  chunksize=max(1, len(tarefas) // (processos * 8)))
+            calculadas = list(calculadas)
+    else:
+        calculadas = [_executar_tarefa(argumentos) for _, argumentos, _ in tarefas]
+
+    for (posicao, _, chave), resultado in zip(tarefas, calculadas):
+        metricas[posicao] = resultado
+        if cache is not None:
+            cache.guardar(chave, resultado)
+
+    novas_por_ponto = [0] * len(pontos)
+    for (indice_ponto, _), _, _ in tarefas:
+        novas_por_ponto[indice_ponto] += 1
+
+    resultados = []
+    for indice_ponto, parametros in enumerate(pontos):
+        estatisticas = {}
+        for replicacao in range(sementes):
+            for nome, valor in metricas[indice_ponto, replicacao].items():
+                estatisticas.setdefault(nome, EstatisticaOnline()).adicionar(valor)
+        resultados.append({
+            'parametros': parametros,
+            'resumo': {nome: e.resumo(nivel_confianca) for nome, e in estatisticas.items()},
+            'calculadas': novas_por_ponto[indice_ponto]
+        })
+    return resultados
+
+
+def formatar_varredura(resultados, metrica='tempo_interrupcoes'):
+    """Tabela com os parâmetros de cada ponto e média e IC da métrica escolhida."""
+    if not resultados:
+        return "(varredura vazia)"
+    nomes = list(resultados[0]['parametros'])
+    largura = [max(len(n), 10) for n in nomes]
+    cabecalho = " ".join(f"{n:>{l}}" for n, l in zip(nomes, largura))
+    linhas = [f"{cabecalho} {metrica + ' (média)':>28} {'IC':>24} {'novas':>6}"]
+    for resultado in resultados:
+        r = resultado['resumo'][metrica]
+        valores = " ".join(f"{resultado['parametros'][n]!s:>{l}}" for n, l in zip(nomes, largura))
+        ic = f"[{r['ic_inferior']:.2f}, {r['ic_superior']:.2f}]"
+        linhas.append(f"{valores} {r['media']:>28.3f} {ic:>24} {resultado['calculadas']:>6}")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros dos dispositivos, com cache em disco.")
+    parser.add_argument("espaco", help="JSON com {parâmetro: [valores]}, ex.: {\"disco.prob_interrupcao\": [0.1, 0.15]}")
+    parser.add_argument("-t", "--tempo", type=int, default=1000, help="horizonte de cada replicação")
+    parser.add_argument("--sementes", type=int, default=10, help="replicações por ponto")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="semente base das replicações")
+    parser.add_argument("--amostra", type=int, default=None, metavar="N",
+                        help="sorteia N pontos do espaço em vez de percorrer a grade inteira")
+    parser.add_argument("--dispositivos", default=None, metavar="CONFIG",
+                        help="catálogo base (JSON ou TOML); padrão: os três dispositivos padrão")
+    parser.add_argument("--cache", default=".cache_varredura", help="pasta do cache de resultados")
+    parser.add_argument("--sem-cache", action="store_true", help="não lê nem grava o cache")
+    parser.add_argument("--tamanho-cache", type=float, default=64, metavar="MB", help="tamanho máximo do cache")
+    parser.add_argument("-j", "--processos", type=int, default=1, help="processos em paralelo")
+    parser.add_argument("-m", "--metrica", default="tempo_interrupcoes", help="métrica mostrada na tabela")
+    parser.add_argument("-f", "--formato", choices=("texto", "json"), default="texto")
+    args = parser.parse_args(argv)
+
+    with open(args.espaco, encoding="utf-8") as arquivo:
+        espaco = json.load(arquivo)
+    pontos = amostra_aleatoria(espaco, args.amostra, args.seed) if args.amostra else grade(espaco)
+    cache = None if args.sem_cache else CacheResultados(args.cache, int(args.tamanho_cache * 1024 * 1024))
+    configuracao = ler_configuracao(args.dispositivos) if args.dispositivos else None
+
+    resultados = executar_varredura(pontos, args.tempo, args.sementes, args.seed, cache,
+                                    configuracao=configuracao, processos=args.processos)
+    if args.formato == 'json':
+        print(json.dumps(resultados, ensure_ascii=False))
+        return
+    print(formatar_varredura(resultados, args.metrica))
+    if cache is not None:
+        print(f"\nCache: {cache.acertos} acertos, {cache.faltas} faltas, {cache.removidos} removidos "
+              f"({cache.tamanho / 1024:.0f} KiB em {args.cache})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import math
+from statistics import NormalDist
+
+from dispositivos import GerenciadorDispositivos
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional; só este simulador depende dele
+    np = None
+
+# Progresso (em unidades de tempo) com que o processo principal termina, como em Processo
+UNIDADES_PROCESSO = 100
+
+
+class SimuladorVetorial:
+    """
+    Executa muitas replicações independentes do Simulador ao mesmo tempo, em passo único:
+    todas avançam o mesmo ciclo juntas e o estado de cada uma fica em arrays do NumPy
+    (uma posição por replicação), no lugar de objetos Processo, Escalonador e Interrupcao.
+
+    Estado por replicação: progresso do processo, tempo restante do tratador, tipo da
+    interrupção ativa e quantidade de interrupções na fila de cada tipo. Cada ciclo segue
+    as mesmas regras de Simulador.processar_ciclo no modo 'ciclo', e ao final cada
+    replicação tem as mesmas métricas de Simulador.info.
+
+    Como as interrupções na fila só diferem pelo tipo e pelo tempo de tratamento (que é
+    independente de todo o resto), basta contar quantas há de cada tipo e sortear o tempo
+    de tratamento quando a interrupção sai da fila: a distribuição das métricas é a mesma
+    do Simulador, embora a sequência sorteada seja outra.
+    """
+
+    def __init__(self, tempo_total, replicacoes, seed=None, fonte=None):
+        """
+        fonte: GerenciadorDispositivos ou CatalogoDispositivos que descreve os dispositivos
+        (padrão: os três dispositivos padrão). Dispositivos do mesmo tipo precisam ter a
+        mesma configuração, pois são agregados por tipo, e tipos diferentes precisam ter
+        prioridades diferentes: a fila guarda só a contagem de cada tipo, sem a ordem de
+        chegada, então não teria como desempatar por ordem de chegada (FIFO) como o
+        Escalonador faz entre tipos da mesma prioridade.
+        """
+        if np is None:
+            raise RuntimeError("O simulador vetorial requer NumPy (pip install numpy).")
+        if replicacoes < 1:
+            raise ValueError("O número de replicações deve ser positivo.")
+
+        fonte = fonte if fonte is not None else GerenciadorDispositivos()
+        prioridades = fonte.prioridades()
+        niveis = [nivel for nivel, _ in prioridades.values()]
+        if len(set(niveis)) != len(niveis):
+            raise ValueError("O simulador vetorial exige uma prioridade diferente para cada tipo de dispositivo.")
+        self.tempo_total = tempo_total
+        self.replicacoes = replicacoes
+        self.rng = np.random.default_rng(seed)
+
+        # Tipos em ordem decrescente de prioridade: a coluna 0 da fila é a mais prioritária.
+        # 'colunas' guarda a coluna de cada tipo, na ordem da fonte (a mesma de Simulador.info)
+        self.tipos = sorted(prioridades, key=lambda tipo: -prioridades[tipo][0])
+        self.colunas = {tipo: self.tipos.index(tipo) for tipo in prioridades}
+        modelos = {}
+        quantidades = dict.fromkeys(self.tipos, 0)
+        for dispositivo in fonte.dispositivos:
+            configuracao = (dispositivo.prob_interrupcao, dispositivo.tempo_min, dispositivo.tempo_max,
+                            getattr(dispositivo, 'distribuicao', 'uniforme'),
+                            getattr(dispositivo, 'media_servico', None))
+            if modelos.setdefault(dispositivo.tipo, configuracao) != configuracao:
+                raise ValueError(f"Dispositivos do tipo '{dispositivo.tipo}' com configurações diferentes.")
+            quantidades[dispositivo.tipo] += 1
+
+        self.quantidades = np.array([quantidades[tipo] for tipo in self.tipos], dtype=np.int64)
+        self.probabilidades = np.array([min(max(modelos[tipo][0], 0.0), 1.0) if tipo in modelos else 0.0
+                                        for tipo in self.tipos], dtype=np.float64)
+        self.tempo_min = np.array([modelos[tipo][1] if tipo in modelos else 1
+                                   for tipo in self.tipos], dtype=np.int64)
+        self.tempo_max = np.array([modelos[tipo][2] if tipo in modelos and modelos[tipo][2] is not None
+                                   else self.tempo_min[i] for i, tipo in enumerate(self.tipos)], dtype=np.int64)
+        self.media_exponencial = np.array([modelos[tipo][4] if tipo in modelos and modelos[tipo][3] == 'exponencial'
+                                           else 0.0 for tipo in self.tipos], dtype=np.float64)
+
+        # Estado de cada replicação (struct of arrays)
+        quantidade_tipos = len(self.tipos)
+        self.tempo_atual = 0
+        self.progresso = np.zeros(replicacoes, dtype=np.int64)
+        self.tempo_restante = np.zeros(replicacoes, dtype=np.int64)
+        self.tipo_ativo = np.full(replicacoes, -1, dtype=np.int64)
+        self.fila = np.zeros((replicacoes, quantidade_tipos), dtype=np.int64)
+        self.tempo_final = np.zeros(replicacoes, dtype=np.int64)
+
+        # Métricas de Simulador.info
+        self.tempo_processo = np.zeros(replicacoes, dtype=np.int64)
+        self.tempo_interrupcoes = np.zeros(replicacoes, dtype=np.int64)
+        self.por_tipo = np.zeros((replicacoes, quantidade_tipos), dtype=np.int64)
+
+    def _sortear_tratamentos(self, tipos):
+        """Sorteia o tempo de tratamento de interrupções dos tipos (índices) informados."""
+        tempos = self.rng.integers(self.tempo_min[tipos], self.tempo_max[tipos] + 1)
+        medias = self.media_exponencial[tipos]
+        exponenciais = medias > 0.0
+        if exponenciais.any():
+            sorteados = np.ceil(self.rng.exponential(medias[exponenciais])).astype(np.int64)
+            tempos[exponenciais] = np.maximum(1, sorteados)
+        return tempos
+
+    def _ciclo(self, vivas):
+        """Executa o ciclo atual nas replicações 'vivas' (índices ainda não concluídos)."""
+        com_tratador = self.tempo_restante[vivas] > 0
+        tratando, livres = vivas[com_tratador], vivas[~com_tratador]
+
+        # Replicações tratando interrupção: consomem uma unidade do tratador
+        self.tempo_restante[tratando] -= 1
+        self.tempo_interrupcoes[tratando] += 1
+        self.tipo_ativo[tratando[self.tempo_restante[tratando] == 0]] = -1
+
+        # As demais sondam os dispositivos (quantas chegadas de cada tipo neste ciclo)
+        if not livres.size:
+            return
+        self.fila[livres] += self.rng.binomial(self.quantidades, self.probabilidades,
+                                               size=(livres.size, len(self.tipos)))
+
+        # Com fila: inicia o tratamento da interrupção mais prioritária (uma coluna por
+        # prioridade, então argmax não precisa desempatar)
+        pendentes = self.fila[livres] > 0
+        com_fila = pendentes.any(axis=1)
+        iniciando = livres[com_fila]
+        if iniciando.size:
+            tipos = pendentes[com_fila].argmax(axis=1)
+            self.fila[iniciando, tipos] -= 1
+            self.tempo_restante[iniciando] = self._sortear_tratamentos(tipos)
+            self.tipo_ativo[iniciando] = tipos
+            self.por_tipo[iniciando, tipos] += 1
+
+        # Sem fila: o processo principal executa uma unidade
+        executando = livres[~com_fila]
+        self.progresso[executando] += 1
+        self.tempo_processo[executando] += 1
+
+    def executar(self):
+        """Executa todas as replicações até o tempo total ou o fim do processo de cada uma."""
+        vivas = np.flatnonzero(self.progresso < UNIDADES_PROCESSO)
+        while vivas.size and self.tempo_atual <= self.tempo_total:
+            self._ciclo(vivas)
+            self.tempo_atual += 1
+            self.tempo_final[vivas] = self.tempo_atual
+            vivas = vivas[self.progresso[vivas] < UNIDADES_PROCESSO]
+        return self.metricas()
+
+    def metricas(self):
+        """Métricas por replicação, com as mesmas chaves de replicacoes.metricas_da_simulacao."""
+        metricas = {
+            'tempo_processo': self.tempo_processo,
+            'tempo_interrupcoes': self.tempo_interrupcoes,
+            'total_interrupcoes': self.por_tipo.sum(axis=1),
+        }
+        for tipo, coluna in self.colunas.items():
+            metricas[f'por_tipo.{tipo}'] = self.por_tipo[:, coluna]
+        return metricas
+
+    def info(self, replicacao):
+        """Simulador.info de uma replicação."""
+        return {
+            'tempo_processo': int(self.tempo_processo[replicacao]),
+            'tempo_interrupcoes': int(self.tempo_interrupcoes[replicacao]),
+            'total_interrupcoes': int(self.por_tipo[replicacao].sum()),
+            'por_tipo': {tipo: int(self.por_tipo[replicacao, coluna]) for tipo, coluna in self.colunas.items()}
+        }
+
+    def resumo(self, nivel=0.95):
+        """Média, variância e IC por métrica, no formato de ExecutorReplicacoes.resumo."""
+        z = NormalDist().inv_cdf(0.5 + nivel / 2)
+        resumo = {}
+        for nome, valores in self.metricas().items():
+            media = float(valores.mean())
+            variancia = float(valores.var(ddof=1)) if self.replicacoes > 1 else 0.0
+            margem = z * math.sqrt(variancia / self.replicacoes) if self.replicacoes > 1 else 0.0
+            resumo[nome] = {'n': self.replicacoes, 'media': media, 'variancia': variancia,
+                            'ic_inferior': media - margem, 'ic_superior': media + margem}
+        return resumo
+
+
+if __name__ == "__main__":
+    import time
+
+    from replicacoes import EstatisticaOnline, executar_lote, formatar_resumo_replicacoes
+
+    print("=== TESTE DO SIMULADOR VETORIAL ===\n")
+    replicacoes = 100000
+    inicio = time.perf_counter()
+    vetorial = SimuladorVetorial(tempo_total=1000, replicacoes=replicacoes, seed=42)
+    vetorial.executar()
+    duracao_vetorial = time.perf_counter() - inicio
+    print(formatar_resumo_replicacoes(vetorial.resumo()))
+
+    amostra = 2000
+    inicio = time.perf_counter()
+    escalar = {}
+    for metricas in executar_lote(1000, 42, 0, amostra, 'ciclo'):
+        for nome, valor in metricas.items():
+            escalar.setdefault(nome, EstatisticaOnline()).adicionar(valor)
+    duracao_escalar = time.perf_counter() - inicio
+
+    print(f"\nSimulador escalar ({amostra} replicações), para comparação:")
+    print(formatar_resumo_replicacoes({nome: e.resumo() for nome, e in escalar.items()}))
+    print(f"\nVetorial: {replicacoes / duracao_vetorial:,.0f} replicações/s | "
+          f"escalar: {amostra / duracao_escalar:,.0f} replicações/s")